@@ -15,7 +15,41 @@ def document():
 
 
 @document.command("update")
-def update() -> None:
-    """Load from file, and write to database."""
+@click.option("--dev", "mode", flag_value="dev", default=True)
+@click.option("--pro", "mode", flag_value="prod")
+def update(mode: str) -> None:
+    """Load from file, and write to database(only changed ones)."""
 
-    ...
+    import asyncio
+    import time
+    from functools import partial
+
+    from ...infra.deps.database.dao.document import createfulltextindex
+    from ...infra.deps.database.service import enginefromconfig
+    from ...infra.deps.database.settings import database_dev, database_prod
+    from ...infra.deps.document.cache import createdocumentrepo
+    from ...infra.deps.document.ingest import scanmetas, loaddocument
+    from ...infra.deps.document.settings import document as docconf
+
+    async def run() -> BuildSummary:
+        engine = enginefromconfig(database_dev if mode == "dev" else database_prod)
+        async with engine.begin() as conn:
+            await conn.run_sync(createfulltextindex)
+
+        usecase = BuildIndex(
+            repo=createdocumentrepo(engine),
+            scan_service=partial(scanmetas, docconf.path),
+            load_service=loaddocument,
+        )
+        try:
+            return await usecase()
+        finally:
+            await engine.dispose()
+
+    start = time.perf_counter()
+    summary = asyncio.run(run())
+
+    click.secho(
+        f"{summary} in {time.perf_counter() - start:.2f}s.",
+        fg="green" if summary else None,
+    )
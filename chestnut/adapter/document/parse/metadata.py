@@ -1,23 +1,17 @@
-import os, re
+import os
+from io import StringIO
 from pathlib import Path
-from typing import Any, List
+from typing import Any, Iterable, List
 
 from ....application.document import exception as doc_exc
 from ....application.document.domain.meta import DocumentMeta
 from ....application.document.dto.load import DocumentLoader
-
-
-MD_TITLE_PATTERN = re.compile(r"(^# (.*)\n)|(.*\n# (.*)\n)|((.*)\n^=.*\n)", re.MULTILINE)
-# match-group-2: r"(^# (.*)\n)"    =>      ("# ABC\n..." -> "ABC")
-# match-group-4: r"(.*\n# (.*)\n)" => ("...\n# ABC\n..." -> "ABC")
-# match-group-6: r"((.*)\n^=.*\n)" =>        ("ABC\n=.." -> "ABC")
-
-
-# from https://github.com/Python-Markdown/markdown/blob/master/markdown/extensions/meta.py
-#META_PATTERN = re.compile(r'^[ ]{0,3}(?P<key>[A-Za-z0-9_-]+):\s*(?P<value>.*)')
-#META_MORE_PATTERN = re.compile(r'^[ ]{4,}(?P<value>.*)')
-META_BEGIN_PATTERN = re.compile(r"^-{3}(\s.*)?")
-META_END_PATTERN = re.compile(r"^(-{3}|\.{3})(\s.*)?")
+from ....infra.deps.markdown.head import (
+    META_BEGIN_PATTERN,
+    META_END_PATTERN,
+    MAX_HEAD_LINES,
+    scanhead,
+)
 
 
 class FilePathAdapter:
@@ -99,32 +93,33 @@ class FilePathAdapter:
     def _gettitle(content: str) -> str | None:
         """Return title."""
 
-        if title := MD_TITLE_PATTERN.match(content):
-            title = (
-                title.group(2)
-                # r"(^# (.*)\n)"    =>      ("# ABC\n..." -> "ABC")
-                or title.group(4)
-                # r"(.*\n# (.*)\n)" => ("...\n# ABC\n..." -> "ABC")
-                or title.group(6)
-                # r"((.*)\n^=.*\n)" =>        ("ABC\n=.." -> "ABC")
-            )
-
-        if isinstance(title, str):
-            return title
-        else:
-            return None
+        return MetadataParserAdapter.parse(content).get("title")
 
 
 class MetadataParserAdapter:
-    """metadata segment -> metadata"""
+    """metadata segment -> metadata, by `scanhead`(the body is never read)."""
 
     @classmethod
     def parse(cls, content: str) -> dict:
-        ...
+        return cls.scan(StringIO(content))
 
-    def _fetchmetadata(self, raw_content: str) -> str:
+    @classmethod
+    def scan(cls, lines: Iterable[str], max_head_lines: int = MAX_HEAD_LINES) -> dict:
+        return scanhead(lines, max_head_lines)
+
+    @staticmethod
+    def _fetchmetadata(raw_content: str) -> str:
         """"""
 
         # """---\n...\n---\n...""" => "---\n...\n---"
-        ...
+        lines = StringIO(raw_content)
+        if not META_BEGIN_PATTERN.match(first := lines.readline()):
+            return ""
+
+        segment = [first]
+        for line in lines:
+            segment.append(line)
+            if META_END_PATTERN.match(line):
+                break
 
+        return "".join(segment).rstrip("\n")
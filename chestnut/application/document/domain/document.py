@@ -1,7 +1,7 @@
 import re
 from enum import Enum
-from dataclasses import dataclass
-from typing import Any, Dict, Iterable, Tuple, List, Callable, Type
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, Tuple, List, Callable
 
 from .meta import DocumentMeta
 from ...core.domain.entity import AggregateRoot, Entity
@@ -45,8 +45,69 @@ class Document(AggregateRoot):
         return Document(file_id=meta.name, meta=meta, content="")
 
 
-Section = Dict[str, Tuple[int | Tuple[int], str | Type["Section"] | Iterable[str | Type["Section"]]]]
-"""{header name: (header level, content/sub paragraph)}"""
+ATX_HEADER_PATTERN = re.compile(
+    rb"^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*\r?\n?$"
+)
+SETEXT_UNDERLINE_PATTERN = re.compile(rb"^ {0,3}(=+|-+)[ \t]*\r?\n?$")
+FENCE_PATTERN = re.compile(rb"^ {0,3}(`{3,}|~{3,})")
+ANCHOR_REMOVE_PATTERN = re.compile(r"[^\w\- ]")
+
+
+def headeranchor(title: str) -> str:
+    """`'## Hello, World!'` => `'hello-world'`(CJK is kept)."""
+
+    return ANCHOR_REMOVE_PATTERN.sub("", title.strip().lower()).replace(" ", "-")
+
+
+@dataclass
+class Section:
+    """Node of section tree, offsets are in bytes of UTF-8 source.
+
+    ```text
+    source[start:end]      => whole section(with sub sections)
+    source[body_start:end] => without header line
+    ```
+    """
+
+    title: str
+    level: int
+    anchor: str
+    start: int
+    body_start: int
+    end: int
+    children: List["Section"] = field(default_factory=list)
+
+    def walk(self) -> Iterator["Section"]:
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    def slice(self, source: bytes, body_only: bool = False) -> bytes:
+        return source[self.body_start if body_only else self.start : self.end]
+
+    def dump(self) -> list:
+        return [
+            self.title,
+            self.level,
+            self.anchor,
+            self.start,
+            self.body_start,
+            self.end,
+            [child.dump() for child in self.children],
+        ]
+
+    @classmethod
+    def load(cls, raw: list) -> "Section":
+        *fields, children = raw
+        return cls(*fields, children=[cls.load(child) for child in children])
+
+
+def findsection(sections: Iterable[Section], anchor: str) -> Section | None:
+    for root in sections:
+        for section in root.walk():
+            if section.anchor == anchor:
+                return section
+    return None
 
 
 Condition = bool | int | str | Enum
@@ -61,86 +122,152 @@ class ParsedDocumentBody(Entity):
     index: Iterable[str]  # except title.
     content: Iterable[Section]
 
+    def __init__(
+        self, id: str, index: Iterable[str], content: Iterable[Section]
+    ) -> None:
+        self.id = id
+        self.index = index
+        self.content = content
+
+
+def _atxheader(line: bytes) -> Tuple[int, str] | None:
+    if match := ATX_HEADER_PATTERN.match(line):
+        return len(match.group(1)), (match.group(2) or b"").decode("utf-8").strip()
+    return None
+
 
 class ContentSplitService:
     """Generic content splitor interface."""
 
-    header_split_pattern: re.Pattern
-    getheaderbody: Callable[[str], str]
-    """Get body of header.`('## Bla bla' => 'Bla bla')`"""
-    getheaderlevel: Callable[[str], int]
-    """Get header level.`('## Bla bla' => 2)`"""
+    getheader: Callable[[bytes], Tuple[int, str] | None]
+    """Get level and body of header line.`(b'## Bla bla' => (2, 'Bla bla'))`"""
+    getanchor: Callable[[str], str]
     getmetadata: Callable[[str], Dict[str, Any]]
-    pruningservice: Callable[[Iterable[str]], List[str] | None]
+    pruningservice: Callable[[List[Section]], List[Section] | None]
     poptitleservice: Callable[[str], Tuple[str, str | None]]
 
     def __init__(
         self,
-        metadata_service: Callable[[str], Dict[str, Any]],
-        header_split_pattern: re.Pattern,
-        headerbody_parser: Callable[[str], str],
-        headerlevel_parser: Callable[[str], int],
-        pruning_condition: Callable[[Iterable[str]], Condition],
-        pruning_service: Callable[[Iterable[str], Condition], List[str] | None],
-        pop_title_service: Callable[[str], Tuple[str, str | None]],
+        metadata_service: Callable[[str], Dict[str, Any]] = lambda content: {},
+        header_parser: Callable[[bytes], Tuple[int, str] | None] = _atxheader,
+        anchor_service: Callable[[str], str] = headeranchor,
+        pruning_condition: Callable[
+            [List[Section]], Condition
+        ] = lambda sections: False,
+        pruning_service: Callable[[List[Section], Condition], List[Section] | None] = (
+            lambda sections, condition: None
+        ),
+        pop_title_service: Callable[[str], Tuple[str, str | None]] = (
+            lambda content: (content, None)
+        ),
+        setext: bool = True,
     ) -> None:
         self.getmetadata = metadata_service
-        self.header_split_pattern = header_split_pattern
-        self.getheaderbody = headerbody_parser
-        self.getheaderlevel = headerlevel_parser
-        self.pruningservice = lambda content: pruning_service(
-            content, pruning_condition(content)
+        self.getheader = header_parser
+        self.getanchor = anchor_service
+        self.pruningservice = lambda sections: pruning_service(
+            sections, pruning_condition(sections)
         )
         self.poptitleservice = pop_title_service
+        self.setext = setext
+
+    def split(self, source: str | bytes) -> List[Section]:
+        """Build section tree in one pass, skip fenced code and front matter."""
+
+        if isinstance(source, str):
+            source = source.encode("utf-8")
+
+        roots: List[Section] = []
+        stack: List[Section] = []
+        anchors: Dict[str, int] = {}
+        fence: bytes | None = None
+        previous: Tuple[int, bytes] | None = None  # Paragraph line for setext.
+        position = 0
+
+        lines = source.splitlines(keepends=True)
+        # Front matter.
+        if lines and lines[0].rstrip() == b"---":
+            for index, line in enumerate(lines[1:], 1):
+                if line.rstrip() in (b"---", b"..."):
+                    position = sum(len(line) for line in lines[: index + 1])
+                    lines = lines[index + 1 :]
+                    break
+
+        def open_(title: str, level: int, start: int, body_start: int) -> None:
+            anchor = self.getanchor(title)
+            if anchor in anchors:
+                anchors[anchor] += 1
+                anchor = f"{anchor}-{anchors[anchor]}"
+            else:
+                anchors[anchor] = 0
+
+            while stack and stack[-1].level >= level:
+                stack.pop().end = start
+            section = Section(title, level, anchor, start, body_start, len(source))
+            (stack[-1].children if stack else roots).append(section)
+            stack.append(section)
+
+        for line in lines:
+            line_end = position + len(line)
+
+            if fence_match := FENCE_PATTERN.match(line):
+                marker = fence_match.group(1)
+                if fence is None:
+                    fence = marker
+                elif marker[:1] == fence[:1] and len(marker) >= len(fence):
+                    fence = None
+                previous = None
+            elif fence is not None:
+                ...
+            elif header := self.getheader(line):
+                open_(header[1], header[0], position, line_end)
+                previous = None
+            elif (
+                self.setext
+                and previous is not None
+                and (underline := SETEXT_UNDERLINE_PATTERN.match(line))
+            ):
+                open_(
+                    previous[1].decode("utf-8").strip(),
+                    1 if underline.group(1)[:1] == b"=" else 2,
+                    previous[0],
+                    line_end,
+                )
+                previous = None
+            elif line.strip():
+                previous = (position, line)
+            else:
+                previous = None
+
+            position = line_end
+
+        for section in stack:
+            section.end = len(source)
+
+        return roots
 
     def parse(self, content: str) -> Tuple[DocumentMeta | None, ParsedDocumentBody] | None:
-        content_chain = re.split(self.header_split_pattern, content)
-
         content, title = self.poptitleservice(content)
 
         metadata_in_file = self.getmetadata(content)
-        
-        title = title or metadata_in_file.get("title", None)
 
-        _res = self.pruningservice(content_chain)
-        if _res:
-            content_chain = _res
-        # Strcture of content_chain:
-        # [
-        # <header>, <content>,
-        # <header>, <content>,
-        # ...
-        # <header>, [<content>]
-        # ]
-
-        paragraph_chain: List[Section] = []
-
-        if paragraph_num := len(content_chain) % 2 != 0:
-            # Last one is header.
-            # Last MUST be <header: [...]>, <content: "">
-            content_chain.append("")
-            paragraph_num += 1
-
-        # else last paragraph is content.
-
-        paragraph_num = int(paragraph_num / 2)
-
-        # Build.
-        for idx in range(paragraph_num):
-            # header, content
-            #   ||      ||
-            #   2x,    2x+1(may out of index)
-            paragraph_chain.append(
-                {
-                    self.getheaderbody(content_chain[idx * 2]): (
-                        self.getheaderlevel(content_chain[idx * 2]),
-                        content_chain[idx * 2 + 1],
-                    )
-                }
-            )
+        title = title or metadata_in_file.get("title", None)
 
         # Orgnize.
-        section_chain: Iterable[Section] = []
-
-        for section in paragraph_chain:
-            ...
+        section_chain = self.split(content)
+        if _res := self.pruningservice(section_chain):
+            section_chain = _res
+
+        if title is None and section_chain and section_chain[0].level == 1:
+            title = section_chain[0].title
+
+        return None, ParsedDocumentBody(
+            id=title or "",
+            index=[
+                section.title
+                for root in section_chain
+                for section in root.walk()
+                if section.title != title
+            ],
+            content=section_chain,
+        )
@@ -1,10 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import List, Any
+from typing import Iterable, List, Any, Tuple
 
 from .document import Document
 from .meta import DocumentMeta
 
 
+Cursor = Tuple[str, str, str]
+"""Position of keyset pagination: `(repo_name, name, language)`."""
+
+
 class DocRepo(ABC):
     @abstractmethod
     async def loadbyname(self, name: str) -> List[Document | None]:
@@ -12,6 +16,13 @@ class DocRepo(ABC):
 
         raise NotImplementedError
 
+    async def loadbynames(self, names: Iterable[str]) -> List[Document | None]:
+        """Load many documents at once(implementation should batch it)."""
+
+        return [
+            document for name in names for document in await self.loadbyname(name)
+        ]
+
     @abstractmethod
     async def loadbycondition(self, **condition) -> List[Document | None]:
         """Load some documents by condition(e.g. specific language)."""
@@ -24,6 +35,20 @@ class DocRepo(ABC):
 
         raise NotImplementedError
     
+    @abstractmethod
+    async def remove(self, keys: Iterable[Cursor]) -> int:
+        """Delete documents by `(repo_name, name, language)`."""
+
+        raise NotImplementedError
+
+    async def apply(
+        self, upgraded: Iterable[Document], removed: Iterable[Cursor]
+    ) -> None:
+        """Upgrade and remove(implementation should do it in one transaction)."""
+
+        await self.upgrade(list(upgraded))
+        await self.remove(removed)
+
     @abstractmethod
     async def check(self) -> bool:
         """Is there has data in this repo?"""
@@ -38,6 +63,28 @@ class DocMetaRepo(ABC):
 
         raise NotImplementedError
 
+    async def displaypage(
+        self, limit: int, after: Cursor | None = None
+    ) -> Tuple[List[DocumentMeta | None], Cursor | None]:
+        """Display META after `after`, return it with cursor of next page."""
+
+        metas = sorted(
+            (meta for meta in await self.display() if meta),
+            key=lambda meta: (meta.repo_name, meta.name, meta.language),
+        )
+        if after:
+            metas = [
+                meta
+                for meta in metas
+                if (meta.repo_name, meta.name, meta.language) > after
+            ]
+
+        page = metas[:limit]
+        if len(metas) <= limit:
+            return page, None  # type: ignore
+
+        return page, (page[-1].repo_name, page[-1].name, page[-1].language)  # type: ignore
+
     @abstractmethod
     async def check(self) -> bool:
         raise NotImplementedError
@@ -1,7 +1,8 @@
+import json
 from datetime import datetime
 from pathlib import Path
 from pydantic import BaseModel, Field, validator
-from typing import Iterable, Callable, Optional
+from typing import Any, Iterable, Callable, List, Optional
 
 from .. import exception as doc_exc
 from ..domain.meta import DocumentMeta
@@ -34,7 +35,13 @@ class DocumentPresenter(OutputSchemaMixin, BaseModel):
         ) or values["change_time"]
 
     @classmethod
-    def fromentity(cls, entity: Document | DocumentMeta) -> "DocumentPresenter":
+    def fromentity(
+        cls, entity: Document | DocumentMeta, trusted: bool = False
+    ) -> "DocumentPresenter":
+        """`trusted`: entity from our own repository, skip validation."""
+
+        if trusted:
+            return cls.fromentities([entity])[0]
         if isinstance(entity, Document):
             return DocumentPresenter(**DocumentPresenter.parse(document=entity))
         elif isinstance(entity, DocumentMeta):
@@ -44,6 +51,63 @@ class DocumentPresenter(OutputSchemaMixin, BaseModel):
             )
         raise doc_exc.DomainModelTypeInvalid
 
+    @classmethod
+    def fromentities(
+        cls, entities: Iterable[Document | DocumentMeta | None]
+    ) -> List["DocumentPresenter"]:
+        """Build without validation(`construct`), same defaults as validators.
+
+        Only for entities from our own repository. Unlike validation, an
+        untitled document(`title=None`) or a missing `change_time` is kept
+        as `None`(`null` in JSON) rather than rejected, so one file without
+        a header never breaks a listing.
+        """
+
+        now = datetime.utcnow()
+        presenters = []
+        for entity in entities:
+            if entity is None:
+                continue
+            if isinstance(entity, DocumentMeta):
+                entity = Document(file_id=entity.name, meta=entity, content="")
+            elif not isinstance(entity, Document):
+                raise doc_exc.DomainModelTypeInvalid
+
+            values = DocumentPresenter.parse(document=entity)
+            values["source"] = values["source"] or ""
+            values["location"] = list(values["location"])
+            values["categories"] = list(values["categories"])
+            values["create_time"] = _totime(values["create_time"]) or now
+            values["change_time"] = _totime(values["change_time"])
+            presenters.append(cls.construct(**values))
+
+        return presenters
+
+    @staticmethod
+    def encode(
+        presenters: Iterable["DocumentPresenter"], with_content: bool = True
+    ) -> bytes:
+        """To JSON bytes directly, without `.json()` of every model."""
+
+        return json.dumps(
+            [
+                dict(
+                    name=presenter.name,
+                    title=presenter.title,
+                    language=presenter.language,
+                    source=str(presenter.source),
+                    location=list(presenter.location),
+                    categories=list(presenter.categories),
+                    create_time=_toisoformat(presenter.create_time),
+                    change_time=_toisoformat(presenter.change_time),
+                    **(dict(content=presenter.content) if with_content else {}),
+                )
+                for presenter in presenters
+            ],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
     @staticmethod
     def parse(document: Document) -> dict:
         return dict(
@@ -72,3 +136,13 @@ class DocumentPresenter(OutputSchemaMixin, BaseModel):
                 return render_service(content)
             else:
                 return content
+
+
+def _totime(value: datetime | float | None) -> datetime | None:
+    if not value or isinstance(value, datetime):
+        return value or None
+    return datetime.fromtimestamp(value)
+
+
+def _toisoformat(value: Any) -> str | None:
+    return value.isoformat() if value else None
@@ -1,7 +1,6 @@
 from typing import Any, List
 
 from .. import exception as doc_exc
-from ..domain.document import Document
 from ..domain.meta import DocumentMeta
 from ..domain.repo import DocMetaRepo, DocRepo
 from ..dto.present import DocumentPresenter
@@ -19,13 +18,8 @@ class DisplayIndex:
     async def display(self) -> List[DocumentPresenter]:
         meta_list: List[DocumentMeta | None] = await self.repo.display()
 
-        return [
-            DocumentPresenter.fromentity(
-                Document(file_id=meta_item.name, meta=meta_item, content="")
-            )
-            for meta_item in meta_list
-            if meta_item
-        ]
+        # From repository, no need to validate again.
+        return DocumentPresenter.fromentities(meta_list)
 
 
 class DisplayDocument:
@@ -44,4 +38,4 @@ class DisplayDocument:
         if content is None:
             raise doc_exc.DocumentNotFound
 
-        return DocumentPresenter.fromentity(entity=content)
+        return DocumentPresenter.fromentity(entity=content, trusted=True)
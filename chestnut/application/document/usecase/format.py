@@ -1,4 +1,6 @@
-from typing import Any
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Tuple
 
 from .. import exception as doc_exc
 from ..domain.document import Document
@@ -6,13 +8,61 @@ from ..domain.meta import DocumentMeta
 from ..domain.repo import DocRepo, DocMetaRepo
 
 
+Key = Tuple[str, str, str]
+"""`(repo_name, name, language)`"""
+
+# `change_time` went through float timestamp and database.
+CHANGE_TIME_TOLERANCE = timedelta(milliseconds=1)
+
+
+@dataclass
+class BuildSummary:
+    added: List[Key] = field(default_factory=list)
+    updated: List[Key] = field(default_factory=list)
+    removed: List[Key] = field(default_factory=list)
+    unchanged: int = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
+
+    def __str__(self) -> str:
+        return (
+            f"{len(self.added)} added, {len(self.updated)} updated, "
+            f"{len(self.removed)} removed, {self.unchanged} unchanged"
+        )
+
+
+def _key(meta: DocumentMeta) -> Key:
+    return meta.repo_name, meta.name, meta.language
+
+
 class BuildIndex:
+    """Sync documents from files to repository, only changed ones are written."""
+
     repo: DocRepo
+    meta_repo: DocMetaRepo
+    scan_service: Callable[[], Iterable[DocumentMeta]]
+    """Metadata of all files, without reading them."""
+    load_service: Callable[[DocumentMeta], Document]
+    """Read a file into `Document`."""
 
-    def __init__(self, repo: DocRepo) -> None:
+    def __init__(
+        self,
+        repo: DocRepo,
+        scan_service: Callable[[], Iterable[DocumentMeta]],
+        load_service: Callable[[DocumentMeta], Document],
+        meta_repo: DocMetaRepo | None = None,
+    ) -> None:
         self.repo = repo
+        if meta_repo is None:
+            if not isinstance(repo, DocMetaRepo):
+                raise doc_exc.DomainModelTypeInvalid
+            meta_repo = repo
+        self.meta_repo = meta_repo
+        self.scan_service = scan_service
+        self.load_service = load_service
 
-    async def __call__(self, *args: Any, **kwds: Any) -> Any:
+    async def __call__(self, *args: Any, **kwds: Any) -> BuildSummary:
         if await self.repo.check():
             # if have => update
             return await self.update()
@@ -20,10 +70,49 @@ class BuildIndex:
             # else => build
             return await self.build()
 
-    async def build(self, *args: Any, **kwds: Any) -> Any:
-        pass
+    async def build(self, *args: Any, **kwds: Any) -> BuildSummary:
+        return await self.apply({})
+
+    async def update(self, *args: Any, **kwds: Any) -> BuildSummary:
+        # 1.Check diff(by `change_time`, `content` is never loaded)
+        stored: Dict[Key, datetime | None] = {
+            _key(meta): meta.change_time
+            for meta in await self.meta_repo.display()
+            if meta
+        }
 
-    async def update(self, *args: Any, **kwds: Any) -> Any:
-        # 1.Check diff
         # 2.Update
-        pass
+        return await self.apply(stored)
+
+    async def apply(self, stored: Dict[Key, datetime | None]) -> BuildSummary:
+        summary = BuildSummary()
+        changed: List[DocumentMeta] = []
+        seen = set()
+
+        for meta in self.scan_service():
+            key = _key(meta)
+            seen.add(key)
+
+            if key not in stored:
+                summary.added.append(key)
+            elif (
+                stored[key] is None
+                or meta.change_time is None
+                or abs(meta.change_time - stored[key]) > CHANGE_TIME_TOLERANCE  # type: ignore
+            ):
+                summary.updated.append(key)
+            else:
+                summary.unchanged += 1
+                continue
+
+            changed.append(meta)
+
+        summary.removed = [key for key in stored if key not in seen]
+
+        if summary:
+            # Only changed files are read.
+            await self.repo.apply(
+                [self.load_service(meta) for meta in changed], summary.removed
+            )
+
+        return summary
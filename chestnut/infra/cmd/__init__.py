@@ -13,6 +13,8 @@ def manage():
 from .db import database
 from .init import launchsimplewebapp, set_command
 from .run import running
+from .static import static
+from .template import template
 
 
 # Application related:
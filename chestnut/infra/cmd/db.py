@@ -139,7 +139,10 @@ click.option("--dev", "mode", flag_value="dev", default=True)(
 @database.command("docs")
 @click.option("--dev", "mode", flag_value="dev", default=True)
 @click.option("--pro", "mode", flag_value="prod")
-def updatedocs(mode: str) -> None:
+@click.option("--clean", "clean", is_flag=True, help="Delete all documents firstly.")
+@click.option("--jobs", "-j", "jobs", type=int, default=None, help="Workers of parser.")
+@click.option("--chunk", "chunk_size", type=int, default=500, help="Rows per insert.")
+def updatedocs(mode: str, clean: bool, jobs: int | None, chunk_size: int) -> None:
     """Update fixed document into databse."""
 
     # TODO: Replace code at here to:
@@ -150,13 +153,27 @@ def updatedocs(mode: str) -> None:
     # check database => fetch dir => work, parse and load
 
     import asyncio
+    import time
     from sqlalchemy import Table
-    from sqlalchemy.sql import delete, update
+    from sqlalchemy.sql import delete, select, tuple_
+    from sqlalchemy.dialects.sqlite import insert
     from sqlalchemy.ext.asyncio import AsyncEngine
     from ..deps.database.service import enginefromconfig
-    from ..deps.document.dir import build_index
+    from ..deps.document.dir import getindex
+    from ..deps.document.ingest import (
+        scandocuments,
+        readdocuments,
+        parsedocuments,
+        torow,
+        chunked,
+    )
     from ..deps.document.settings import document as docconf
-    from ..deps.database.dao.document import document_table
+    from ..deps.database.dao.document import (
+        document_table,
+        document_repo_table,
+        createfulltextindex,
+    )
+    from ...adapter.document.parse.metadata import FilePathAdapter
 
     # Same as init.
     if mode == "dev":
@@ -168,25 +185,88 @@ def updatedocs(mode: str) -> None:
 
     async_engine = enginefromconfig(database_config)
 
-    docs_index = build_index(docconf.path, True)
-
     # TODO: Update link here.
     # Name with language in link => link to route with name.
 
+    start = time.perf_counter()
+
+    # 1. Scan.
+    paths = scandocuments(getindex(docconf.path))
+
+    # 2. Read & 3. Parse.
+    rows = []
+    total_bytes = 0
+    with click.progressbar(
+        parsedocuments(
+            readdocuments(paths),
+            docconf.path,
+            FilePathAdapter.parse,
+            max_workers=jobs,
+        ),
+        length=len(paths),
+        label="Parsing documents",
+    ) as parsed:
+        for meta, content in parsed:
+            total_bytes += len(content.encode("utf-8"))
+            rows.append(torow(meta, content))
+
     async def loaddocsdata(
         engine: AsyncEngine, table: Table, data: Any, delete_table: bool = True
     ) -> None:
+        # 4. Insert, all in one transaction.
         async with engine.begin() as conn:
             if delete_table:
                 stmt_del = delete(table)
                 await conn.execute(stmt_del)
-            ...
+
+            # Rows in `document_fts` are updated by triggers.
+            await conn.run_sync(createfulltextindex)
+
+            repos = {(row["repo_name"], row["lang"]) for row in data}
+            if repos:
+                await conn.execute(
+                    insert(document_repo_table).on_conflict_do_nothing(),
+                    [
+                        dict(name=name, lang=lang, path=str(docconf.path))
+                        for name, lang in repos
+                    ],
+                )
+
+            stmt = insert(table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[column.name for column in table.primary_key],
+                set_={
+                    column.name: stmt.excluded[column.name]
+                    for column in table.columns
+                    if not column.primary_key
+                },
+            )
+            for chunk in chunked(data, chunk_size):
+                await conn.execute(stmt, chunk)
+
+            # Rows of deleted files.
+            keys = [table.c.name, table.c.repo_name, table.c.lang]
+            scanned = {(row["name"], row["repo_name"], row["lang"]) for row in data}
+            stale = [
+                tuple(key)
+                for key in await conn.execute(select(*keys))
+                if tuple(key) not in scanned
+            ]
+            for chunk in chunked(stale, chunk_size):
+                await conn.execute(delete(table).where(tuple_(*keys).in_(chunk)))
 
         await engine.dispose()
 
     try:
-        asyncio.run(loaddocsdata(async_engine, document_table, docs_index))
+        asyncio.run(loaddocsdata(async_engine, document_table, rows, clean))
     except Exception as e:
         chestnut_logger.error("Here's a error raised:\n" + str(e))
     else:
+        cost = time.perf_counter() - start or 1e-9
+        click.secho(
+            f"Loaded {len(rows)} documents({total_bytes / 1024 ** 2:.2f} MB) "
+            f"in {cost:.2f}s: {len(rows) / cost:.1f} docs/s, "
+            f"{total_bytes / 1024 ** 2 / cost:.2f} MB/s.",
+            fg="green",
+        )
         chestnut_logger.info("OK.")
@@ -12,8 +12,14 @@ from ..log.service import chestnut_logger
 @click.option("--host", "host", default="127.0.0.1")
 @click.option("--port", "port", default=6699)
 @click.option("--public", "-p", "public", default=False)
+@click.option("--workers", "-w", "workers", default=1, help="Only in prod mode.")
 def running(
-    mode: str, name: str | None, host: str, port: int | str, public: bool
+    mode: str,
+    name: str | None,
+    host: str,
+    port: int | str,
+    public: bool,
+    workers: int,
 ) -> None:
     """Run application."""
 
@@ -49,6 +55,7 @@ def running(
             debug=False,
             auto_reload=False,
             motd=False,
+            workers=workers,
         )
     elif mode == "test":
         app.prepare(
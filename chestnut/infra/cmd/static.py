@@ -0,0 +1,36 @@
+import click
+
+from . import manage
+
+
+@manage.group
+def static():
+    """Command related to static files."""
+
+    ...
+
+
+@static.command("compress")
+def compressstatic() -> None:
+    """Write `.gz`(and `.br`) siblings of static files(run it before deploy)."""
+
+    from ..deps.compress import ENCODINGS, precompress
+    from ..deps.compress.settings import compress
+    from ..helpers.path import MAIN_PUBLIC_PATH, STATIC_PATH, ASSETS_PATH, FONTS_PATH
+    from ..web.blueprints.web.path import STATIC_PATH as WEBAPP_STATIC_PATH
+
+    if "br" not in ENCODINGS:
+        click.secho("`brotli` not installed, only `.gz` is written.", fg="yellow")
+
+    for folder in [STATIC_PATH, ASSETS_PATH, FONTS_PATH, WEBAPP_STATIC_PATH]:
+        if not folder.exists():
+            continue
+
+        written = precompress(
+            folder, compress.static_suffixes, compress.static_min_size
+        )
+        click.echo(
+            f"{folder.relative_to(MAIN_PUBLIC_PATH.parent)}: {len(written)} files written."
+        )
+
+    click.secho("OK.", fg="green")
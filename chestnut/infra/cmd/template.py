@@ -0,0 +1,27 @@
+import click
+
+from . import manage
+from ..log.service import chestnut_logger
+
+
+@manage.group
+def template():
+    """Command related to templates."""
+
+    ...
+
+
+@template.command("compile")
+def compiletemplates() -> None:
+    """Compile all templates into bytecode cache(run it before deploy)."""
+
+    from ..deps.html.service import precompiletemplates, TEMPLATE_CACHE_PATH
+    from ..helpers.path import TEMPLATE_PATH
+
+    compiled = precompiletemplates(TEMPLATE_PATH)
+
+    click.secho(
+        f"Compiled {len(set(compiled))} templates into {TEMPLATE_CACHE_PATH}.",
+        fg="green",
+    )
+    chestnut_logger.info("OK.")
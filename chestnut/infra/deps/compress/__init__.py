@@ -0,0 +1,100 @@
+""" `chestnut.infra.deps.compress`
+
+    Content-Encoding: `br`(if `brotli` installed), `gzip` and `deflate`.
+"""
+import gzip
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+try:
+    import brotli  # type: ignore
+
+    BROTLI = True
+except ImportError:
+    BROTLI = False
+
+
+# Preferred order of server.
+ENCODINGS: List[str] = (["br"] if BROTLI else []) + ["gzip", "deflate"]
+
+# Suffix of precompressed sibling, `pico.min.css` => `pico.min.css.gz`.
+SUFFIXES: Dict[str, str] = dict(br=".br", gzip=".gz")
+
+
+def compress(data: bytes, encoding: str, level: int | None = None) -> bytes:
+    """Compress `data`, `level` is the max one if None."""
+
+    if encoding == "br":
+        return brotli.compress(data, quality=11 if level is None else level)
+    if encoding == "gzip":
+        # `mtime=0` => same input, same output.
+        return gzip.compress(data, 9 if level is None else level, mtime=0)
+    if encoding == "deflate":
+        return zlib.compress(data, 9 if level is None else level)
+
+    raise ValueError(f"Unknown encoding {encoding}.")
+
+
+def negotiate(accept_encoding: str | None, available: Iterable[str]) -> str | None:
+    """Pick the best of `available` by `Accept-Encoding`, None => identity."""
+
+    if not accept_encoding:
+        return None
+
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    # Server order breaks ties.
+    for encoding in available:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+
+    return best
+
+
+def precompress(folder: Path, suffixes: Iterable[str], min_size: int = 0) -> List[Path]:
+    """Write compressed siblings of files under `folder`, return them.
+
+    A sibling newer than its source is kept.
+    """
+
+    suffixes = tuple(suffixes)
+    written = []
+
+    for file in folder.rglob("*"):
+        if not file.is_file() or not file.name.endswith(suffixes):
+            continue
+        stat = file.stat()
+        if stat.st_size < min_size:
+            continue
+
+        raw = None
+        for encoding, suffix in SUFFIXES.items():
+            if encoding not in ENCODINGS:
+                continue
+            target = file.with_name(file.name + suffix)
+            if target.exists() and target.stat().st_mtime_ns >= stat.st_mtime_ns:
+                continue
+
+            raw = raw if raw is not None else file.read_bytes()
+            data = compress(raw, encoding)
+            if len(data) >= len(raw):
+                # Not smaller, serve the source.
+                target.unlink(missing_ok=True)
+                continue
+
+            target.write_bytes(data)
+            written.append(target)
+
+    return written
@@ -0,0 +1,35 @@
+from ...helpers.config import DepsConfig
+
+
+compress = DepsConfig(
+    "compress",
+    True,
+    dict(
+        # Precompressed static files.
+        static_min_size=1024,  # Smaller files are not worth it.
+        static_suffixes=[
+            ".css",
+            ".js",
+            ".mjs",
+            ".json",
+            ".svg",
+            ".txt",
+            ".map",
+            ".ttf",
+        ],
+        static_max_age=365 * 24 * 3600,  # Only for hashed(Vite) assets.
+        # Dynamic responses.
+        min_size=1024,  # Bytes, smaller responses are sent as is.
+        level=6,  # gzip/deflate, 1(fast) ~ 9(small).
+        brotli_level=4,  # 0 ~ 11, high levels are too slow for each request.
+        mimetypes=[
+            "text/html",
+            "text/plain",
+            "text/css",
+            "text/javascript",
+            "application/javascript",
+            "application/json",
+            "image/svg+xml",
+        ],
+    ),
+)
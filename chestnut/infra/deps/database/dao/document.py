@@ -1,4 +1,6 @@
+import sqlite3
 from sqlalchemy import (
+    DDL,
     Table,
     Column,
     String,
@@ -7,7 +9,10 @@ from sqlalchemy import (
     ForeignKeyConstraint,
     UniqueConstraint,
     Index,
+    event,
 )
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import text
 from .base import chestnut_sqlite_metadata
 
 
@@ -29,18 +34,80 @@ document_table = Table(
     chestnut_sqlite_metadata,
     Column("name", String),  # Route `a/b` => `a_b`
     Column("repo_name", String, default="main"),
-    Column("lang", String, nullable=True),
+    Column("lang", String, default="en"),
     Column("path", String, nullable=True),  # Physical path in device.
     Column("title", String, nullable=True),
     Column("content", String),
     Column("create_time", DateTime),
     Column("change_time", DateTime),
-    PrimaryKeyConstraint("name", "repo_name", name="document_pk"),  # Name and language
+    PrimaryKeyConstraint(
+        "name", "repo_name", "lang", name="document_pk"
+    ),  # Name and language
     ForeignKeyConstraint(
         ["repo_name", "lang"], ["document_repo.name", "document_repo.lang"]
     ),
-    UniqueConstraint("name", "title"),
     Index("idx_title", "title"),
-    Index("idx_content", "content"),
+    # Full-text search of content in `document_fts`.
 )
 """Table of raw markdown file with some classification."""
+
+
+# `trigram` can search CJK text(no word boundary), but requires SQLite 3.34+.
+FTS_TOKENIZER = "trigram" if sqlite3.sqlite_version_info >= (3, 34, 0) else "unicode61"
+
+DOCUMENT_FTS_TABLE = "document_fts"
+"""FTS5 virtual table of `document_table`, out of alembic's sight."""
+
+document_fts_ddl = [
+    DDL(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {DOCUMENT_FTS_TABLE} USING fts5("
+        "name UNINDEXED, lang UNINDEXED, title, content, "
+        "content='document', content_rowid='rowid', "
+        f"tokenize='{FTS_TOKENIZER}')"
+    ),
+    # Keep sync with `document`.
+    DDL(
+        "CREATE TRIGGER IF NOT EXISTS document_fts_ai AFTER INSERT ON document BEGIN "
+        f"INSERT INTO {DOCUMENT_FTS_TABLE}(rowid, name, lang, title, content) "
+        "VALUES (new.rowid, new.name, new.lang, new.title, new.content); END"
+    ),
+    DDL(
+        "CREATE TRIGGER IF NOT EXISTS document_fts_ad AFTER DELETE ON document BEGIN "
+        f"INSERT INTO {DOCUMENT_FTS_TABLE}"
+        f"({DOCUMENT_FTS_TABLE}, rowid, name, lang, title, content) "
+        "VALUES ('delete', old.rowid, old.name, old.lang, old.title, old.content); END"
+    ),
+    DDL(
+        "CREATE TRIGGER IF NOT EXISTS document_fts_au AFTER UPDATE ON document BEGIN "
+        f"INSERT INTO {DOCUMENT_FTS_TABLE}"
+        f"({DOCUMENT_FTS_TABLE}, rowid, name, lang, title, content) "
+        "VALUES ('delete', old.rowid, old.name, old.lang, old.title, old.content); "
+        f"INSERT INTO {DOCUMENT_FTS_TABLE}(rowid, name, lang, title, content) "
+        "VALUES (new.rowid, new.name, new.lang, new.title, new.content); END"
+    ),
+]
+
+
+def createfulltextindex(conn: Connection) -> None:
+    """Create `document_fts` and triggers if not exist(use `run_sync` if async)."""
+
+    existed = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        dict(name=DOCUMENT_FTS_TABLE),
+    ).first()
+
+    for ddl in document_fts_ddl:
+        conn.execute(ddl)
+
+    if not existed:
+        # Index rows which inserted before.
+        conn.execute(
+            text(
+                f"INSERT INTO {DOCUMENT_FTS_TABLE}({DOCUMENT_FTS_TABLE}) "
+                "VALUES ('rebuild')"
+            )
+        )
+
+
+for _ddl in document_fts_ddl:
+    event.listen(document_table, "after_create", _ddl.execute_if(dialect="sqlite"))
@@ -1,14 +1,27 @@
 from sqlalchemy import Table
+from sqlalchemy.sql import Executable
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncConnection, AsyncSession
+from typing import Callable, Dict, Hashable
 
 
 # Create DAOBase.
 class DAOBase:
     table: Table
     engine: AsyncEngine
+    statements: Dict[Hashable, Executable]
 
     def __init__(self, engine: AsyncEngine, table: Table) -> None:
         self.engine = engine
         self.table = table
+        self.statements = {}
 
-    ...
+    def statement(self, key: Hashable, build: Callable[[], Executable]) -> Executable:
+        """Build a statement(with `bindparam`) once, and reuse it.
+
+        Reused statements also hit the compiled cache of engine.
+        """
+
+        if key not in self.statements:
+            self.statements[key] = build()
+
+        return self.statements[key]
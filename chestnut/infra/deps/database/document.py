@@ -0,0 +1,272 @@
+""" `chestnut.infra.deps.database.document`
+
+    `DocRepo` and `DocMetaRepo` on `document_table`.
+"""
+from pathlib import Path
+from sqlalchemy import Row, Table, bindparam, tuple_
+from sqlalchemy.sql import delete, exists, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from typing import Any, Iterable, List, Tuple
+
+from .dao.document import document_table
+from .data_access_object import DAOBase
+from ..document.dir import tolocation
+from ..document.settings import document as docconf
+from ....application.document.domain.document import Document
+from ....application.document.domain.meta import DocumentMeta
+from ....application.document.domain.repo import Cursor, DocRepo, DocMetaRepo
+
+
+# Everything except `content`.
+META_COLUMNS = (
+    "name",
+    "repo_name",
+    "lang",
+    "path",
+    "title",
+    "create_time",
+    "change_time",
+)
+
+
+def rowtometa(row: Row, main_path: Path | None = None) -> DocumentMeta:
+    location = tolocation(row.path, main_path) if row.path and main_path else None
+
+    return DocumentMeta(
+        name=row.name,
+        title=row.title,
+        language=row.lang,
+        source=Path(row.path) if row.path else None,
+        # From path, `a_b` => `a/b` is ambiguous(`fbp_components`).
+        location=location or row.name.split("_"),
+        categories=[],
+        create_time=row.create_time,
+        change_time=row.change_time,
+        repo_name=row.repo_name,
+    )
+
+
+def entitytorow(document: Document) -> dict:
+    meta = document.meta
+
+    return dict(
+        name=meta.name,
+        repo_name=meta.repo_name,
+        lang=meta.language,
+        path=str(meta.source) if meta.source else None,
+        title=meta.title,
+        content=document.content,
+        create_time=meta.create_time,
+        change_time=meta.change_time,
+    )
+
+
+class DocumentDAO(DAOBase, DocRepo, DocMetaRepo):
+    """Async SQLAlchemy Core implementation(SQLite)."""
+
+    main_path: Path
+    """Root of documents, to get `location` from `path`."""
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        table: Table = document_table,
+        main_path: Path | None = None,
+    ) -> None:
+        super().__init__(engine, table)
+        self.main_path = main_path or docconf.path
+
+    def _meta_columns(self) -> list:
+        return [self.table.c[column] for column in META_COLUMNS]
+
+    def _todocument(self, row: Row) -> Document:
+        return Document(
+            file_id=row.name, meta=rowtometa(row, self.main_path), content=row.content
+        )
+
+    async def loadbyname(self, name: str) -> List[Document | None]:
+        statement = self.statement(
+            "loadbyname",
+            lambda: select(self.table).where(self.table.c.name == bindparam("name")),
+        )
+        async with self.engine.connect() as conn:
+            result = await conn.execute(statement, dict(name=name))
+
+            return [self._todocument(row) for row in result]
+
+    async def loadbynames(self, names: Iterable[str]) -> List[Document | None]:
+        """One query(`IN`) for all names."""
+
+        names = list(names)
+        if not names:
+            return []
+
+        statement = self.statement(
+            "loadbynames",
+            lambda: select(self.table).where(
+                self.table.c.name.in_(bindparam("names", expanding=True))
+            ),
+        )
+        async with self.engine.connect() as conn:
+            result = await conn.execute(statement, dict(names=names))
+
+            return [self._todocument(row) for row in result]
+
+    async def loadbycondition(self, **condition) -> List[Document | None]:
+        """e.g. `loadbycondition(lang="en", repo_name="main")`."""
+
+        keys = tuple(sorted(condition))
+        for key in keys:
+            if key not in self.table.c:
+                raise KeyError(f"Unknown column {key}.")
+
+        statement = self.statement(
+            ("loadbycondition", keys),
+            lambda: select(self.table).where(
+                *(self.table.c[key] == bindparam(key) for key in keys)
+            ),
+        )
+        async with self.engine.connect() as conn:
+            result = await conn.execute(statement, condition)
+
+            return [self._todocument(row) for row in result]
+
+    async def upgrade(self, add_object: Document | Iterable[Document]) -> None:
+        """Insert or update one or many documents in one transaction."""
+
+        documents = (
+            [add_object] if isinstance(add_object, Document) else list(add_object)
+        )
+        if not documents:
+            return
+
+        async with self.engine.begin() as conn:
+            await self._upgrade(conn, documents)
+
+    async def _upgrade(self, conn: AsyncConnection, documents: List[Document]) -> None:
+        await conn.execute(
+            self.statement("upgrade", self._upsert),
+            [entitytorow(item) for item in documents],
+        )
+
+    def _upsert(self) -> Any:
+        statement = insert(self.table)
+
+        return statement.on_conflict_do_update(
+            index_elements=[
+                self.table.c.name,
+                self.table.c.repo_name,
+                self.table.c.lang,
+            ],
+            set_={
+                column: statement.excluded[column]
+                for column in ("path", "title", "content", "create_time", "change_time")
+            },
+        )
+
+    async def remove(self, keys: Iterable[Cursor]) -> int:
+        """Delete by `(repo_name, name, lang)`, return count."""
+
+        keys = list(keys)
+        if not keys:
+            return 0
+
+        async with self.engine.begin() as conn:
+            return await self._remove(conn, keys)
+
+    async def _remove(self, conn: AsyncConnection, keys: List[Cursor]) -> int:
+        statement = self.statement(
+            "remove",
+            lambda: delete(self.table).where(
+                self.table.c.repo_name == bindparam("repo_name_"),
+                self.table.c.name == bindparam("name_"),
+                self.table.c.lang == bindparam("lang_"),
+            ),
+        )
+        result = await conn.execute(
+            statement,
+            [
+                dict(repo_name_=repo, name_=name, lang_=lang)
+                for repo, name, lang in keys
+            ],
+        )
+
+        return result.rowcount
+
+    async def apply(
+        self, upgraded: Iterable[Document], removed: Iterable[Cursor]
+    ) -> None:
+        """Upgrade and remove in one transaction."""
+
+        upgraded, removed = list(upgraded), list(removed)
+        if not upgraded and not removed:
+            return
+
+        async with self.engine.begin() as conn:
+            if upgraded:
+                await self._upgrade(conn, upgraded)
+            if removed:
+                await self._remove(conn, removed)
+
+    async def check(self) -> bool:
+        statement = self.statement("check", lambda: select(exists(self.table.select())))
+        async with self.engine.connect() as conn:
+            return bool((await conn.execute(statement)).scalar())
+
+    async def display(self) -> List[DocumentMeta | None]:
+        """Never load `content`."""
+
+        statement = self.statement(
+            "display",
+            lambda: select(*self._meta_columns()).order_by(
+                self.table.c.repo_name, self.table.c.name, self.table.c.lang
+            ),
+        )
+        async with self.engine.connect() as conn:
+            result = await conn.execute(statement)
+
+            return [rowtometa(row, self.main_path) for row in result]
+
+    async def displaypage(
+        self, limit: int, after: Cursor | None = None
+    ) -> Tuple[List[DocumentMeta | None], Cursor | None]:
+        """Keyset pagination, the cost is same for every page."""
+
+        order = (self.table.c.repo_name, self.table.c.name, self.table.c.lang)
+        if after is None:
+            statement = self.statement(
+                "displaypage",
+                lambda: select(*self._meta_columns())
+                .order_by(*order)
+                .limit(bindparam("limit")),
+            )
+            params: dict = dict(limit=limit + 1)
+        else:
+            statement = self.statement(
+                "displaypage_after",
+                lambda: select(*self._meta_columns())
+                .where(
+                    tuple_(*order)
+                    > tuple_(
+                        bindparam("repo_name_"), bindparam("name_"), bindparam("lang_")
+                    )
+                )
+                .order_by(*order)
+                .limit(bindparam("limit")),
+            )
+            params = dict(
+                repo_name_=after[0], name_=after[1], lang_=after[2], limit=limit + 1
+            )
+
+        async with self.engine.connect() as conn:
+            metas = [
+                rowtometa(row, self.main_path)
+                for row in await conn.execute(statement, params)
+            ]
+
+        if len(metas) <= limit:
+            return metas, None  # type: ignore
+
+        last = metas[limit - 1]
+        return metas[:limit], (last.repo_name, last.name, last.language)  # type: ignore
@@ -31,9 +31,19 @@ if config.config_file_name is not None:
 # add MetaData object here
 # for 'autogenerate' support
 from chestnut.infra.deps.database.dao import chestnut_sqlite_metadata
+from chestnut.infra.deps.database.dao.document import DOCUMENT_FTS_TABLE
 
 target_metadata = chestnut_sqlite_metadata
 
+
+def include_name(name, type_, parent_names) -> bool:
+    """Skip FTS5 virtual table and its shadow tables."""
+
+    if type_ == "table" and name and name.startswith(DOCUMENT_FTS_TABLE):
+        return False
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -60,6 +70,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -67,7 +78,11 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_name=include_name,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
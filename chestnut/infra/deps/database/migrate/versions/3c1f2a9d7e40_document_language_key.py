@@ -0,0 +1,75 @@
+"""Add language to primary key of document
+
+Revision ID: 3c1f2a9d7e40
+Revises:
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from chestnut.infra.deps.database.dao.document import (
+    DOCUMENT_FTS_TABLE,
+    document_fts_ddl,
+)
+
+
+# revision identifiers, used by Alembic.
+revision = "3c1f2a9d7e40"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+COLUMNS = "name, repo_name, lang, path, title, content, create_time, change_time"
+
+
+def _recreate(primary_key: sa.PrimaryKeyConstraint, insert: str) -> None:
+    """SQLite can't alter primary key, copy rows to a new table."""
+
+    if not sa.inspect(op.get_bind()).has_table("document"):
+        # Not initialized, `create_all` makes the new one.
+        return
+
+    op.create_table(
+        "_document_new",
+        sa.Column("name", sa.String()),
+        sa.Column("repo_name", sa.String()),
+        sa.Column("lang", sa.String()),
+        sa.Column("path", sa.String(), nullable=True),
+        sa.Column("title", sa.String(), nullable=True),
+        sa.Column("content", sa.String()),
+        sa.Column("create_time", sa.DateTime()),
+        sa.Column("change_time", sa.DateTime()),
+        primary_key,
+        sa.ForeignKeyConstraint(
+            ["repo_name", "lang"], ["document_repo.name", "document_repo.lang"]
+        ),
+    )
+    op.execute(
+        f"{insert} INTO _document_new ({COLUMNS}) "
+        f"SELECT name, repo_name, coalesce(lang, 'en'), path, title, content, "
+        f"create_time, change_time FROM document"
+    )
+    # Indexes and FTS triggers are dropped with the table.
+    op.drop_table("document")
+    op.rename_table("_document_new", "document")
+    op.create_index("idx_title", "document", ["title"])
+
+    for ddl in document_fts_ddl:
+        op.execute(ddl)
+    # `rowid` changed.
+    op.execute(
+        f"INSERT INTO {DOCUMENT_FTS_TABLE}({DOCUMENT_FTS_TABLE}) VALUES ('rebuild')"
+    )
+
+
+def upgrade() -> None:
+    _recreate(
+        sa.PrimaryKeyConstraint("name", "repo_name", "lang", name="document_pk"),
+        "INSERT",
+    )
+
+
+def downgrade() -> None:
+    # Only one translation of a document is kept.
+    _recreate(sa.PrimaryKeyConstraint("name", "repo_name"), "INSERT OR IGNORE")
@@ -0,0 +1,98 @@
+""" `chestnut.infra.deps.database.search`
+
+    Full-text search over `document_fts`.
+"""
+from html import escape
+from sqlalchemy.sql import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from typing import Any, Dict, List, Tuple
+
+from .dao.document import DOCUMENT_FTS_TABLE
+
+
+# Private-use characters, replaced after escape.
+_MARK_OPEN = "\ue000"
+_MARK_CLOSE = "\ue001"
+
+
+SEARCH_STATEMENT = text(
+    "SELECT d.name, d.repo_name, d.lang, "
+    f"highlight({DOCUMENT_FTS_TABLE}, 2, :open, :close) AS title, "
+    f"snippet({DOCUMENT_FTS_TABLE}, 3, :open, :close, '…', :tokens) AS snippet, "
+    # Weights of (name, lang, title, content).
+    f"bm25({DOCUMENT_FTS_TABLE}, 0.0, 0.0, 10.0, 1.0) AS rank "
+    f"FROM {DOCUMENT_FTS_TABLE} "
+    f"JOIN document AS d ON d.rowid = {DOCUMENT_FTS_TABLE}.rowid "
+    f"WHERE {DOCUMENT_FTS_TABLE} MATCH :query "
+    "ORDER BY rank LIMIT :limit OFFSET :offset"
+)
+
+COUNT_STATEMENT = text(
+    f"SELECT count(*) FROM {DOCUMENT_FTS_TABLE} "
+    f"WHERE {DOCUMENT_FTS_TABLE} MATCH :query"
+)
+
+
+def toftsquery(keywords: str) -> str:
+    """Quote every term, so user input never breaks FTS5 syntax."""
+
+    return " ".join('"' + term.replace('"', '""') + '"' for term in keywords.split())
+
+
+def _mark(content: str | None, tag: str) -> str | None:
+    if content is None:
+        return None
+
+    return (
+        escape(content)
+        .replace(_MARK_OPEN, f"<{tag}>")
+        .replace(_MARK_CLOSE, f"</{tag}>")
+    )
+
+
+async def searchdocuments(
+    conn: AsyncConnection,
+    keywords: str,
+    limit: int = 10,
+    offset: int = 0,
+    snippet_tokens: int = 16,
+    tag: str = "mark",
+) -> Tuple[int, List[Dict[str, Any]]]:
+    """Return `(total, hits)`, hits are ranked by bm25.
+
+    Title and snippet are HTML escaped and matched parts are wrapped
+    with `<mark>`. With `trigram` tokenizer, a term shorter than 3
+    characters matches nothing.
+    """
+
+    query = toftsquery(keywords)
+    if not query:
+        return 0, []
+
+    total = (await conn.execute(COUNT_STATEMENT, dict(query=query))).scalar() or 0
+    if total == 0 or offset >= total:
+        return total, []
+
+    result = await conn.execute(
+        SEARCH_STATEMENT,
+        dict(
+            query=query,
+            open=_MARK_OPEN,
+            close=_MARK_CLOSE,
+            tokens=snippet_tokens,
+            limit=limit,
+            offset=offset,
+        ),
+    )
+
+    return total, [
+        dict(
+            name=row.name,
+            repo_name=row.repo_name,
+            lang=row.lang,
+            title=_mark(row.title, tag) if row.title else None,
+            snippet=_mark(row.snippet, tag),
+            rank=row.rank,
+        )
+        for row in result
+    ]
@@ -0,0 +1,252 @@
+""" `chestnut.infra.deps.document.cache`
+
+    Read-through cache in front of `DocRepo`.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .settings import document as docconf
+from ..database.document import DocumentDAO
+from ...helpers.cache import SizedLRU
+from ....application.document.domain.document import Document
+from ....application.document import exception as doc_exc
+from ....application.document.domain.meta import DocumentMeta
+from ....application.document.domain.repo import DocRepo, DocMetaRepo
+
+
+Key = Tuple[str, str, str]
+"""`(repo_name, name, language)`"""
+
+# Rough size of the rest of `Document`.
+DOCUMENT_OVERHEAD = 512
+
+
+def documentkey(document: Document) -> Key:
+    return document.meta.repo_name, document.meta.name, document.meta.language
+
+
+def sizeofdocument(document: Document) -> int:
+    return len((document.content or "").encode("utf-8")) + DOCUMENT_OVERHEAD
+
+
+class CachedDocRepo(DocRepo, DocMetaRepo):
+    """Keep `Document` in a LRU bounded by bytes, metadata is not cached.
+
+    Concurrent misses of the same name share one load. `invalidate` bumps
+    `generation`, a load started before it never writes back(stale) and
+    is not shared with loads started after it.
+    """
+
+    repo: DocRepo
+    cache: SizedLRU
+    names: Dict[str, Tuple[Key, ...]]
+    pending: Dict[Hashable, asyncio.Future]
+    generation: int
+    hits: int
+    misses: int
+    coalesced: int
+
+    def __init__(self, repo: DocRepo, max_size: int) -> None:
+        self.repo = repo
+        self.cache = SizedLRU(max_size, sizeof=sizeofdocument)
+        # Name => keys of all languages/repositories.
+        self.names = {}
+        self.pending = {}
+        self.generation = 0
+        # Per lookup, not per document.
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def _once(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        """Only the first caller loads, others wait for it."""
+
+        key = (self.generation, key)
+        if key in self.pending:
+            self.coalesced += 1
+            return await asyncio.shield(self.pending[key])
+
+        future = asyncio.get_running_loop().create_future()
+        self.pending[key] = future
+        try:
+            result = await load()
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Avoid "exception was never retrieved" without waiters.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self.pending[key]
+
+    def _cached(self, name: str) -> List[Document | None] | None:
+        keys = self.names.get(name)
+        if keys is None or not all(key in self.cache for key in keys):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return [self.cache.get(key) for key in keys]
+
+    def _store(self, name: str, documents: Iterable[Document | None]) -> None:
+        keys = []
+        for document in documents:
+            if document is None:
+                continue
+            key = documentkey(document)
+            self.cache.put(key, document)
+            keys.append(key)
+
+        # Not found is not cached, a new document shows at once.
+        if keys:
+            self.names[name] = tuple(keys)
+
+    async def loadbyname(self, name: str) -> List[Document | None]:
+        if (documents := self._cached(name)) is not None:
+            return documents
+
+        async def load() -> List[Document | None]:
+            generation = self.generation
+            documents = await self.repo.loadbyname(name)
+            if generation == self.generation:
+                self._store(name, documents)
+            return documents
+
+        return await self._once(("name", name), load)
+
+    async def loadbynames(self, names: Iterable[str]) -> List[Document | None]:
+        documents: List[Document | None] = []
+        missing = []
+        for name in names:
+            if (cached := self._cached(name)) is not None:
+                documents.extend(cached)
+            else:
+                missing.append(name)
+
+        if missing:
+            generation = self.generation
+            loaded = await self.repo.loadbynames(missing)
+            if generation != self.generation:
+                documents.extend(loaded)
+                return documents
+
+            grouped: Dict[str, List[Document | None]] = {}
+            for document in loaded:
+                if document is not None:
+                    grouped.setdefault(document.meta.name, []).append(document)
+            for name, group in grouped.items():
+                self._store(name, group)
+            documents.extend(loaded)
+
+        return documents
+
+    async def loadbycondition(self, **condition) -> List[Document | None]:
+        """Only cached if condition is a whole key."""
+
+        if set(condition) != {"repo_name", "name", "lang"}:
+            return await self.repo.loadbycondition(**condition)
+
+        key = (condition["repo_name"], condition["name"], condition["lang"])
+        if key in self.cache:
+            self.hits += 1
+            return [self.cache.get(key)]
+        self.misses += 1
+
+        async def load() -> List[Document | None]:
+            generation = self.generation
+            documents = await self.repo.loadbycondition(**condition)
+            if generation != self.generation:
+                return documents
+            for document in documents:
+                if document is not None:
+                    self.cache.put(documentkey(document), document)
+            return documents
+
+        return await self._once(("key", key), load)
+
+    async def upgrade(self, add_object: Any) -> None:
+        if not isinstance(add_object, Document):
+            add_object = list(add_object)
+
+        await self.repo.upgrade(add_object)
+
+        for document in (
+            [add_object] if isinstance(add_object, Document) else add_object
+        ):
+            self.invalidate(documentkey(document))
+
+    async def remove(self, keys: Iterable[Key]) -> int:
+        keys = list(keys)
+        count = await self.repo.remove(keys)
+
+        for key in keys:
+            self.invalidate(key)
+
+        return count
+
+    async def apply(self, upgraded: Iterable[Document], removed: Iterable[Key]) -> None:
+        upgraded, removed = list(upgraded), list(removed)
+        await self.repo.apply(upgraded, removed)
+
+        for key in [documentkey(document) for document in upgraded] + removed:
+            self.invalidate(key)
+
+    async def check(self) -> bool:
+        return await self.repo.check()
+
+    @property
+    def meta_repo(self) -> DocMetaRepo:
+        if not isinstance(self.repo, DocMetaRepo):
+            raise doc_exc.DomainModelTypeInvalid
+        return self.repo
+
+    async def display(self) -> List[DocumentMeta | None]:
+        return await self.meta_repo.display()
+
+    async def displaypage(
+        self, limit: int, after: Key | None = None
+    ) -> Tuple[List[DocumentMeta | None], Key | None]:
+        return await self.meta_repo.displaypage(limit, after)
+
+    def invalidate(self, key: Key | None = None) -> None:
+        """Drop one document(all languages of the name), or all."""
+
+        self.generation += 1
+        if key is None:
+            self.cache.clear()
+            self.names.clear()
+            return
+
+        for cached_key in self.names.pop(key[1], (key,)):
+            self.cache.pop(cached_key)
+        self.cache.pop(key)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, int | float]:
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            hit_rate=self.hit_rate,
+            coalesced=self.coalesced,
+            count=len(self.cache),
+            size=self.cache.size,
+            max_size=self.cache.max_size,
+        )
+
+
+def createdocumentrepo(
+    engine: AsyncEngine, max_size: int | None = None
+) -> CachedDocRepo:
+    """`DocumentDAO` behind `CachedDocRepo`, sized by `document.cache_size`."""
+
+    return CachedDocRepo(
+        DocumentDAO(engine), docconf.cache_size if max_size is None else max_size
+    )
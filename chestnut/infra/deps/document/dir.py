@@ -1,12 +1,259 @@
-import re
+import os
+import json
+import hashlib
+from io import BytesIO, TextIOWrapper
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Tuple
 
+from ...helpers.path import INSTANCE_PATH
+from ..markdown.head import scanhead
+
+
+MANIFEST_VERSION = 2
+"""Bump it when the manifest or the title rules changed."""
+
+
+def _digest(raw: bytes) -> str:
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def _walk(path: str, suffix: str = ".md") -> Iterator[Tuple[str, os.stat_result]]:
+    """Yield `(path, stat)` of files under `path`, one `scandir` per folder."""
+
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk(entry.path, suffix)
+            elif entry.name.endswith(suffix):
+                yield entry.path, entry.stat()
+
+
+class IndexEntry:
+    """One document in the manifest."""
+
+    __slots__ = ("path", "size", "mtime_ns", "digest", "title")
+
+    path: str
+    size: int
+    mtime_ns: int
+    digest: str
+    title: str | None
+
+    def __init__(
+        self, path: str, size: int, mtime_ns: int, digest: str, title: str | None
+    ) -> None:
+        self.path = path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.digest = digest
+        self.title = title
+
+    def dump(self) -> list:
+        return [self.path, self.size, self.mtime_ns, self.digest, self.title]
+
+    @classmethod
+    def load(cls, raw: list) -> "IndexEntry":
+        return cls(*raw)
+
+
+class IndexDiff:
+    """Paths added, changed and removed since last scan."""
+
+    __slots__ = ("added", "changed", "removed")
+
+    added: List[str]
+    changed: List[str]
+    removed: List[str]
+
+    def __init__(self) -> None:
+        self.added = []
+        self.changed = []
+        self.removed = []
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} +{len(self.added)} "
+            f"~{len(self.changed)} -{len(self.removed)}>"
+        )
+
+
+class DocumentIndex:
+    """Index of documents under `main_path`, persisted as a manifest.
+
+    A scan only `stat`s every file, and reads the ones which size or
+    mtime changed(to update the hash and title).
+    """
+
+    main_path: Path
+    manifest_path: Path | None
+    readonly: bool
+    """Load the manifest but never write it(another process owns it)."""
+    entries: Dict[str, IndexEntry]
+
+    def __init__(
+        self,
+        main_path: Path,
+        manifest_path: Path | None = None,
+        readonly: bool = False,
+    ) -> None:
+        self.main_path = main_path
+        self.manifest_path = manifest_path
+        self.readonly = readonly
+        self.entries = {}
+
+        self.load()
+
+    def __iter__(self) -> Iterator[IndexEntry]:
+        return iter(self.entries.values())
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __getitem__(self, path: str) -> IndexEntry:
+        return self.entries[path]
+
+    def load(self) -> None:
+        if not self.manifest_path or not self.manifest_path.exists():
+            return
+
+        try:
+            manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except ValueError:
+            # Broken manifest => rebuild.
+            return
+        if manifest.get("version") != MANIFEST_VERSION:
+            return
+
+        for raw in manifest["entries"]:
+            entry = IndexEntry.load(raw)
+            self.entries[entry.path] = entry
+
+    def dump(self) -> None:
+        """Write to a temporary file and replace, readers never see half."""
+
+        if not self.manifest_path or self.readonly:
+            return
+
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.manifest_path.with_name(
+            f"{self.manifest_path.name}.{os.getpid()}.tmp"
+        )
+        temporary.write_text(
+            json.dumps(
+                dict(
+                    version=MANIFEST_VERSION,
+                    root=str(self.main_path),
+                    entries=[entry.dump() for entry in self],
+                ),
+                ensure_ascii=False,
+            ),
+            encoding="utf-8",
+        )
+        os.replace(temporary, self.manifest_path)
+
+    def scan(self) -> IndexDiff:
+        """Update the index, return what changed."""
+
+        diff = IndexDiff()
+        touched = False
+        seen = set()
+
+        for path, stat in _walk(str(self.main_path)):
+            seen.add(path)
+            entry = self.entries.get(path)
+            if (
+                entry
+                and entry.size == stat.st_size
+                and entry.mtime_ns == stat.st_mtime_ns
+            ):
+                continue
+
+            raw = Path(path).read_bytes()
+            digest = _digest(raw)
+            touched = True
+
+            if entry and entry.digest == digest:
+                # Only touched.
+                entry.size, entry.mtime_ns = stat.st_size, stat.st_mtime_ns
+                continue
+
+            # Only decode head of the file.
+            head = TextIOWrapper(BytesIO(raw), encoding="utf-8")
+            title = scanhead(head).get("title")
+
+            self.entries[path] = IndexEntry(
+                path, stat.st_size, stat.st_mtime_ns, digest, title
+            )
+            (diff.changed if entry else diff.added).append(path)
+
+        for path in [path for path in self.entries if path not in seen]:
+            del self.entries[path]
+            diff.removed.append(path)
+
+        if touched or diff:
+            self.dump()
+
+        return diff
+
+
+_index_registry: Dict[Path, DocumentIndex] = {}
+
+
+def manifestpath(main_path: Path) -> Path | None:
+    """Under instance folder if it exists."""
+
+    if not INSTANCE_PATH.exists():
+        return None
+
+    digest = hashlib.blake2b(str(main_path.absolute()).encode(), digest_size=8)
+
+    return INSTANCE_PATH / "index" / (digest.hexdigest() + ".json")
+
+
+def getindex(main_path: Path) -> DocumentIndex:
+    """Return the index of `main_path`(shared in process)."""
+
+    main_path = main_path.absolute()
+
+    if main_path not in _index_registry:
+        _index_registry[main_path] = DocumentIndex(main_path, manifestpath(main_path))
+
+    return _index_registry[main_path]
+
+
+def tolocation(path: str | Path, main_path: Path) -> List[str] | None:
+    """`<main>/guide/newbie.cmn-Hans.md` => `['guide', 'newbie']`.
+
+    None if `path` is not under `main_path`. Unlike `name.split("_")`, names
+    with `_` are kept.
+    """
+
+    try:
+        relative = Path(path).absolute().relative_to(main_path.absolute())
+    except ValueError:
+        return None
+
+    return [*relative.parts[:-1], relative.name.split(".")[0]]
+
+
+def build_index(
+    main_path: Path,
+    readcontent: bool,
+    index: DocumentIndex | None = None,
+    scan: bool = True,
+) -> List[Dict[str, Any]]:
+    """Items of documents, `scan=False` if `index` is scanned just now."""
 
-def build_index(main_path: Path, readcontent: bool) -> List[Dict[str, Any]]:
     index_list = []
 
-    for file in main_path.rglob("*.md"):
+    index = index or getindex(main_path)
+    if scan:
+        index.scan()
+
+    for entry in index:
         """Content example:
 
         {
@@ -17,24 +264,15 @@ def build_index(main_path: Path, readcontent: bool) -> List[Dict[str, Any]]:
             'title': '面向萌新的安装指南',
         }
         """
+        file = entry.path
         # Relative path.
-        _relative_path = (
-            str(file)
-            .removeprefix(str(main_path))  # Remove prefix
-            .removesuffix(".md")  # Remove markdown
-            .split(".")[0]  # If have language part, remove it.
-            .replace("\\", "/")
-            .split("/")
-        )
+        _relative_path = tolocation(file, index.main_path) or []
         _file_name = (
-            str(file)
-            .removeprefix(str(main_path))  # Remove prefix
+            file.removeprefix(str(index.main_path))  # Remove prefix
             .removesuffix(".md")  # Remove markdown
             .replace("\\", "/")
             .split("/")[-1]
         )
-        # Remove blank element.
-        _relative_path.pop(0)
 
         # Name and language.
         if "." in _file_name:
@@ -44,20 +282,20 @@ def build_index(main_path: Path, readcontent: bool) -> List[Dict[str, Any]]:
             file_name = _file_name
             lang = "en"
 
-        _file_dict: Dict[str, str | List | None] = dict(
-            path=str(file),
+        _file_dict: Dict[str, str | int | List | None] = dict(
+            path=file,
             relative=_relative_path,
             name=file_name,
             lang=lang,
             content=None,
-            title=None,
+            # From manifest, no need to read file.
+            title=entry.title,
+            digest=entry.digest,
+            size=entry.size,
+            mtime_ns=entry.mtime_ns,
         )
         if readcontent:
-            content = file.read_text(encoding="utf-8")
-            if title := re.match(r"^# (.*)\n", content, re.MULTILINE):
-                title = title.group(1)
-            _file_dict["content"] = content
-            _file_dict["title"] = title
+            _file_dict["content"] = Path(file).read_text(encoding="utf-8")
 
         index_list.append(_file_dict)
 
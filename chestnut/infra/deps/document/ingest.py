@@ -0,0 +1,147 @@
+""" `chestnut.infra.deps.document.ingest`
+
+    Stages to load documents from a folder:
+
+    ```text
+    scan(stat) => read(thread pool) => parse(process pool) => rows
+    ```
+"""
+from collections import deque
+from concurrent.futures import (
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    ProcessPoolExecutor,
+)
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Tuple
+
+from .dir import DocumentIndex, build_index
+from ....application.document.domain.document import Document
+from ....application.document.domain.meta import DocumentMeta
+
+
+def _read(path: str) -> Tuple[str, str]:
+    return path, Path(path).read_text(encoding="utf-8")
+
+
+def scandocuments(index: DocumentIndex) -> List[str]:
+    """Scan stage: paths of all documents."""
+
+    index.scan()
+
+    return [entry.path for entry in index]
+
+
+def readdocuments(
+    paths: Iterable[str], max_workers: int | None = None
+) -> Iterator[Tuple[str, str]]:
+    """Read stage: `(path, content)`, I/O bound so threads are enough."""
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        yield from executor.map(_read, paths)
+
+
+def _parsechunk(
+    parse_service: Callable[..., dict],
+    chunk: List[Tuple[str, str]],
+    root_path: Path,
+) -> List[dict]:
+    return [parse_service(content, path, root_path) for path, content in chunk]
+
+
+def parsedocuments(
+    items: Iterable[Tuple[str, str]],
+    root_path: Path,
+    parse_service: Callable[..., dict],
+    max_workers: int | None = None,
+    chunksize: int = 16,
+) -> Iterator[Tuple[dict, str]]:
+    """Parse stage: `(metadata, content)` by `parse_service`, in order.
+
+    A chunk is parsed as soon as it is read, so reading and parsing overlap.
+    If `max_workers` is 1, run in current process.
+    """
+
+    if max_workers == 1:
+        for path, content in items:
+            yield parse_service(content, path, root_path), content
+        return
+
+    executor: Executor
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending: Deque[Tuple[Future, List[Tuple[str, str]]]] = deque()
+
+        def ready(wait: bool) -> Iterator[Tuple[dict, str]]:
+            while pending and (wait or pending[0][0].done()):
+                future, chunk = pending.popleft()
+                yield from zip(future.result(), (content for _, content in chunk))
+
+        for chunk in chunked(items, chunksize):
+            pending.append(
+                (executor.submit(_parsechunk, parse_service, chunk, root_path), chunk)
+            )
+            yield from ready(False)
+        yield from ready(True)
+
+
+def torow(meta: Dict[str, Any], content: str, repo_name: str = "main") -> dict:
+    """Metadata from `FilePathAdapter` to row of `document_table`."""
+
+    return dict(
+        # Route `a/b` => `a_b`
+        name="_".join(meta["location"]),
+        repo_name=repo_name,
+        lang=meta["language"],
+        path=str(meta["source"]),
+        title=meta["title"],
+        content=content,
+        create_time=datetime.fromtimestamp(meta["create_time"]),
+        change_time=datetime.fromtimestamp(meta["change_time"]),
+    )
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def scanmetas(
+    main_path: Path,
+    repo_name: str = "main",
+    index: DocumentIndex | None = None,
+    scan: bool = True,
+) -> List[DocumentMeta]:
+    """Metadata from index, only changed files are read(to hash)."""
+
+    return [
+        DocumentMeta(
+            # Route `a/b` => `a_b`, same as `torow`.
+            name="_".join(item["relative"]),
+            title=item["title"],
+            language=item["lang"],
+            source=Path(item["path"]),
+            location=item["relative"],
+            categories=[],
+            create_time=None,
+            change_time=datetime.fromtimestamp(item["mtime_ns"] / 1e9),
+            repo_name=repo_name,
+        )
+        for item in build_index(main_path, False, index, scan)
+    ]
+
+
+def loaddocument(meta: DocumentMeta) -> Document:
+    path = Path(meta.source)  # type: ignore
+    meta.create_time = datetime.fromtimestamp(path.stat().st_ctime)
+
+    return Document(
+        file_id=meta.name, meta=meta, content=path.read_text(encoding="utf-8")
+    )
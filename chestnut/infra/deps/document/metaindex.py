@@ -0,0 +1,186 @@
+""" `chestnut.infra.deps.document.metaindex`
+
+    Metadata of all documents in memory, for listing(never read bodies).
+
+    ```text
+    DocMetaRepo.display() / build_index(..., False) => MetaIndex
+    MetaIndex => trees(precomputed) => JSON bytes(once)
+    ```
+"""
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from ....application.document.domain.meta import DocumentMeta
+
+
+def docsuri(language: str, location: Iterable[str], prefix: str = "/docs") -> str:
+    """Route of `plain_docs_bp`: `/docs/<language>/<location>`."""
+
+    return "/".join((prefix, language, *location))
+
+
+class MetaRecord:
+    """Metadata of one document."""
+
+    __slots__ = (
+        "name",
+        "title",
+        "language",
+        "location",
+        "categories",
+        "change_time",
+        "repo_name",
+        "uri",
+    )
+
+    name: str
+    title: str | None
+    language: str
+    location: Tuple[str, ...]
+    categories: Tuple[str, ...]
+    change_time: float | None
+    repo_name: str
+    uri: str
+
+    def __init__(
+        self,
+        name: str,
+        title: str | None,
+        language: str,
+        location: Iterable[str],
+        categories: Iterable[str | None] = (),
+        change_time: float | None = None,
+        repo_name: str = "main",
+    ) -> None:
+        self.name = name
+        self.title = title
+        self.language = language
+        self.location = tuple(location)
+        self.categories = tuple(category for category in categories if category)
+        self.change_time = change_time
+        self.repo_name = repo_name
+        self.uri = docsuri(language, self.location)
+
+    @classmethod
+    def frommeta(cls, meta: DocumentMeta) -> "MetaRecord":
+        return cls(
+            meta.name,
+            meta.title,
+            meta.language,
+            meta.location,
+            meta.categories,  # type: ignore
+            meta.change_time.timestamp() if meta.change_time else None,
+            meta.repo_name,
+        )
+
+    @classmethod
+    def fromitem(cls, item: Dict[str, Any], repo_name: str = "main") -> "MetaRecord":
+        """Item of `build_index`."""
+
+        return cls(
+            "_".join(item["relative"]),
+            item["title"],
+            item["lang"],
+            item["relative"],
+            (),
+            item["mtime_ns"] / 1e9,
+            repo_name,
+        )
+
+    def todict(self) -> Dict[str, Any]:
+        return dict(
+            name=self.name,
+            title=self.title,
+            language=self.language,
+            location=self.location,
+            categories=self.categories,
+            change_time=self.change_time,
+            repo_name=self.repo_name,
+            uri=self.uri,
+        )
+
+
+class MetaIndex:
+    """Immutable, rebuild it when documents changed.
+
+    `tree` is nested by location:
+
+    ```python
+    {"guide": {"": [<newbie.en>, <newbie.cmn-Hans>], ...}}
+    ```
+    `""` keeps records of the folder, so `a` and `a/b` never conflict.
+    """
+
+    __slots__ = ("records", "languages", "categories", "tree", "_payloads")
+
+    records: Tuple[MetaRecord, ...]
+    languages: Dict[str, Tuple[MetaRecord, ...]]
+    categories: Dict[str, Tuple[MetaRecord, ...]]
+    tree: Dict[str, Any]
+    _payloads: Dict[str | None, bytes]
+
+    def __init__(self, records: Iterable[MetaRecord] = ()) -> None:
+        self.records = tuple(
+            sorted(records, key=lambda record: (record.location, record.language))
+        )
+
+        languages: Dict[str, List[MetaRecord]] = {}
+        categories: Dict[str, List[MetaRecord]] = {}
+        self.tree = {}
+        for record in self.records:
+            languages.setdefault(record.language, []).append(record)
+            for category in record.categories:
+                categories.setdefault(category, []).append(record)
+
+            node = self.tree
+            for part in record.location[:-1]:
+                node = node.setdefault(part, {})
+            node.setdefault(
+                record.location[-1] if record.location else "", {}
+            ).setdefault("", []).append(record)
+
+        self.languages = {key: tuple(value) for key, value in languages.items()}
+        self.categories = {key: tuple(value) for key, value in categories.items()}
+        self._payloads = {}
+
+    def __iter__(self) -> Iterator[MetaRecord]:
+        return iter(self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @classmethod
+    def frommetas(cls, metas: Iterable[DocumentMeta | None]) -> "MetaIndex":
+        return cls(MetaRecord.frommeta(meta) for meta in metas if meta)
+
+    @classmethod
+    def fromitems(
+        cls, items: Iterable[Dict[str, Any]], repo_name: str = "main"
+    ) -> "MetaIndex":
+        return cls(MetaRecord.fromitem(item, repo_name) for item in items)
+
+    def payload(self, language: str | None = None) -> bytes:
+        """JSON of records(and the language list), encoded only once."""
+
+        if language is not None and language not in self.languages:
+            # Any `?lang=` from clients, share one empty payload so the
+            # cache is bounded by known languages.
+            language = ""
+
+        if (payload := self._payloads.get(language)) is None:
+            records = (
+                self.records if language is None else self.languages.get(language, ())
+            )
+            payload = json.dumps(
+                dict(
+                    total=len(records),
+                    languages=sorted(self.languages),
+                    categories=sorted(self.categories),
+                    documents=[record.todict() for record in records],
+                ),
+                ensure_ascii=False,
+                separators=(",", ":"),
+            ).encode("utf-8")
+            self._payloads[language] = payload
+
+        return payload
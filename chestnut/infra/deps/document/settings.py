@@ -11,5 +11,12 @@ document = DepsConfig(
         path=DOCS_PATH,
         assets=DOCS_ASSETS_PATH,
         language="en",
+        prerender=True,  # Render all documents at startup.
+        stream_threshold=1024**2,  # Bytes, larger documents are streamed, not kept.
+        cache_size=32 * 1024**2,  # Bytes of documents kept by `CachedDocRepo`.
+        watch=True,  # Reindex when files changed, no restart.
+        watch_debounce=0.3,  # Seconds of quiet before reindex.
+        watch_interval=2.0,  # Seconds between scans, if inotify not available.
+        watch_database=True,  # Also update rows in database.
     ),
 )
@@ -0,0 +1,167 @@
+""" `chestnut.infra.deps.document.watch`
+
+    Watch documents folder, call back with `IndexDiff` after a burst of
+    changes settled. Use inotify if `inotify_simple` installed, or poll.
+"""
+import os
+import asyncio
+import hashlib
+import tempfile
+from pathlib import Path
+from sanic.log import logger
+from typing import IO, Awaitable, Callable, Dict
+
+from .dir import DocumentIndex, IndexDiff
+
+try:
+    from inotify_simple import INotify, flags  # type: ignore
+
+    INOTIFY = True
+except ImportError:
+    INOTIFY = False
+
+try:
+    import fcntl
+
+    FLOCK = True
+except ImportError:
+    FLOCK = False
+
+
+if INOTIFY:
+    WATCH_FLAGS = (
+        flags.CREATE
+        | flags.DELETE
+        | flags.MODIFY
+        | flags.CLOSE_WRITE
+        | flags.MOVED_FROM
+        | flags.MOVED_TO
+        | flags.DELETE_SELF
+    )
+
+
+def watchlockpath(main_path: Path) -> Path:
+    digest = hashlib.blake2b(str(main_path.absolute()).encode(), digest_size=8)
+
+    return Path(tempfile.gettempdir()) / f"chestnut-watch-{digest.hexdigest()}.lock"
+
+
+def acquireleader(path: Path) -> IO | None:
+    """Return the locked file if this process is the leader, keep it open.
+
+    The lock is released when the file is closed or the process exits, so
+    only one worker writes manifest and database. Without `fcntl`(Windows),
+    every process is a leader.
+    """
+
+    lock = open(path, "a+b")
+    if not FLOCK:
+        return lock
+
+    try:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        return None
+
+    return lock
+
+
+class DocumentWatcher:
+    """Re-scan `index` when files changed.
+
+    ```text
+    change => (more changes in `debounce` seconds?) => scan => callback
+    ```
+    """
+
+    index: DocumentIndex
+    callback: Callable[[IndexDiff], Awaitable[None]]
+    debounce: float
+    interval: float
+    use_inotify: bool
+
+    def __init__(
+        self,
+        index: DocumentIndex,
+        callback: Callable[[IndexDiff], Awaitable[None]],
+        debounce: float = 0.3,
+        interval: float = 2.0,
+        use_inotify: bool = INOTIFY,
+    ) -> None:
+        self.index = index
+        self.callback = callback
+        self.debounce = debounce
+        self.interval = interval
+        self.use_inotify = use_inotify and INOTIFY
+        self._changed = asyncio.Event()
+        self._watches: Dict[int, str] = {}
+
+    def _watch(self, inotify: "INotify", path: str) -> None:
+        for folder, _, _ in os.walk(path):
+            try:
+                self._watches[inotify.add_watch(folder, WATCH_FLAGS)] = folder
+            except OSError:
+                # Removed already.
+                continue
+
+    def _read(self, inotify: "INotify") -> None:
+        for event in inotify.read(timeout=0):
+            if event.mask & flags.ISDIR and event.mask & (
+                flags.CREATE | flags.MOVED_TO
+            ):
+                # New folder, watch it too.
+                parent = self._watches.get(event.wd)
+                if parent:
+                    self._watch(inotify, os.path.join(parent, event.name))
+            elif event.mask & flags.IGNORED:
+                self._watches.pop(event.wd, None)
+        self._changed.set()
+
+    async def _wait(self, timeout: float | None) -> bool:
+        """Return False if nothing changed in `timeout`."""
+
+        if not self.use_inotify:
+            # Polling: every scan may find changes.
+            if timeout is None:
+                await asyncio.sleep(self.interval)
+                return True
+            return False
+
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._changed.clear()
+
+        return True
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        inotify = None
+
+        if self.use_inotify:
+            inotify = INotify()
+            self._watch(inotify, str(self.index.main_path))
+            loop.add_reader(inotify.fileno(), self._read, inotify)
+
+        try:
+            while True:
+                await self._wait(None)
+                # Debounce: wait until it is quiet.
+                while await self._wait(self.debounce):
+                    ...
+
+                # `stat` every file, read changed only.
+                diff = await loop.run_in_executor(None, self.index.scan)
+                if not diff:
+                    continue
+                try:
+                    await self.callback(diff)
+                except Exception:
+                    # Keep watching.
+                    logger.exception(f"Failed to reindex {diff}.")
+        finally:
+            if inotify is not None:
+                loop.remove_reader(inotify.fileno())
+                inotify.close()
@@ -16,23 +16,34 @@ if not COLORFUL_CODE:
         return r"<pre><code>" + source_code + r"</code></pre>"
 
 else:
+    from functools import lru_cache
     from pygments import highlight
     from pygments.lexer import Lexer
     from pygments.lexers import get_lexer_by_name, guess_lexer
+    from pygments.util import ClassNotFound
 
     from pygments.formatters.html import HtmlFormatter
 
-    # Export function code_render.
-    def rendercode(
-        source_code: str, lexer: str | None = None, linestart: int | None = None
-    ) -> str:
-        """Let code into HTML."""
+    from .cache import HighlightCache
+    from .settings import highlight as highlightconf
 
-        if lexer:
-            lexer_: Lexer = get_lexer_by_name(lexer, stripall=True)
-        else:
-            lexer_: Lexer = guess_lexer(source_code)
+    code_cache = HighlightCache(
+        highlightconf.code_cache_size,
+        highlightconf.code_cache_path if highlightconf.code_cache_disk else None,
+    )
+    """Shared by markdown renderer and error pages."""
+
+    @lru_cache(maxsize=highlightconf.cache_size)
+    def getlexer(alias: str) -> Lexer:
+        """Lexer by alias, fallback to default lexer if not found."""
 
+        try:
+            return get_lexer_by_name(alias, stripall=True)
+        except ClassNotFound:
+            return get_lexer_by_name(highlightconf.default_lexer, stripall=True)
+
+    @lru_cache(maxsize=highlightconf.cache_size)
+    def getformatter(linestart: int | None) -> HtmlFormatter:
         if not linestart:
             line_args = {}
         else:
@@ -40,7 +51,27 @@ else:
                 linenos="inline",
                 linenostart=linestart,
             )
-        formatter = HtmlFormatter(**line_args)  # type: ignore
-        # formatter = SvgFormatter(**line_args, norwap=True)
+        return HtmlFormatter(**line_args)  # type: ignore
+        # return SvgFormatter(**line_args, norwap=True)
+
+    # Export function code_render.
+    def rendercode(
+        source_code: str, lexer: str | None = None, linestart: int | None = None
+    ) -> str:
+        """Let code into HTML."""
+
+        key = code_cache.key(source_code, lexer, linestart)
+        if (html := code_cache.get(key)) is not None:
+            return html
+
+        if lexer:
+            lexer_: Lexer = getlexer(lexer)
+        elif highlightconf.guess_lexer:
+            lexer_: Lexer = guess_lexer(source_code)
+        else:
+            lexer_: Lexer = getlexer(highlightconf.default_lexer)
+
+        html = highlight(source_code, lexer_, getformatter(linestart))
+        code_cache.put(key, html)
 
-        return highlight(source_code, lexer_, formatter)
+        return html
@@ -0,0 +1,66 @@
+""" `chestnut.infra.deps.highlight.cache`
+
+    Highlighted code blocks, addressed by the hash of code.
+"""
+import os
+import hashlib
+from pathlib import Path
+
+from ...helpers.cache import SizedLRU
+
+
+def sizeofhtml(html: str) -> int:
+    """Bytes, not characters, CJK takes 3 bytes in UTF-8."""
+
+    return len(html.encode("utf-8"))
+
+
+class HighlightCache:
+    """Highlighted HTML in memory(`max_size` in bytes), and on disk(optional)."""
+
+    memory: SizedLRU
+    path: Path | None
+
+    def __init__(self, max_size: int, path: Path | None = None) -> None:
+        self.memory = SizedLRU(max_size, sizeof=sizeofhtml)
+        self.path = path
+
+    @staticmethod
+    def key(source_code: str, lexer: str | None, linestart: int | None) -> str:
+        digest = hashlib.blake2b(source_code.encode("utf-8"), digest_size=16)
+        digest.update(f"\0{lexer or ''}\0{linestart or 0}".encode("utf-8"))
+
+        return digest.hexdigest()
+
+    def get(self, key: str) -> str | None:
+        html = self.memory.get(key)
+        if html is not None or self.path is None:
+            return html
+
+        try:
+            html = (self.path / key[:2] / key).read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+        # Promote.
+        self.memory.put(key, html)
+        return html
+
+    def put(self, key: str, html: str) -> None:
+        self.memory.put(key, html)
+
+        if self.path is None:
+            return
+
+        file = self.path / key[:2] / key
+        try:
+            file.parent.mkdir(parents=True, exist_ok=True)
+            temp = file.with_suffix(f".{os.getpid()}.tmp")
+            temp.write_text(html, encoding="utf-8")
+            os.replace(temp, file)
+        except OSError:
+            # Disk is only a backup.
+            pass
+
+    def stats(self) -> dict:
+        return self.memory.stats()
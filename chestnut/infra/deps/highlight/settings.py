@@ -0,0 +1,16 @@
+from ...helpers.config import DepsConfig
+from ...helpers.path import INSTANCE_PATH
+
+
+highlight = DepsConfig(
+    "highlight",
+    True,
+    dict(
+        default_lexer="text",  # Lexer of code block without language.
+        guess_lexer=False,  # Guess by content, VERY slow.
+        cache_size=64,  # Lexers and formatters kept.
+        code_cache_size=4 * 1024**2,  # Bytes(UTF-8) of highlighted code kept.
+        code_cache_disk=False,  # Keep highlighted code after restart.
+        code_cache_path=INSTANCE_PATH / "cache" / "highlight",
+    ),
+)
@@ -1,15 +1,43 @@
+import hashlib
+from functools import lru_cache
 from pathlib import Path
 from jinja2 import (
     Environment,
     select_autoescape,
     FileSystemLoader,
     BaseLoader,
+    BytecodeCache,
+    FileSystemBytecodeCache,
 )
-from typing import Tuple
+from typing import List, Tuple
+
+from ...helpers.path import INSTANCE_PATH, TEMPLATE_PATH
+from ....__version__ import __version__
+
+
+TEMPLATE_CACHE_PATH = Path(INSTANCE_PATH / "cache" / "jinja")
+
+
+@lru_cache(maxsize=None)
+def templatebytecodecache(enable_async: bool = False) -> BytecodeCache:
+    """Compiled templates shared by environments and processes.
+
+    Async and sync environment compile different code, so they are
+    stored in different folders.
+    """
+
+    path = TEMPLATE_CACHE_PATH / ("async" if enable_async else "sync")
+    try:
+        path.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        # Read-only instance => temporary folder.
+        return FileSystemBytecodeCache()
+
+    return FileSystemBytecodeCache(str(path))
 
 
 def returnloaderandenv(
-    path: Path, enable_async: bool
+    path: Path, enable_async: bool, bytecode_cache: BytecodeCache | None = None
 ) -> Tuple[BaseLoader, Environment]:
     loader = FileSystemLoader(path)
 
@@ -18,6 +46,44 @@ def returnloaderandenv(
         autoescape=select_autoescape(),
         enable_async=enable_async,
         extensions=["jinja2.ext.i18n"],
+        bytecode_cache=bytecode_cache or templatebytecodecache(enable_async),
     )
 
     return loader, environment
+
+
+def precompiletemplates(path: Path) -> List[str]:
+    """Compile all templates into bytecode cache(both sync and async)."""
+
+    compiled = []
+
+    for enable_async in (False, True):
+        loader, environment = returnloaderandenv(path, enable_async)
+        for name in environment.list_templates():
+            environment.get_template(name)
+            compiled.append(name)
+
+    return compiled
+
+
+@lru_cache(maxsize=None)
+def templatefingerprint(*paths: Path, version: str = __version__) -> Tuple[str, int]:
+    """`(digest, mtime_ns)` of everything a page depends on besides its content.
+
+    Files under `paths`(templates and instance config by default) and the
+    app `version`, by stat only. Once per process, the reloader restarts
+    workers when templates changed.
+    """
+
+    digest = hashlib.blake2b(version.encode(), digest_size=8)
+    mtime_ns = 0
+    for path in paths or (TEMPLATE_PATH, *INSTANCE_PATH.glob("config*.toml")):
+        files = sorted(path.rglob("*")) if path.is_dir() else [path]
+        for file in files:
+            if not file.is_file():
+                continue
+            stat = file.stat()
+            digest.update(f"{file}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+            mtime_ns = max(mtime_ns, stat.st_mtime_ns)
+
+    return digest.hexdigest(), mtime_ns
@@ -1,30 +1,98 @@
-from typing import List, Any, Dict
-from multidict import CIMultiDict  # type: ignore
-
-
-def parseheaders(
-    headers: CIMultiDict[str] | Dict[str, str]
-) -> List[Dict[str, str | int]]:
-    language_ = headers.get("Accept-Language")
-    if not language_:
-        language_ = ["en;q=0.8", "*;q=0.5"]
-    else:
-        language_ = language_.split(",")
-        # Example:
-        # ['zh-CN', 'zh;q=0.9', 'en;q=0.8', 'en-GB;q=0.7', 'en-US;q=0.6', 'zh-TW;q=0.5']
+""" `chestnut.infra.deps.i18n.language`
+
+    Negotiate language by `Accept-Language`.
+
+    ```text
+    "zh-CN,zh;q=0.9,en;q=0.8" => (("zh-CN", 1.0), ("zh", 0.9), ("en", 0.8))
+                              => "cmn-Hans"(with ("cmn-Hans", "en") available)
+    ```
+    Both steps are cached, browsers send only a few distinct headers.
+"""
+from functools import lru_cache
+from typing import Dict, Iterable, Tuple
+
+
+AcceptLanguage = Tuple[Tuple[str, float], ...]
+
+DEFAULT_ACCEPT_LANGUAGE: AcceptLanguage = (("en", 0.8), ("*", 0.5))
+
+LANGUAGE_ALIASES: Dict[str, Tuple[str, ...]] = {
+    # Documents are named by ISO 639-3(`cmn`), browsers send `zh`.
+    "zh": ("cmn-hans", "cmn"),
+    "zh-cn": ("cmn-hans",),
+    "zh-sg": ("cmn-hans",),
+    "zh-hans": ("cmn-hans",),
+    "zh-tw": ("cmn-hant",),
+    "zh-hk": ("cmn-hant",),
+    "zh-mo": ("cmn-hant",),
+    "zh-hant": ("cmn-hant",),
+}
+
+
+@lru_cache(maxsize=256)
+def parseacceptlanguage(header: str | None) -> AcceptLanguage:
+    """Sorted by weight(stable), invalid and `q=0` items are dropped."""
+
+    if not header:
+        return DEFAULT_ACCEPT_LANGUAGE
+
     language = []
-    for lang_item in language_:
-        if ";q=" in lang_item:
-            lang_id, weight = lang_item.split(";q=")
-        else:
-            lang_id, weight = lang_item, "1.0"
-        language.append(dict(lang=lang_id, weight=float(weight)))
-    # language example:
-    # [
-    # {'lang': 'zh-CN', 'weight': 1.0},
-    # {'lang': 'zh', 'weight': 0.9},
-    # {'lang': 'en', 'weight': 0.8},
-    # {'lang': 'en-GB', 'weight': 0.7},
-    # {'lang': 'en-US', 'weight': 0.6},
-    # {'lang': 'zh-TW', 'weight': 0.5}]
-    return language
+    for item in header.split(","):
+        tag, _, params = item.partition(";")
+        tag = tag.strip()
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if tag and weight > 0:
+            language.append((tag, min(weight, 1.0)))
+
+    return tuple(sorted(language, key=lambda item: -item[1]))
+
+
+def _candidates(tag: str) -> Iterable[str]:
+    tag = tag.lower()
+    yield tag
+    yield from LANGUAGE_ALIASES.get(tag, ())
+
+
+@lru_cache(maxsize=1024)
+def negotiatelanguage(
+    accepted: AcceptLanguage, available: Tuple[str, ...], default: str
+) -> str:
+    """Best one of `available` for `accepted`.
+
+    For every tag by weight:
+    1. Same tag(case insensitive), or its alias(`zh-CN` => `cmn-Hans`).
+    2. Less specific tag: `en-GB` => `en`.
+    3. More specific tag: `en` => `en-US`, `cmn` => `cmn-Hans`.
+
+    `*` or nothing matched => `default`(if available, or the first one).
+    """
+
+    lowered = {language.lower(): language for language in available}
+    fallback = default if default.lower() in lowered or not available else available[0]
+
+    for tag, _ in accepted:
+        if tag == "*":
+            return fallback
+
+        candidates = tuple(_candidates(tag))
+        for candidate in candidates:
+            if candidate in lowered:
+                return lowered[candidate]
+        for candidate in candidates:
+            subtags = candidate.split("-")
+            for end in range(len(subtags) - 1, 0, -1):
+                if (truncated := "-".join(subtags[:end])) in lowered:
+                    return lowered[truncated]
+        for candidate in candidates:
+            for language in sorted(lowered):
+                if language.startswith(candidate + "-"):
+                    return lowered[language]
+
+    return fallback
@@ -0,0 +1,95 @@
+""" `chestnut.infra.deps.markdown.head`
+
+    Metadata and title of a markdown file, from its head only:
+
+    ```text
+    ---            <= META_BEGIN_PATTERN(first line only)
+    key: value
+        more value
+    ---            <= META_END_PATTERN(in MAX_META_LINES)
+    ...
+    # Title        <= first header(or setext `Title\n===`), stop.
+    ```
+
+    `title` in metadata overrides the header. If the first header is not
+    level 1, there's no title.
+"""
+import re
+from typing import Any, Dict, Iterable
+
+
+# from https://github.com/Python-Markdown/markdown/blob/master/markdown/extensions/meta.py
+META_PATTERN = re.compile(r"^[ ]{0,3}(?P<key>[A-Za-z0-9_-]+):\s*(?P<value>.*)")
+META_MORE_PATTERN = re.compile(r"^[ ]{4,}(?P<value>.*)")
+META_BEGIN_PATTERN = re.compile(r"^-{3}(\s.*)?")
+META_END_PATTERN = re.compile(r"^(-{3}|\.{3})(\s.*)?")
+
+HEADER_PATTERN = re.compile(r"^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$")
+SETEXT_PATTERN = re.compile(r"^ {0,3}(=+|-+)[ \t]*$")
+FENCE_PATTERN = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+MAX_HEAD_LINES = 64
+"""Lines to look for title after metadata, a title must be in head."""
+MAX_META_LINES = 256
+"""Lines of metadata, an unclosed `---` is not read to the end."""
+
+
+def scanhead(
+    lines: Iterable[str],
+    max_head_lines: int = MAX_HEAD_LINES,
+    max_meta_lines: int = MAX_META_LINES,
+) -> Dict[str, Any]:
+    """Scan lines from the beginning and stop at the first header."""
+
+    metadata: Dict[str, Any] = {}
+    lines = iter(lines)
+
+    line = next(lines, None)
+    if line is not None and META_BEGIN_PATTERN.match(line):
+        key = None
+        for count, line in enumerate(lines, 1):
+            if META_END_PATTERN.match(line):
+                break
+            if count > max_meta_lines:
+                # Not closed in head, not metadata and no title.
+                return {}
+            if match := META_PATTERN.match(line):
+                key = match.group("key").lower()
+                metadata[key] = match.group("value").strip()
+            elif key and (match := META_MORE_PATTERN.match(line)):
+                # Continued => list.
+                if isinstance(metadata[key], str):
+                    metadata[key] = [metadata[key]] if metadata[key] else []
+                metadata[key].append(match.group("value").strip())
+        line = next(lines, None)
+
+    fence = None
+    previous = None
+    for _ in range(max_head_lines):
+        if line is None:
+            break
+        line = line.rstrip("\r\n")
+
+        if match := FENCE_PATTERN.match(line):
+            marker = match.group(1)
+            if fence is None:
+                fence = marker
+            elif marker[0] == fence[0] and len(marker) >= len(fence):
+                fence = None
+            previous = None
+        elif fence is not None:
+            # Headers in code block are not title.
+            previous = None
+        elif match := HEADER_PATTERN.match(line):
+            if len(match.group(1)) == 1:
+                metadata.setdefault("title", (match.group(2) or "").strip())
+            break
+        elif previous and (match := SETEXT_PATTERN.match(line)):
+            if match.group(1)[0] == "=":
+                metadata.setdefault("title", previous.strip())
+            break
+        else:
+            previous = line if line.strip() else None
+
+        line = next(lines, None)
+
+    return metadata
@@ -0,0 +1,166 @@
+""" `chestnut.infra.deps.markdown.store`
+
+    Keep rendered documents in memory, so a page view only re-renders
+    the markdown file when the source has changed.
+"""
+import os
+import hashlib
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List
+
+from .service import DocumentMarkdown
+from ....application.document.domain.document import (
+    ContentSplitService,
+    Section,
+    findsection,
+)
+
+
+_SPLIT_SERVICE = ContentSplitService()
+
+
+class RenderedDocument:
+    """Rendered HTML of a document and the `mtime` it was rendered from.
+
+    `html` is None if the document is only fingerprinted, `sections` is
+    the section index(byte offsets) of the same source.
+    """
+
+    __slots__ = ("path", "mtime_ns", "digest", "html", "size", "sections")
+
+    path: Path
+    mtime_ns: int
+    digest: str
+    html: str | None
+    size: int
+    sections: List[Section]
+
+    def __init__(
+        self,
+        path: Path,
+        mtime_ns: int,
+        digest: str,
+        html: str | None = None,
+        size: int = 0,
+        sections: List[Section] | None = None,
+    ) -> None:
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.digest = digest
+        self.html = html
+        self.size = size
+        self.sections = sections or []
+
+
+class RenderedStore:
+    """Rendered HTML of documents, keyed by path and checked by mtime.
+
+    HTML of documents of `max_size` bytes or more is never kept, they are
+    only fingerprinted(and streamed by the caller).
+    """
+
+    documents: Dict[Path, RenderedDocument]
+    render_service: Callable[[str], str]
+    max_size: int | None
+
+    def __init__(
+        self,
+        render_service: Callable[[str], str] | None = None,
+        max_size: int | None = None,
+    ) -> None:
+        self.documents = {}
+        # `mistune.Markdown` is stateless between calls, so one is enough.
+        self.render_service = render_service or DocumentMarkdown()  # type: ignore
+        self.max_size = max_size
+
+    def __contains__(self, path: Path) -> bool:
+        return path in self.documents
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def iskept(self, size: int) -> bool:
+        return self.max_size is None or size < self.max_size
+
+    def render(self, path: Path, mtime_ns: int | None = None) -> RenderedDocument:
+        """Render the file and put it into store, HTML only if it is kept."""
+
+        if mtime_ns is None:
+            mtime_ns = os.stat(path).st_mtime_ns
+
+        source = path.read_bytes()
+        document = RenderedDocument(
+            path,
+            mtime_ns,
+            hashlib.blake2b(source, digest_size=16).hexdigest(),
+            self.render_service(source.decode("utf-8")),
+            len(source),
+            _SPLIT_SERVICE.split(source),
+        )
+        if self.iskept(document.size):
+            self.documents[path] = document
+        else:
+            self.documents[path] = RenderedDocument(
+                path, mtime_ns, document.digest, None, document.size, document.sections
+            )
+
+        return document
+
+    def fingerprint(self, path: Path) -> RenderedDocument:
+        """Return document with digest and mtime, but not render it."""
+
+        mtime_ns = os.stat(path).st_mtime_ns
+        document = self.documents.get(path)
+
+        if document is None or document.mtime_ns != mtime_ns:
+            source = path.read_bytes()
+            document = RenderedDocument(
+                path,
+                mtime_ns,
+                hashlib.blake2b(source, digest_size=16).hexdigest(),
+                size=len(source),
+                sections=_SPLIT_SERVICE.split(source),
+            )
+            self.documents[path] = document
+
+        return document
+
+    def get(self, path: Path) -> str:
+        """Return rendered HTML, render it only if the file was changed."""
+
+        document = self.fingerprint(path)
+
+        if document.html is None:
+            document = self.render(path, document.mtime_ns)
+
+        return document.html  # type: ignore
+
+    def section(self, path: Path, anchor: str) -> Section | None:
+        return findsection(self.fingerprint(path).sections, anchor)
+
+    def rendersection(self, path: Path, anchor: str) -> str | None:
+        """Render only one section, read its byte range from the file."""
+
+        if (section := self.section(path, anchor)) is None:
+            return None
+
+        with open(path, "rb") as file:
+            file.seek(section.start)
+            source = file.read(section.end - section.start)
+
+        return self.render_service(source.decode("utf-8"))
+
+    def prerender(self, paths: Iterable[Path]) -> None:
+        """Render all documents(always at startup), except too large ones."""
+
+        for path in paths:
+            if self.iskept(self.fingerprint(path).size):
+                self.get(path)
+
+    def invalidate(self, path: Path | None = None) -> None:
+        """Drop one document, or all if `path` is None."""
+
+        if path is None:
+            self.documents.clear()
+        else:
+            self.documents.pop(path, None)
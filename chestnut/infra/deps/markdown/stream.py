@@ -0,0 +1,102 @@
+""" `chestnut.infra.deps.markdown.stream`
+
+    Render a large document section by section, so the whole HTML is
+    never in memory.
+"""
+import re
+from typing import Callable, Iterator, List, Tuple
+
+
+HEADING_PATTERN = re.compile(r"^ {0,3}#{1,6}(?:[ \t]|$)")
+FENCE_PATTERN = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+# `[label]: url` and `[^note]: text`.
+DEFINITION_PATTERN = re.compile(r"^ {0,3}\[[^\]]+\]:")
+CONTINUATION_PATTERN = re.compile(r"^(?: {4}|\t)")
+
+
+def scandefinitions(lines: List[str]) -> List[Tuple[int, str]]:
+    """Definitions of reference links and footnotes(not in fenced code),
+    with their offset in source.
+    """
+
+    definitions: List[Tuple[int, str]] = []
+    position = 0
+    fence: str | None = None
+
+    for line in lines:
+        if fence_match := FENCE_PATTERN.match(line):
+            marker = fence_match.group(1)
+            if fence is None:
+                fence = marker
+            elif marker[0] == fence[0] and len(marker) >= len(fence):
+                fence = None
+        elif fence is None:
+            if DEFINITION_PATTERN.match(line):
+                definitions.append((position, line))
+            elif definitions and CONTINUATION_PATTERN.match(line):
+                # Indented lines of a footnote follow it directly.
+                offset, text = definitions[-1]
+                if offset + len(text) == position:
+                    definitions[-1] = (offset, text + line)
+
+        position += len(line)
+
+    return definitions
+
+
+def splitsections(source: str, min_size: int = 64 * 1024) -> Iterator[str]:
+    """Split before headings(not in fenced code), each part >= `min_size`.
+
+    Definitions of reference links and footnotes from other parts are
+    appended to each part, so they still resolve.
+    """
+
+    lines = source.splitlines(keepends=True)
+    definitions = scandefinitions(lines)
+
+    def withdefinitions(start: int, end: int) -> str:
+        part = source[start:end]
+        shared = "".join(
+            text if text.endswith("\n") else text + "\n"
+            for offset, text in definitions
+            if not start <= offset < end
+        )
+        if not shared:
+            return part
+        return part.rstrip("\n") + "\n\n" + shared
+
+    part_start = 0
+    position = 0
+    fence: str | None = None
+
+    for line in lines:
+        if fence_match := FENCE_PATTERN.match(line):
+            marker = fence_match.group(1)
+            if fence is None:
+                fence = marker
+            elif marker[0] == fence[0] and len(marker) >= len(fence):
+                fence = None
+        elif (
+            fence is None
+            and position - part_start >= min_size
+            and HEADING_PATTERN.match(line)
+        ):
+            yield withdefinitions(part_start, position)
+            part_start = position
+
+        position += len(line)
+
+    if part_start < len(source):
+        # Not closed, anything appended would be code.
+        yield (
+            withdefinitions(part_start, len(source))
+            if fence is None
+            else source[part_start:]
+        )
+
+
+def iterrender(
+    source: str, render_service: Callable[[str], str], min_size: int = 64 * 1024
+) -> Iterator[str]:
+    for section in splitsections(source, min_size):
+        yield render_service(section)
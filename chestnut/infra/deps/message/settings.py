@@ -6,5 +6,14 @@ message = DepsConfig(
     True,
     dict(
         subcribe_url="/subscribe",
+        queue_size=64,  # Events waiting for one client.
+        history_size=256,  # Events kept to replay by `Last-Event-ID`.
+        slow_client="drop",  # Queue full: "drop" oldest or "disconnect".
+        bus="socket",  # Between workers: "socket"(UNIX) or "local"(no delivery).
+        bus_path=None,  # Folder of sockets, default is under temp folder.
+        heartbeat=15,  # Seconds between comment heartbeats, 0 to disable.
+        send_timeout=30,  # Seconds, a client not reading is dropped.
+        max_connections=1024,  # Of each worker, 0 for unlimited.
+        retry_after=5,  # Seconds, with 503 when `max_connections` reached.
     ),
 )
@@ -0,0 +1,84 @@
+""" `chestnut.infra.helpers.cache`
+
+    LRU cache bounded by size of values.
+"""
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+
+class SizedLRU:
+    """LRU cache which total size of values never over `max_size`."""
+
+    max_size: int
+    size: int
+    hits: int
+    misses: int
+
+    def __init__(self, max_size: int, sizeof: Callable[[Any], int] = len) -> None:
+        self.max_size = max_size
+        self.sizeof = sizeof
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._items: OrderedDict[Hashable, Any] = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            value = self._items[key]
+        except KeyError:
+            self.misses += 1
+            return default
+
+        self._items.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = self.sizeof(value)
+        if size > self.max_size:
+            # Larger than whole cache, never keep it.
+            self.pop(key)
+            return
+
+        self.pop(key)
+        self._items[key] = value
+        self._sizes[key] = size
+        self.size += size
+
+        while self.size > self.max_size:
+            oldest, _ = self._items.popitem(last=False)
+            self.size -= self._sizes.pop(oldest)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        if key not in self._items:
+            return default
+
+        self.size -= self._sizes.pop(key)
+        return self._items.pop(key)
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._sizes.clear()
+        self.size = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, int | float]:
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            hit_rate=self.hit_rate,
+            count=len(self),
+            size=self.size,
+            max_size=self.max_size,
+        )
@@ -24,7 +24,11 @@ def create_app(
 
     from .exception import configure_exceptions
     from .http_redir import add_http_redirect
-    from .middleware import register_middleware
+    from .middleware import (
+        register_middleware,
+        register_language,
+        register_compression,
+    )
     from .settings import create_config
     from .settings.location import CONFIG_LOCATION
     from .sse import register_stream
@@ -78,6 +82,12 @@ def create_app(
         # Blueprints.
         register_blueprint(app)
 
+    # Language(also for launch app).
+    register_language(app)
+
+    # Compression(also for launch app).
+    register_compression(app)
+
     # SSE.
     register_stream(app)
 
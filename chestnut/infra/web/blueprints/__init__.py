@@ -24,6 +24,8 @@ def register_blueprint(app: Sanic) -> None:
 
 def reload_paths() -> List:
     from .web.path import MAIN_PUBLIC_PATH
+    from ...deps.document.settings import document as docconf
     from ...helpers.path import BACKEND_PATH, DOCS_PATH
 
-    return [MAIN_PUBLIC_PATH, BACKEND_PATH, DOCS_PATH]
+    # Documents are reindexed by watcher, no need to restart.
+    return [MAIN_PUBLIC_PATH, BACKEND_PATH] + ([] if docconf.watch else [DOCS_PATH])
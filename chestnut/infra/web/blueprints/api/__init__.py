@@ -1,8 +1,10 @@
 from sanic import Sanic, Blueprint
 
+from .docs import docs_api
+
 
 api = Blueprint("api")
 
 
 API_PREFIX = "/api"
-api_bp = Blueprint.group(api, url_prefix=API_PREFIX)
+api_bp = Blueprint.group(api, docs_api, url_prefix=API_PREFIX)
@@ -0,0 +1,89 @@
+""" `chestnut.infra.web.blueprints.api.docs`
+    ~~~~
+
+    APIs of documents.
+"""
+from sanic import Blueprint, Sanic
+from sanic.request import Request
+from sanic.response import json, raw, HTTPResponse
+from sanic.exceptions import BadRequest, NotFound
+
+from .....application.document import exception as doc_exc
+from .....application.document.dto.present import DocumentPresenter
+from .....application.document.usecase.display import DisplayDocument
+from ....deps.database.document import DocumentDAO
+from ....deps.database.search import searchdocuments
+from ....deps.document.dir import build_index
+from ....deps.document.metaindex import MetaIndex
+from ....deps.document.settings import document as docconf
+
+
+docs_api = Blueprint("docs_api", url_prefix="/docs")
+
+
+MAX_PAGE_SIZE = 50
+
+
+async def getmetaindex(app: Sanic) -> MetaIndex:
+    """Build once from database(or manifest), the watcher drops it."""
+
+    if (index := getattr(app.ctx, "meta_index", None)) is None:
+        if hasattr(app.ctx, "database_engine"):
+            index = MetaIndex.frommetas(
+                await DocumentDAO(app.ctx.database_engine).display()
+            )
+        else:
+            index = MetaIndex.fromitems(build_index(docconf.path, False))
+        app.ctx.meta_index = index
+
+    return index
+
+
+@docs_api.get("/")
+async def listing(request: Request) -> HTTPResponse:
+    """Metadata of all documents, `?lang=...` to filter."""
+
+    index = await getmetaindex(request.app)
+
+    return raw(index.payload(request.args.get("lang")), content_type="application/json")
+
+
+@docs_api.get("/document/<name>")
+async def document(request: Request, name: str) -> HTTPResponse:
+    """All languages of one document, through `app.ctx.document_repo`(cached)."""
+
+    try:
+        presenter = await DisplayDocument(request.app.ctx.document_repo).show(name)
+    except doc_exc.DocumentNotFound:
+        raise NotFound(f"No document `{name}`.")
+
+    return raw(DocumentPresenter.encode([presenter]), content_type="application/json")
+
+
+@docs_api.get("/stats")
+async def stats(request: Request) -> HTTPResponse:
+    """Hits and misses of the document cache."""
+
+    return json(request.app.ctx.document_repo.stats())
+
+
+@docs_api.get("/search")
+async def search(request: Request) -> HTTPResponse:
+    """Ranked full-text search, `?q=...&page=1&size=10`."""
+
+    keywords = request.args.get("q", "").strip()
+    if not keywords:
+        raise BadRequest("Parameter `q` is required.")
+
+    try:
+        page = max(int(request.args.get("page", 1)), 1)
+        size = min(max(int(request.args.get("size", 10)), 1), MAX_PAGE_SIZE)
+    except ValueError:
+        raise BadRequest("Parameter `page` and `size` must be integer.")
+
+    async with request.app.ctx.database_engine.connect() as conn:
+        total, hits = await searchdocuments(
+            conn, keywords, limit=size, offset=(page - 1) * size
+        )
+
+    return json(dict(query=keywords, page=page, size=size, total=total, results=hits))
@@ -1,37 +1,67 @@
 from pathlib import Path
-from sanic import Blueprint
-
-from .page import add_router
+from sanic import Blueprint, Request, HTTPResponse
+from .page import RouteTable, add_resolver
+from ..render import launch_render as render
+from .watch import register_watcher
 from .....deps.document.dir import build_index
+from .....deps.document.metaindex import MetaIndex
+from .....deps.document.settings import document as docconf
+from .....deps.markdown.store import RenderedStore
 
 
 def create_blueprint(
-    docs_path: str | Path, assets_path: str | Path | None = None
+    docs_path: str | Path,
+    assets_path: str | Path | None = None,
+    prerender: bool | None = None,
 ) -> Blueprint:
     if isinstance(docs_path, str):
         docs_path = Path(docs_path)
     if assets_path:
         if isinstance(assets_path, str):
             assets_path = Path(assets_path)
+    if prerender is None:
+        prerender = docconf.prerender
 
     docs_bp = Blueprint("plain_docs_bp", url_prefix="/docs")
     docs_bp.static("/docs/assets", assets_path if assets_path else docs_path / "assets")
 
+    # Rendered HTML, shared by all routes in this blueprint.
+    store = RenderedStore(max_size=docconf.stream_threshold)
+    docs_bp.ctx.store = store
+
     # TODO: Update it from database.
     # Why closure?
     def build_index_to_route(bp: Blueprint, main_path: Path) -> None:
-        docs_list = build_index(main_path, True)
-
-        for docs_item in docs_list:
-            uri = "/" + docs_item["lang"] + "/".join(docs_item["relative"])
-            name = docs_item["name"]
-            content = docs_item["content"]
-            bp.add_route(
-                add_router(content, name),
-                uri,
-                name="_".join(docs_item["relative"]),
-            )
+        # Content is not required, store will read it when render.
+        docs_list = build_index(main_path, False)
+        bp.ctx.meta_index = MetaIndex.fromitems(docs_list)
+        # Replaced by the watcher, so new and removed files need no restart.
+        bp.ctx.routes = RouteTable(docs_list, bp.url_prefix or "")
+
+        # `/docs/<language>/<location>` and `/docs/<location>`(negotiated).
+        bp.add_route(
+            add_resolver(store, lambda: bp.ctx.routes, bp.url_prefix or ""),
+            "/<location:path>",
+            name="document",
+        )
+
+        if prerender:
+            # Render once per worker, before serving.
+            paths = [Path(docs_item["path"]) for docs_item in docs_list]
+
+            @bp.listener("before_server_start")
+            async def prerender_docs(*_) -> None:
+                store.prerender(paths)
+
+        register_watcher(bp, store, main_path)
 
     build_index_to_route(docs_bp, docs_path)
 
+    @docs_bp.route("/")
+    async def present_index(request: Request) -> HTTPResponse:
+        # Only metadata, no document is read or rendered.
+        return await render(
+            request, "docs.html", context=dict(content="", index=docs_bp.ctx.meta_index)
+        )
+
     return docs_bp
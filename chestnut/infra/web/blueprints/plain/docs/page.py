@@ -1,26 +1,166 @@
+from pathlib import Path
 from sanic import Request, HTTPResponse
-from typing import Callable, Any
+from sanic.exceptions import NotFound
+from sanic.response import html, redirect
+from typing import Any, Callable, Dict, Iterable, List, Tuple
 
-from ..render import launch_render as render
+from ..render import launch_render as render, launch_render_stream as render_stream
+from ....conditional import validators, isnotmodified, notmodified
 from .....deps.document.language import nametoroute
-from .....deps.markdown.service import DocumentMarkdown
+from .....deps.document.metaindex import docsuri
+from .....deps.document.settings import document as docconf
+from .....deps.markdown.store import RenderedStore
+from .....deps.i18n.language import negotiatelanguage
+from .....deps.markdown.stream import iterrender
+from .....deps.html.service import templatefingerprint
 from .....helpers.config.page import PageConfig
 
 
-def add_router(content: str, name: str | None = None) -> Callable[..., Any]:
-    # TODO: Add language detection => language from `app.config.APP.lang`.
+class RouteTable:
+    """Documents of `/docs/<language>/<location>`, rebuilt when files changed.
+
+    ```text
+    "cmn-Hans/guide/newbie" => (path, name, "cmn-Hans")   <= documents
+    "guide/newbie"          => ("cmn-Hans", "en")          <= languages
+    ```
+    """
+
+    __slots__ = ("documents", "languages", "uris")
+
+    documents: Dict[str, Tuple[Path, str, str]]
+    languages: Dict[str, Tuple[str, ...]]
+    uris: Dict[Path, str]
+
+    def __init__(self, docs_list: Iterable[Dict[str, Any]], prefix: str = "") -> None:
+        self.documents = {}
+        self.uris = {}
+        languages: Dict[str, List[str]] = {}
+
+        for docs_item in docs_list:
+            path = Path(docs_item["path"])
+            location = "/".join(docs_item["relative"])
+            self.documents[f"{docs_item['lang']}/{location}"] = (
+                path,
+                docs_item["name"],
+                docs_item["lang"],
+            )
+            self.uris[path] = docsuri(docs_item["lang"], docs_item["relative"], prefix)
+            languages.setdefault(location, []).append(docs_item["lang"])
+
+        self.languages = {key: tuple(sorted(value)) for key, value in languages.items()}
+
+
+async def present_document(
+    request: Request,
+    store: RenderedStore,
+    path: Path,
+    name: str | None = None,
+    language: str | None = None,
+) -> HTTPResponse | None:
+    # Check cache of client before render anything.
+    try:
+        document = store.fingerprint(path)
+    except FileNotFoundError:
+        # Deleted, before the watcher reindexed.
+        raise NotFound(f"Document `{path.name}` is removed.")
+    # New templates, config or version change the page too.
+    template_digest, template_mtime_ns = templatefingerprint()
+    mtime = max(document.mtime_ns, template_mtime_ns) / 1e9
+    headers = validators(f"{document.digest}.{template_digest}", mtime)
+    if isnotmodified(request, headers["ETag"], mtime):
+        return notmodified(headers)
+
+    # Partial: `?section=<anchor>` => HTML of one section only.
+    if anchor := request.args.get("section"):
+        if (content := store.rendersection(path, anchor)) is None:
+            raise NotFound(f"No section `{anchor}`.")
+        return html(content, headers=headers)
+
+    if name:
+        request.ctx.page_config.load_items(**PageConfig.addtitle(title=name))
+
+    if document.size >= docconf.stream_threshold:
+        # Very large: render and send section by section, keep nothing.
+        await render_stream(
+            request,
+            "docs.html",
+            iterrender(path.read_text(encoding="utf-8"), store.render_service),
+            headers=headers,
+            context=dict(language=language),
+        )
+        return None
+
+    # There're two methods to implement markdown file detection and language change:
+    # - Parse HTML file after rendered
+    # - Re-design markdown renderer
+    # Only render when the file changed.
+    result = store.get(path)
+
+    return await render(
+        request,
+        "docs.html",
+        headers=headers,
+        context=dict(content=result, language=language),
+    )
+
+
+def negotiate_document(
+    request: Request,
+    languages: Tuple[str, ...],
+    relative: Iterable[str],
+    prefix: str = "",
+) -> HTTPResponse:
+    # Among languages of this document, not of the site.
+    language = negotiatelanguage(
+        request.ctx.accept_language, languages, request.ctx.language
+    )
+
+    return redirect(
+        docsuri(language, relative, prefix), headers={"Vary": "Accept-Language"}
+    )
+
+
+def add_router(
+    store: RenderedStore,
+    path: Path,
+    name: str | None = None,
+    language: str | None = None,
+) -> Callable[..., Any]:
     # TODO: Update name to route.
     # TODO: Path replace content.
-    async def present_docs(request: Request) -> HTTPResponse:
-        if name:
-            request.ctx.page_config.load_items(**PageConfig.addtitle(title=name))
+    async def present_docs(request: Request) -> HTTPResponse | None:
+        return await present_document(request, store, path, name, language)
 
-        markdown = DocumentMarkdown()
-        # There're two methods to implement markdown file detection and language change:
-        # - Parse HTML file after rendered
-        # - Re-design markdown renderer
-        result = markdown(content)
+    return present_docs
 
-        return await render(request, "docs.html", context=dict(content=result))
 
-    return present_docs
+def add_negotiator(
+    languages: Tuple[str, ...], relative: Tuple[str, ...], prefix: str = ""
+) -> Callable[..., Any]:
+    async def negotiate_docs(request: Request) -> HTTPResponse:
+        return negotiate_document(request, languages, relative, prefix)
+
+    return negotiate_docs
+
+
+def add_resolver(
+    store: RenderedStore, table: Callable[[], RouteTable], prefix: str = ""
+) -> Callable[..., Any]:
+    """One route for all documents, looked up in the current `table()`.
+
+    Added files are served and removed ones are 404 without restart.
+    """
+
+    async def resolve_docs(request: Request, location: str) -> HTTPResponse | None:
+        routes = table()
+        location = location.strip("/")
+
+        if document := routes.documents.get(location):
+            return await present_document(request, store, *document)
+        if languages := routes.languages.get(location):
+            # `/docs/<location>` => `/docs/<language>/<location>`.
+            return negotiate_document(request, languages, location.split("/"), prefix)
+
+        raise NotFound(f"No document `{location}`.")
+
+    return resolve_docs
@@ -0,0 +1,111 @@
+import asyncio
+from functools import partial
+from pathlib import Path
+from sanic import Blueprint, Sanic
+
+from .page import RouteTable
+from .....deps.document.dir import DocumentIndex, IndexDiff, build_index, manifestpath
+from .....deps.document.metaindex import MetaIndex
+from .....deps.document.settings import document as docconf
+from .....deps.document.watch import DocumentWatcher, acquireleader, watchlockpath
+from .....deps.markdown.store import RenderedStore
+
+
+def register_watcher(bp: Blueprint, store: RenderedStore, docs_path: Path) -> None:
+    """Reindex documents in each worker when files changed.
+
+    Every worker refreshes its own rendered HTML and listing. Only the
+    leader(holds the lock) writes manifest and database, then tells pages of
+    all workers to reload; other workers drop their document cache then.
+    """
+
+    async def reindex(
+        app: Sanic, index: DocumentIndex, leader: bool, diff: IndexDiff
+    ) -> None:
+        changed = [Path(path) for path in diff.added + diff.changed]
+        removed = [Path(path) for path in diff.removed]
+
+        # 1. Rendered HTML and routes, `index` is scanned just now.
+        uris = dict(bp.ctx.routes.uris)
+        docs_list = build_index(docs_path, False, index, scan=False)
+        bp.ctx.routes = RouteTable(docs_list, bp.url_prefix or "")
+        uris.update(bp.ctx.routes.uris)
+        for path in changed + removed:
+            store.invalidate(path)
+        if docconf.prerender:
+            store.prerender(changed)
+
+        # 2. Rows in database(main app only).
+        if leader and docconf.watch_database and hasattr(app.ctx, "document_repo"):
+            from .....deps.document.ingest import scanmetas, loaddocument
+            from ......application.document.usecase.format import BuildIndex
+
+            await BuildIndex(
+                repo=app.ctx.document_repo,
+                scan_service=partial(scanmetas, docs_path, index=index, scan=False),
+                load_service=loaddocument,
+            )()
+
+        # 3. Listing, `/api/docs` rebuilds its index on next request.
+        bp.ctx.meta_index = MetaIndex.fromitems(docs_list)
+        app.ctx.meta_index = None
+        app.ctx.languages = tuple(sorted(bp.ctx.meta_index.languages))
+
+        # 4. Let open pages refresh(after database is updated).
+        if leader and hasattr(app.ctx, "event_hub"):
+            app.ctx.event_hub.publish(
+                "site",
+                [
+                    dict(
+                        action="reload",
+                        paths=[
+                            uris[path] for path in changed + removed if path in uris
+                        ],
+                    )
+                ],
+            )
+
+    async def follow_leader(app: Sanic) -> None:
+        """Drop cached documents when the leader reindexed."""
+
+        subscriber = app.ctx.event_hub.subscribe(["site"])
+        try:
+            while await subscriber.get() is not None:
+                app.ctx.document_repo.invalidate()
+        finally:
+            app.ctx.event_hub.unsubscribe(subscriber)
+
+    @bp.listener("after_server_start")
+    async def start_watcher(app: Sanic, _) -> None:
+        if not docconf.watch:
+            return
+
+        lock = acquireleader(watchlockpath(docs_path))
+        leader = lock is not None
+        bp.ctx.watcher_lock = lock
+
+        # Own index, never shared with the loop thread while scanning.
+        index = DocumentIndex(
+            docs_path.absolute(), manifestpath(docs_path), readonly=not leader
+        )
+        watcher = DocumentWatcher(
+            index,
+            partial(reindex, app, index, leader),
+            debounce=docconf.watch_debounce,
+            interval=docconf.watch_interval,
+        )
+        loop = asyncio.get_running_loop()
+        bp.ctx.watcher_tasks = [loop.create_task(watcher.run())]
+        if (
+            not leader
+            and hasattr(app.ctx, "document_repo")
+            and hasattr(app.ctx, "event_hub")
+        ):
+            bp.ctx.watcher_tasks.append(loop.create_task(follow_leader(app)))
+
+    @bp.listener("before_server_stop")
+    async def stop_watcher(app: Sanic, _) -> None:
+        for task in getattr(bp.ctx, "watcher_tasks", []):
+            task.cancel()
+        if lock := getattr(bp.ctx, "watcher_lock", None):
+            lock.close()
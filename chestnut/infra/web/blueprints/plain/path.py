@@ -6,6 +6,7 @@
 from pathlib import Path
 from sanic import Blueprint
 
+from ...static import addstatic
 from ....helpers.path import MAIN_PUBLIC_PATH, ASSETS_PATH, STATIC_PATH
 
 
@@ -17,7 +18,7 @@ FONTS_PATH = Path(MAIN_PUBLIC_PATH / "fonts")  # Common.
 launch_static = Blueprint("launch")
 
 # Add static.
-launch_static.static("/static/css", CSS_PATH, name="css")
-launch_static.static("/static/js", JS_PATH, name="js")
-launch_static.static("/static/fonts", FONTS_PATH, name="fonts")
-launch_static.static("/assets", ASSETS_PATH, name="assets")
+addstatic(launch_static, "/static/css", CSS_PATH, name="css")
+addstatic(launch_static, "/static/js", JS_PATH, name="js")
+addstatic(launch_static, "/static/fonts", FONTS_PATH, name="fonts")
+addstatic(launch_static, "/assets", ASSETS_PATH, name="assets")
@@ -7,7 +7,7 @@ from sanic import Sanic
 from sanic.request import Request
 from sanic.response import HTTPResponse
 from sanic.exceptions import SanicException
-from typing import Dict, Any
+from typing import Any, AsyncIterator, Dict, Iterable, List
 
 
 from ....web.app import EXTENSION_INSTLLED
@@ -67,11 +67,15 @@ async def launch_render(
 ) -> HTTPResponse:
     """Only in launched environment."""
 
-    appended_context = context
+    appended_context = dict(context)
 
     # Fetch some content registed on middleware.
     appended_context.update(app_config=request.ctx.app_config)
     appended_context.update(page_config=request.ctx.page_config)
+    # Negotiated one, unless the page has its own(a document).
+    if "language" not in appended_context:
+        appended_context.update(language=getattr(request.ctx, "language", None))
+        headers = {**(headers or {}), "Vary": "Accept-Language"}
 
     return await render(
         template_name=template_name,
@@ -86,3 +90,72 @@ async def launch_render(
             else request.app.ext.environment
         ),
     )
+
+
+# Replaced by streamed parts, never escaped(`|safe` in template).
+STREAM_MARKER = "\x00chestnut-stream\x00"
+
+
+async def launch_render_stream(
+    request: Request,
+    template_name: str,
+    parts: Iterable[str],
+    headers: Dict[str, str] | None = None,
+    content_type: str = "text/html; charset=utf-8",
+    context: Dict[str, Any] = {},
+    buffer_size: int = 16 * 1024,
+) -> None:
+    """Send head of template, then `parts` one by one, then the tail.
+
+    `parts` are placed where `context["content"]` is.
+    """
+
+    environment = (
+        launch_environment if not EXTENSION_INSTLLED else request.app.ext.environment
+    )
+    template = environment.get_template(template_name)
+
+    appended_context = dict(context)
+    appended_context.update(
+        content=STREAM_MARKER,
+        app_config=request.ctx.app_config,
+        page_config=request.ctx.page_config,
+    )
+    if "language" not in appended_context:
+        appended_context.update(language=getattr(request.ctx, "language", None))
+        headers = {**(headers or {}), "Vary": "Accept-Language"}
+
+    response = await request.respond(headers=headers, content_type=content_type)
+
+    # Jinja yields small pieces, send them in batches.
+    buffer: List[str] = []
+    buffered = 0
+
+    async def write(piece: str, flush: bool = False) -> None:
+        nonlocal buffered
+        if piece:
+            buffer.append(piece)
+            buffered += len(piece)
+        if buffer and (flush or buffered >= buffer_size):
+            await response.send("".join(buffer))
+            buffer.clear()
+            buffered = 0
+
+    async def pieces() -> AsyncIterator[str]:
+        if environment.is_async:
+            async for piece in template.generate_async(**appended_context):
+                yield piece
+        else:
+            for piece in template.generate(**appended_context):
+                yield piece
+
+    async for piece in pieces():
+        if STREAM_MARKER in piece:
+            head, piece = piece.split(STREAM_MARKER, 1)
+            await write(head, flush=True)
+            for part in parts:
+                await write(part, flush=True)
+        await write(piece)
+
+    await write("", flush=True)
+    await response.eof()
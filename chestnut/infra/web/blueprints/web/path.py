@@ -2,6 +2,7 @@ from pathlib import Path
 from sanic import Blueprint
 
 from ..plain.path import CSS_PATH, JS_PATH
+from ...static import addstatic
 from ....helpers.path import MAIN_PUBLIC_PATH, ASSETS_PATH
 
 
@@ -18,8 +19,8 @@ webapp_static = Blueprint("web")
 
 # Add static.
 # Using-template.
-webapp_static.static("/static/css", CSS_PATH, name="web_css")
-webapp_static.static("/static/js", JS_PATH, name="web_js")
+addstatic(webapp_static, "/static/css", CSS_PATH, name="web_css")
+addstatic(webapp_static, "/static/js", JS_PATH, name="web_js")
 # Related to front-end.
-webapp_static.static("/static", STATIC_PATH, name="static")
-webapp_static.static("/assets", ASSETS_PATH, name="assets")
+addstatic(webapp_static, "/static", STATIC_PATH, name="static")
+addstatic(webapp_static, "/assets", ASSETS_PATH, name="assets")
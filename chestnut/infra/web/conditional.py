@@ -0,0 +1,49 @@
+""" `chestnut.infra.web.conditional`
+
+    HTTP conditional requests(`ETag`, `Last-Modified` and 304).
+"""
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from sanic.request import Request
+from sanic.response import HTTPResponse
+from typing import Dict
+
+
+def validators(digest: str, mtime: float) -> Dict[str, str]:
+    """Strong `ETag` from content hash, `Last-Modified` from mtime."""
+
+    return {
+        "ETag": f'"{digest}"',
+        "Last-Modified": formatdate(mtime, usegmt=True),
+        # Always revalidate, mostly with a 304.
+        "Cache-Control": "no-cache",
+    }
+
+
+def isnotmodified(request: Request, etag: str, mtime: float) -> bool:
+    """Check `If-None-Match` firstly, then `If-Modified-Since`."""
+
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        return etag in (
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        )
+
+    if_modified_since = request.headers.get("If-Modified-Since")
+    if if_modified_since is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP date is in seconds.
+        return int(mtime) <= since.timestamp()
+
+    return False
+
+
+def notmodified(headers: Dict[str, str]) -> HTTPResponse:
+    return HTTPResponse(status=304, headers=headers)
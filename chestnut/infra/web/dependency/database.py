@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio.session import AsyncSession, async_sessionmaker
 from .base import DepsInterface
 from ..settings.location import CONFIG_LOCATION
 from ...deps.database import service
+from ...deps.document.cache import createdocumentrepo
 
 
 class DatabaseDep(DepsInterface):
@@ -31,6 +32,8 @@ async def database_register(app: Sanic) -> None:
     app.ctx.database_engine = service.enginefromconfig(
         app.config[CONFIG_LOCATION["database"]]
     )  # Use upper.
+    # Shared by usecases in this worker, so invalidation reaches all readers.
+    app.ctx.document_repo = createdocumentrepo(app.ctx.database_engine)
 
 
 async def database_dispose(app: Sanic) -> None:
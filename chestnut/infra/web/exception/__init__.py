@@ -6,7 +6,9 @@
 from sanic import Sanic
 
 from .errorhandler import CustomeErrorHandler
+from .errorhandler.plain import prepare_sync_environment
 
 
 def configure_exceptions(app: Sanic) -> None:
     app.error_handler = CustomeErrorHandler()
+    app.register_listener(prepare_sync_environment, "before_server_start")
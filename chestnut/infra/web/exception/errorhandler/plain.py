@@ -1,3 +1,6 @@
+from functools import lru_cache
+from jinja2 import Environment
+from sanic import Sanic
 from sanic.request import Request
 from sanic.response import HTTPResponse
 from sanic.errorpages import HTMLRenderer
@@ -9,6 +12,21 @@ from ....deps.html.service import returnloaderandenv
 from ....deps.highlight import rendercode
 
 
+@lru_cache(maxsize=None)
+def syncenvironment() -> Environment:
+    """Sync environment of error pages, only one in process."""
+
+    loader, environment = returnloaderandenv(TEMPLATE_PATH, False)
+
+    return environment
+
+
+async def prepare_sync_environment(app: Sanic) -> None:
+    """Create environment and compile `exception.html` before serving."""
+
+    syncenvironment().get_template("exception.html")
+
+
 def launch_render_sync(
     request: Request,
     template_name: str = "",
@@ -25,10 +43,9 @@ def launch_render_sync(
     appended_context.update(app_config=request.ctx.app_config)
     appended_context.update(page_config=request.ctx.page_config)
 
-    loader, launch_environment = returnloaderandenv(TEMPLATE_PATH, False)
-
     kwargs = context if context else {}
-    template = launch_environment.get_template(template_name)
+    # Compiled template is cached in environment.
+    template = syncenvironment().get_template(template_name)
 
     render = template.render
     content = render(**kwargs)
@@ -1,4 +1,4 @@
-from sanic import Sanic, Request
+from sanic import Sanic, Request, HTTPResponse
 
 from .settings.location import CONFIG_LOCATION
 from ..helpers.config.app import AppConfig
@@ -17,3 +17,87 @@ def register_middleware(app: Sanic):
         request.ctx.app_config = request.app.config[CONFIG_LOCATION["app_config"]]
         # PageConfig.
         request.ctx.page_config = PageConfig()
+
+
+def register_language(app: Sanic):
+    """Negotiate language once per request, by languages of documents.
+
+    `request.ctx.accept_language`: parsed `Accept-Language`.
+    `request.ctx.language`: best one of `app.ctx.languages`.
+    """
+
+    from sqlalchemy.exc import SQLAlchemyError
+    from .blueprints.api.docs import getmetaindex
+    from ..log.service import chestnut_logger
+    from ..deps.document.settings import document as docconf
+    from ..deps.i18n.language import negotiatelanguage, parseacceptlanguage
+
+    @app.before_server_start
+    async def load_languages(app: Sanic) -> None:
+        # Indexed already: by the docs blueprint(the watcher updates it), or
+        # shared with `/api/docs`.
+        if docs_bp := app.blueprints.get("plain_docs_bp"):
+            languages = docs_bp.ctx.meta_index.languages
+        else:
+            try:
+                languages = (await getmetaindex(app)).languages
+            except SQLAlchemyError as error:
+                # Not initialized, negotiate to the default.
+                chestnut_logger.warn(f"No languages of documents: {error}")
+                languages = {}
+        app.ctx.languages = tuple(sorted(languages))
+
+    @app.on_request
+    async def add_language(request: Request) -> None:
+        request.ctx.accept_language = parseacceptlanguage(
+            request.headers.get("Accept-Language")
+        )
+        request.ctx.language = negotiatelanguage(
+            request.ctx.accept_language,
+            getattr(request.app.ctx, "languages", ()),
+            docconf.language,
+        )
+
+
+def register_compression(app: Sanic):
+    """Compress HTML and JSON responses by `Accept-Encoding`."""
+
+    from ..deps.compress import ENCODINGS, compress, negotiate
+    from ..deps.compress.settings import compress as default_settings
+
+    settings = app.config.get(CONFIG_LOCATION["compress"], default_settings)
+    if not settings.enable:
+        return
+
+    mimetypes = frozenset(settings.mimetypes)
+    levels = dict(br=settings.brotli_level, gzip=settings.level, deflate=settings.level)
+
+    @app.on_response
+    async def compress_response(request: Request, response: HTTPResponse) -> None:
+        body = response.body
+        # Streamed(`request.respond`) responses have no body here.
+        if not body or len(body) < settings.min_size:
+            return
+        if response.status < 200 or response.status in (204, 206, 304):
+            return
+
+        headers = response.headers
+        if "content-encoding" in headers or "no-transform" in headers.get(
+            "cache-control", ""
+        ):
+            return
+        if (response.content_type or "").split(";")[0].strip() not in mimetypes:
+            return
+
+        headers.add("vary", "Accept-Encoding")
+
+        encoding = negotiate(request.headers.get("accept-encoding"), ENCODINGS)
+        if encoding is None:
+            return
+
+        response.body = compress(body, encoding, levels[encoding])
+        headers["content-encoding"] = encoding
+        headers.pop("content-length", None)
+        # Strong validators belong to the identity body.
+        if (etag := headers.get("etag")) and not etag.startswith("W/"):
+            headers["etag"] = "W/" + etag
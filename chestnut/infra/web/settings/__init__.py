@@ -78,9 +78,10 @@ def create_deps_config(
         )
 
     # Common.
+    from ...deps.compress.settings import compress
     from ...deps.message.settings import message
 
-    for append_item in [database, security, message]:
+    for append_item in [database, security, message, compress]:
         deps_dict[append_item.name.upper()] = append_item
 
     # Load from instance.
@@ -6,6 +6,7 @@ CONFIG_LOCATION = dict(
     sse_message="MESSAGE",  # DepsConfig
     database="database".upper(),  # DepsConfig
     security="security".upper(),  # DepsConfig
+    compress="compress".upper(),  # DepsConfig
 )  # type: ignore
 """
 Config location related to Sanic Config.
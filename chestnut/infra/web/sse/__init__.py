@@ -1,14 +1,38 @@
+from pathlib import Path
 from sanic import Sanic
 
 from ..settings.location import CONFIG_LOCATION
 
 
 def register_stream(app: Sanic) -> None:
+    from .bus import createbus, defaultbuspath
+    from .hub import EventHub
     from .stream import publisher
 
+    message = app.config[CONFIG_LOCATION["sse_message"]]
+
+    @app.before_server_start
+    async def create_hub(app: Sanic) -> None:
+        app.ctx.event_hub = EventHub(
+            queue_size=message.queue_size,
+            history_size=message.history_size,
+            slow_policy=message.slow_client,
+            bus=createbus(
+                message.bus,
+                Path(message.bus_path)
+                if message.bus_path
+                else defaultbuspath(app.name),
+            ),
+        )
+        app.ctx.event_hub.start()
+
+    @app.before_server_stop
+    async def close_hub(app: Sanic) -> None:
+        app.ctx.event_hub.close()
+
     app.add_route(
         publisher,
-        app.config[CONFIG_LOCATION["sse_message"]].subcribe_url,
+        message.subcribe_url,
         ["GET", "POST"],
         stream=True,
     )
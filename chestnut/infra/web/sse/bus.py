@@ -0,0 +1,153 @@
+""" `chestnut.infra.web.sse.bus`
+
+    Deliver events between workers, no broker is required.
+
+    Every worker binds a UNIX datagram socket in a shared folder, and a
+    publish is sent to all sockets in it:
+
+    ```text
+    worker A: publish => hub of A
+                      => socket of B => hub of B
+                      => socket of C => hub of C
+    ```
+"""
+import os
+import socket
+import asyncio
+import hashlib
+import tempfile
+from pathlib import Path
+from sanic.log import logger
+from typing import Callable, List
+
+from ...helpers.path import PROJECT_PATH
+
+
+# Under the max datagram size of most systems.
+MAX_FRAME_SIZE = 64 * 1024
+
+UNIX_SOCKET = hasattr(socket, "AF_UNIX")
+
+
+def defaultbuspath(app_name: str) -> Path:
+    # Short enough for `sun_path`(108 bytes).
+    return Path(tempfile.gettempdir()) / (
+        "chestnut-"
+        + hashlib.blake2b(
+            f"{PROJECT_PATH}:{app_name}".encode(), digest_size=6
+        ).hexdigest()
+    )
+
+
+def pack(id: int, topic: str, frame: bytes) -> bytes:
+    return f"{id}\n{topic}\n".encode() + frame
+
+
+def unpack(raw: bytes) -> tuple:
+    id, topic, frame = raw.split(b"\n", 2)
+
+    return int(id), topic.decode(), frame
+
+
+class LocalBus:
+    """Single worker, nothing to deliver."""
+
+    def start(self, dispatch: Callable[[int, str, bytes], None]) -> None:
+        ...
+
+    def send(self, id: int, topic: str, frame: bytes) -> None:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+class SocketBus(LocalBus):
+    """UNIX datagram sockets under `path`, one per worker."""
+
+    path: Path
+    address: Path
+    sock: socket.socket | None
+    peers: List[str]
+    peers_mtime: int
+
+    def __init__(self, path: Path, name: str | None = None) -> None:
+        self.path = path
+        self.address = path / f"{name or os.getpid()}.sock"
+        self.sock = None
+        self.peers = []
+        self.peers_mtime = -1
+
+    def start(self, dispatch: Callable[[int, str, bytes], None]) -> None:
+        self.path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        self.address.unlink(missing_ok=True)
+
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+        self.sock.bind(str(self.address))
+
+        def receive() -> None:
+            while True:
+                try:
+                    raw = self.sock.recv(MAX_FRAME_SIZE)  # type: ignore
+                except (BlockingIOError, InterruptedError):
+                    return
+                try:
+                    dispatch(*unpack(raw))
+                except ValueError:
+                    logger.warning("Broken SSE frame from another worker.")
+
+        asyncio.get_running_loop().add_reader(self.sock.fileno(), receive)
+
+    def _refresh(self) -> None:
+        # Folder mtime changes only when a worker starts or stops.
+        mtime = os.stat(self.path).st_mtime_ns
+        if mtime != self.peers_mtime:
+            self.peers_mtime = mtime
+            self.peers = [
+                entry.path
+                for entry in os.scandir(self.path)
+                if entry.name.endswith(".sock") and entry.path != str(self.address)
+            ]
+
+    def send(self, id: int, topic: str, frame: bytes) -> None:
+        if self.sock is None:
+            return
+
+        raw = pack(id, topic, frame)
+        if len(raw) > MAX_FRAME_SIZE:
+            logger.warning(f"SSE event {id} is too large for other workers.")
+            return
+
+        self._refresh()
+        for peer in self.peers:
+            try:
+                self.sock.sendto(raw, peer)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Worker is gone.
+                Path(peer).unlink(missing_ok=True)
+                self.peers_mtime = -1
+            except (BlockingIOError, InterruptedError):
+                # Peer is not reading, never block the publisher.
+                logger.warning(f"SSE event {id} dropped for {peer}.")
+            except OSError as error:
+                # `EMSGSIZE`, `ENOBUFS`..., one peer never stops the others.
+                logger.warning(f"SSE event {id} dropped for {peer}: {error}")
+
+    def close(self) -> None:
+        if self.sock is None:
+            return
+
+        asyncio.get_running_loop().remove_reader(self.sock.fileno())
+        self.sock.close()
+        self.sock = None
+        self.address.unlink(missing_ok=True)
+
+
+def createbus(kind: str, path: Path) -> LocalBus:
+    if kind == "socket" and UNIX_SOCKET:
+        return SocketBus(path)
+    if kind == "socket":
+        logger.warning("UNIX socket not supported, SSE events stay in one worker.")
+
+    return LocalBus()
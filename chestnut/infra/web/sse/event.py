@@ -1,24 +1,62 @@
+import re
+import json
 from dataclasses import dataclass
 from typing import Iterable, List, Any
 
 
+LINE_BREAK = re.compile(r"\r\n|\r|\n")
+
+# Comment only, ignored by `EventSource`, but keeps connection alive.
+KEEPALIVE = b":\n\n"
+
+
+def _datalines(item: Any) -> List[str]:
+    if not isinstance(item, str):
+        # JSON payload in one line.
+        item = json.dumps(item, ensure_ascii=False, separators=(",", ":"))
+    elif "\n" in item or "\r" in item:
+        return [f"data: {line}\n" for line in LINE_BREAK.split(item)]
+
+    return [f"data: {item}\n"]
+
+
 @dataclass
 class EventItem:
     id: int | None
     event_type: str | None
     retry: int | None
     data: Iterable[Any] | None
+    comment: str | None = None
 
-    def text(self) -> str:
-        response = "\n".join([f"id: {self.id}", f"event: {self.event_type}\n"])
+    def encode(self) -> bytes:
+        """Frame of the event, ends with a blank line."""
+
+        lines: List[str] = []
 
+        if self.comment is not None:
+            lines.extend(f": {line}\n" for line in LINE_BREAK.split(self.comment))
+        if self.id is not None:
+            lines.append(f"id: {self.id}\n")
+        if self.event_type:
+            lines.append(f"event: {self.event_type}\n")
         if self.retry:
-            response += f"retry: {int(self.retry)}\n"
-        if self.data:
-            response += "".join(["data: " + item + "\n" for item in self.data])
-            return response
+            lines.append(f"retry: {int(self.retry)}\n")
+        if self.data is not None:
+            data = self.data
+            if isinstance(data, (str, dict)):
+                data = [data]
+            for item in data:
+                lines.extend(_datalines(item))
 
-        raise NotImplementedError
+        if not lines:
+            return KEEPALIVE
+
+        lines.append("\n")
+
+        return "".join(lines).encode("utf-8")
+
+    def text(self) -> str:
+        return self.encode().decode("utf-8")
 
     @classmethod
     def event(
@@ -27,6 +65,14 @@ class EventItem:
         event_type: str | None = None,
         retry: int | None = None,
         data: Iterable[Any] | None = None,
-    ) -> str:
-        item = EventItem(id=id, event_type=event_type, retry=retry, data=data)
-        return item.text()
+    ) -> bytes:
+        """Encode once, the same frame is sent to all subscribers."""
+
+        return cls(id=id, event_type=event_type, retry=retry, data=data).encode()
+
+    @classmethod
+    def keepalive(cls, comment: str | None = None) -> bytes:
+        if not comment:
+            return KEEPALIVE
+
+        return cls(None, None, None, None, comment=comment).encode()
@@ -0,0 +1,180 @@
+""" `chestnut.infra.web.sse.hub`
+
+    Publish/subscribe hub of SSE, one in each worker.
+
+    ```text
+    publish => ring buffer(replay) => queue of each subscriber => response
+            => bus => hubs of other workers
+    ```
+"""
+import time
+import asyncio
+from collections import deque
+from typing import Any, Deque, FrozenSet, Iterable, Set, Tuple
+
+from .bus import LocalBus
+from .event import EventItem
+
+
+# `event:` types handled by `sse-client.js`.
+TOPICS = ("site", "message", "dependency", "close")
+
+# Policy of a subscriber whose queue is full.
+DROP_OLDEST = "drop"
+DISCONNECT = "disconnect"
+
+
+class Subscriber:
+    """One connection, with a bounded queue."""
+
+    __slots__ = ("queue", "topics", "closed", "dropped")
+
+    queue: asyncio.Queue
+    topics: FrozenSet[str] | None
+    closed: bool
+    dropped: int
+
+    def __init__(self, max_size: int, topics: Iterable[str] | None = None) -> None:
+        self.queue = asyncio.Queue(max_size)
+        self.topics = frozenset(topics) if topics else None
+        self.closed = False
+        self.dropped = 0
+
+    def wants(self, topic: str) -> bool:
+        return self.topics is None or topic in self.topics
+
+    def close(self) -> None:
+        """Wake up the reader with `None`, even if the queue is full."""
+
+        if self.closed:
+            return
+        self.closed = True
+
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    async def get(self) -> bytes | None:
+        """Next frame, None after closed."""
+
+        if self.closed and self.queue.empty():
+            return None
+
+        return await self.queue.get()
+
+
+class EventHub:
+    """Fan out events to subscribers of this worker."""
+
+    subscribers: Set[Subscriber]
+    history: Deque[Tuple[int, str, bytes]]
+    last_id: int
+    queue_size: int
+    slow_policy: str
+    bus: LocalBus
+
+    def __init__(
+        self,
+        queue_size: int = 64,
+        history_size: int = 256,
+        slow_policy: str = DROP_OLDEST,
+        bus: LocalBus | None = None,
+    ) -> None:
+        if slow_policy not in (DROP_OLDEST, DISCONNECT):
+            raise ValueError(f"Unknown policy {slow_policy}.")
+
+        self.subscribers = set()
+        # (id, topic, frame)
+        self.history = deque(maxlen=history_size)
+        self.last_id = 0
+        self.queue_size = queue_size
+        self.slow_policy = slow_policy
+        self.bus = bus or LocalBus()
+
+    def __len__(self) -> int:
+        return len(self.subscribers)
+
+    def subscribe(
+        self, topics: Iterable[str] | None = None, last_event_id: str | None = None
+    ) -> Subscriber:
+        """Add a subscriber, replay missed events after `last_event_id`."""
+
+        subscriber = Subscriber(self.queue_size, topics)
+
+        if last_event_id is not None:
+            try:
+                since = int(last_event_id)
+            except ValueError:
+                since = self.last_id
+            for id, topic, frame in self.history:
+                if id > since and subscriber.wants(topic):
+                    self._deliver(subscriber, frame)
+
+        self.subscribers.add(subscriber)
+
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self.subscribers.discard(subscriber)
+        subscriber.close()
+
+    def start(self) -> None:
+        """Receive events from other workers."""
+
+        self.bus.start(self.dispatch)
+
+    def publish(
+        self,
+        topic: str,
+        data: Iterable[Any],
+        retry: int | None = None,
+        broadcast: bool = True,
+    ) -> int:
+        """Encode once and send to every subscriber of `topic`, return id.
+
+        Id is in microseconds, so it is ordered across workers and a client
+        can replay with `Last-Event-ID` from any worker. Without `broadcast`,
+        only subscribers of this worker receive it.
+        """
+
+        id = max(self.last_id + 1, time.time_ns() // 1000)
+        frame = EventItem.event(id, topic, retry, data)
+
+        self.dispatch(id, topic, frame)
+        if broadcast:
+            self.bus.send(id, topic, frame)
+
+        return id
+
+    def dispatch(self, id: int, topic: str, frame: bytes) -> None:
+        """Send an encoded event to subscribers of this worker."""
+
+        self.last_id = max(self.last_id, id)
+        self.history.append((id, topic, frame))
+
+        for subscriber in list(self.subscribers):
+            if subscriber.wants(topic):
+                self._deliver(subscriber, frame)
+
+    def _deliver(self, subscriber: Subscriber, frame: bytes) -> None:
+        if subscriber.closed:
+            return
+
+        try:
+            subscriber.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            if self.slow_policy == DISCONNECT:
+                # It can reconnect with `Last-Event-ID`.
+                self.unsubscribe(subscriber)
+                return
+            subscriber.queue.get_nowait()
+            subscriber.queue.put_nowait(frame)
+            subscriber.dropped += 1
+
+    def close(self) -> None:
+        """Disconnect all subscribers(before server stop)."""
+
+        for subscriber in list(self.subscribers):
+            self.unsubscribe(subscriber)
+
+        self.bus.close()
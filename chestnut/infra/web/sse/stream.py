@@ -1,8 +1,11 @@
+import asyncio
 from sanic.request import Request
+from sanic.response import HTTPResponse
 from sanic.compat import Header
-from typing import NoReturn
 
-from .event import EventItem
+from .event import EventItem, KEEPALIVE
+from .hub import EventHub, TOPICS
+from ..settings.location import CONFIG_LOCATION
 
 
 sse_header: Header = Header(
@@ -13,21 +16,54 @@ sse_header: Header = Header(
 )
 
 
-async def publisher(request: Request) -> NoReturn:
-    response = await request.respond(
-        headers=sse_header,
-        content_type="text/event-stream; charset=utf-8",
-    )
-    # Push message to front-end.
-    retry = request.app.config.KEEP_ALIVE_TIMEOUT * 1000
+async def publisher(request: Request) -> HTTPResponse | None:
+    hub: EventHub = request.app.ctx.event_hub
+    message = request.app.config[CONFIG_LOCATION["sse_message"]]
 
-    # TODO: Add a classifier to check the session.
-    ...
+    # Cap of this worker.
+    if message.max_connections and len(hub) >= message.max_connections:
+        return HTTPResponse(
+            "Too many subscribers.",
+            status=503,
+            headers={"Retry-After": str(message.retry_after)},
+        )
 
-    # First message from server: Pong.
-    await response.send(EventItem.event(0, "site", None, ["Pong"]))  # type: ignore
+    # e.g. `/subscribe?topic=site&topic=message`
+    topics = [topic for topic in request.args.getlist("topic", []) if topic in TOPICS]
+    subscriber = hub.subscribe(topics or None, request.headers.get("last-event-id"))
+    heartbeat = message.heartbeat or None
+    send_timeout = message.send_timeout or None
 
-    # Set here to recieve singals.
-    while True:
-        # Recieve singals.
-        ...
+    try:
+        response = await request.respond(
+            headers=sse_header,
+            content_type="text/event-stream; charset=utf-8",
+        )
+        # Push message to front-end.
+        retry = request.app.config.KEEP_ALIVE_TIMEOUT * 1000
+
+        # First message from server: Pong.
+        # With the latest id, so a reconnection only replays newer events.
+        await response.send(EventItem.event(hub.last_id, "site", retry, ["Pong"]))
+
+        # Wait for events, no busy loop.
+        while True:
+            try:
+                frame = await asyncio.wait_for(subscriber.get(), heartbeat)
+            except asyncio.TimeoutError:
+                # Idle, check the peer and send a heartbeat.
+                if request.transport.is_closing():
+                    break
+                frame = KEEPALIVE
+            if frame is None:
+                break
+
+            # A half-open peer never drains the buffer.
+            await asyncio.wait_for(response.send(frame), send_timeout)
+    except (asyncio.TimeoutError, ConnectionError):
+        # Dead client, reaped below.
+        pass
+    finally:
+        hub.unsubscribe(subscriber)
+
+    return None
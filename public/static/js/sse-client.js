@@ -9,6 +9,14 @@ function sse(subscribe) {
 
   // For `event: site`
   source.addEventListener("site", (event) => {
+    // Documents changed: `{"action":"reload","paths":[...]}`.
+    if (event.data.startsWith("{")) {
+      const site = JSON.parse(event.data);
+      if (site.action === "reload" && site.paths.includes(window.location.pathname)) {
+        window.location.reload();
+      }
+      return;
+    }
     window.console.log(`${event.data} from server.`);
   })
   // Ping from client.
@@ -2,26 +2,27 @@ import pytest
 
 import re
 import asyncio
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
-from sqlalchemy import Table
-from sqlalchemy.sql import select, update
-from sqlalchemy.orm import registry
-from sqlalchemy.ext.asyncio import AsyncEngine, AsyncConnection
-from typing import Any, Callable, Dict, Coroutine, List
+from typing import Any, Callable, Dict, Coroutine, Iterable, List
 
 from chestnut.application.document.domain.document import Document
 from chestnut.application.document.domain.meta import DocumentMeta
-from chestnut.application.document.domain.repo import DocRepo, DocMetaRepo
+from chestnut.application.document.domain.repo import Cursor, DocRepo, DocMetaRepo
 from chestnut.application.document.dto.load import DocumentLoader
 from chestnut.application.document.dto.present import DocumentPresenter
 from chestnut.application.document.usecase.display import DisplayIndex, DisplayDocument
+from chestnut.application.document.usecase.format import BuildIndex
 from chestnut.adapter.document.file import fetchdocumentfromfile as fetchfile
-from chestnut.adapter.document.parse.metadata import FilePathAdapter
+from chestnut.adapter.document.parse.metadata import (
+    FilePathAdapter,
+    MetadataParserAdapter,
+)
 from chestnut.infra.helpers.config import DepsConfig
 from chestnut.infra.helpers.path import INSTANCE_PATH, INSTANCE_TEST_PATH
 from chestnut.infra.deps.database.dao.base import chestnut_sqlite_metadata
-from chestnut.infra.deps.database.dao.document import document_table
+from chestnut.infra.deps.database.document import DocumentDAO
+from chestnut.infra.deps.document.cache import CachedDocRepo
 from chestnut.infra.deps.database.service import enginefromconfig
 from chestnut.infra.deps.database.settings import database_test
 
@@ -157,6 +158,44 @@ class TestDTO:
             "chicken_is_nice",
         ]
 
+    def test_parse_metadata(self) -> None:
+        assert MetadataParserAdapter.parse("# Chicken\n\nJust beautiful.\n") == dict(
+            title="Chicken"
+        )
+        assert MetadataParserAdapter.parse("Chicken\n===\n") == dict(title="Chicken")
+        assert MetadataParserAdapter.parse("```\n# Not\n```\n## Sub\n# Late\n") == {}
+
+        content = (
+            "---\nTitle: Nice\ntags:\n    chicken\n    beautiful\n---\n# Chicken\n"
+        )
+        assert MetadataParserAdapter.parse(content) == dict(
+            title="Nice", tags=["chicken", "beautiful"]
+        )
+        assert MetadataParserAdapter._fetchmetadata(content).endswith("beautiful\n---")
+
+        # Stop at the first header, never read the body.
+        read = []
+
+        def lines():
+            for line in ["# Chicken\n", "body\n", "body\n"]:
+                read.append(line)
+                yield line
+
+        assert MetadataParserAdapter.scan(lines())["title"] == "Chicken"
+        assert len(read) == 1
+
+        # Unclosed metadata is not read to the end.
+        read.clear()
+
+        def unclosed():
+            yield "---\n"
+            while len(read) < 10_000:
+                read.append("key: value\n")
+                yield read[-1]
+
+        assert MetadataParserAdapter.scan(unclosed()) == {}
+        assert len(read) < 1_000
+
     def test_fetchfile_and_present(self) -> None:
         # 1. Fetch.
         file_path, root_path = self._store_file(
@@ -175,6 +214,50 @@ class TestDTO:
         presenter = DocumentPresenter.fromentity(demo_obj)
         assert presenter.dict()["title"] == "只因的美学"
 
+        # Trusted, same result without validation.
+        meta = DocumentMeta(**{**demo_obj.meta.__dict__, "location": ["chicken"]})
+        assert DocumentPresenter.encode(
+            [DocumentPresenter.fromentity(meta, trusted=True)]
+        ) == DocumentPresenter.encode([DocumentPresenter.fromentity(meta)])
+
+    def test_present_trusted(self) -> None:
+        import json
+        from pydantic import ValidationError
+
+        current = datetime.utcnow()
+        metas = [
+            DocumentMeta(
+                name=str(idx),
+                title=f"Chicken {idx}",
+                language="en",
+                source=Path(f"docs/{idx}.md"),
+                location=["chicken", str(idx)],
+                categories=[],
+                create_time=current,
+                change_time=current,
+            )
+            for idx in range(3)
+        ]
+
+        assert DocumentPresenter.encode(
+            DocumentPresenter.fromentities(metas), with_content=False
+        ) == DocumentPresenter.encode(
+            [DocumentPresenter.fromentity(meta) for meta in metas],
+            with_content=False,
+        )
+
+        # Untitled and unchanged: rejected by validation, kept by trusted.
+        untitled = DocumentMeta(
+            **{**metas[0].__dict__, "title": None, "change_time": None}
+        )
+        with pytest.raises(ValidationError):
+            DocumentPresenter.fromentity(untitled)
+        payload = DocumentPresenter.encode(
+            DocumentPresenter.fromentities([untitled]), with_content=False
+        )
+        assert json.loads(payload)[0]["title"] is None
+        assert json.loads(payload)[0]["change_time"] is None
+
 
 def run_sync(func: Callable[..., Coroutine], **inputs) -> Any:
     return asyncio.get_event_loop().run_until_complete(func(**inputs))
@@ -198,55 +281,30 @@ class SimpleRepoImpl(DocRepo, DocMetaRepo):
     async def upgrade(self, add_object: Document) -> None:
         self.db.append(add_object)
 
+    async def remove(self, keys: Iterable[Cursor]) -> int:
+        keys = set(keys)
+        before = len(self.db)
+        self.db = [
+            item
+            for item in self.db
+            if (item.meta.repo_name, item.meta.name, item.meta.language) not in keys
+        ]
+        return before - len(self.db)
+
     # fix.
     async def check(self) -> bool:
         return await super().check()
 
 
-mapper_registry = registry()
-
+class DefaultRepo(DocumentDAO):
+    """Implementation with database(memory)."""
 
-class DefaultRepo(DocRepo, DocMetaRepo):
-    """Implementation with database"""
+    def __init__(self, config: DepsConfig = database_test) -> None:
+        super().__init__(enginefromconfig(config))
 
-    engine: AsyncEngine
-    table: Table
-
-    async def __init__(self,
-        config: DepsConfig=database_test,
-        table: Table=document_table
-    ) -> None:
-        self.engine = enginefromconfig(config)
-        self.table = table
-
-        async with self.engine.begin() as conn:
-            await conn.run_sync(mapper_registry.metadata.create_all)
-
-        mapper_registry.map_imperatively(Document, document_table)
-
-    async def display(self) -> List[DocumentMeta | None]:
+    async def create(self) -> None:
         async with self.engine.begin() as conn:
-            stmt = select(document_table)
-            await conn.execute(stmt)
-            ...
-        # Table => DTO => DomainModel
-        # Table =mapper=> DomainModel
-        raise NotImplementedError
-
-    async def loadbycondition(self, **condition) -> List[Document | None]:
-        async with self.engine.begin() as conn:
-            stmt = select(document_table).where()
-            ...
-        raise NotImplementedError
-
-    async def loadbyname(self, name: str) -> List[Document | None]:
-        return await self.loadbycondition(name=name)
-
-    async def upgrade(self, add_object: Any) -> None:
-        async with self.engine.begin() as conn:
-            stmt = update(document_table).where().values()
-            ...
-        raise NotImplementedError
+            await conn.run_sync(chestnut_sqlite_metadata.create_all)
 
 
 class TestUsecase:
@@ -313,3 +371,220 @@ class TestUsecase:
 
         assert item_1.name == "2"
         assert "\n" in item_1.content
+
+
+class TestDocumentDAO:
+    def _document(self, name: str, lang: str = "en") -> Document:
+        current = datetime.utcnow()
+
+        return Document(
+            file_id=name,
+            meta=DocumentMeta(
+                name=name,
+                title=f"{name.title()}({lang})",
+                language=lang,
+                source=None,
+                location=[name],
+                categories=[],
+                create_time=current,
+                change_time=current,
+            ),
+            content=DOCUMENT_RAW_CONTENT,
+        )
+
+    def test_repo(self) -> None:
+        async def run() -> None:
+            repo = DefaultRepo()
+            await repo.create()
+            assert not await repo.check()
+
+            await repo.upgrade(
+                [self._document(name) for name in ["a", "b", "c", "d"]]
+                + [self._document("a", "cmn-Hans")]
+            )
+            assert await repo.check()
+
+            # Batch.
+            documents = await repo.loadbynames(["a", "c", "e"])
+            assert sorted(item.meta.language for item in documents if item) == [
+                "cmn-Hans",
+                "en",
+                "en",
+            ]
+            assert (await repo.loadbycondition(lang="cmn-Hans"))[0].file_id == "a"  # type: ignore
+
+            # Meta only.
+            metas = await repo.display()
+            assert len(metas) == 5
+
+            # Keyset.
+            pages, cursor = [], None
+            while True:
+                page, cursor = await repo.displaypage(2, cursor)
+                pages.append([meta.name for meta in page if meta])
+                if cursor is None:
+                    break
+            assert pages == [["a", "a"], ["b", "c"], ["d"]]
+
+            # Update.
+            document = self._document("b")
+            document.meta.title = "Beautiful"
+            await repo.upgrade(document)
+            assert (await repo.loadbyname("b"))[0].meta.title == "Beautiful"  # type: ignore
+
+            assert await repo.remove([("main", "d", "en")]) == 1
+            assert len(await repo.display()) == 4
+
+            await repo.engine.dispose()
+
+        asyncio.new_event_loop().run_until_complete(run())
+
+    def test_location(self) -> None:
+        from chestnut.infra.deps.document.metaindex import MetaIndex
+
+        async def run() -> None:
+            repo = DefaultRepo()
+            repo.main_path = Path("/root/docs")
+            await repo.create()
+
+            # `_` in file name.
+            document = self._document("helpers_fbp_components", "cmn-Hans")
+            document.meta.source = repo.main_path / "helpers/fbp_components.cmn-Hans.md"
+            await repo.upgrade(document)
+
+            metas = await repo.display()
+            assert metas[0].location == ["helpers", "fbp_components"]  # type: ignore
+            assert MetaIndex.frommetas(metas).records[0].uri == (
+                "/docs/cmn-Hans/helpers/fbp_components"
+            )
+
+            await repo.engine.dispose()
+
+        asyncio.new_event_loop().run_until_complete(run())
+
+
+class TestCachedDocRepo:
+    def test_cache(self) -> None:
+        class SlowRepo(SimpleRepoImpl):
+            loads = 0
+
+            async def loadbyname(self, name: str) -> List[Document | None]:
+                self.loads += 1
+                await asyncio.sleep(0.01)
+                return await super().loadbyname(name)
+
+        async def run() -> None:
+            repo = SlowRepo()
+            cached = CachedDocRepo(repo, max_size=1024**2)
+            document = TestDocumentDAO()._document("chicken")
+            await cached.upgrade(document)
+
+            # Stampede => one load.
+            results = await asyncio.gather(
+                *(cached.loadbyname("chicken") for _ in range(8))
+            )
+            assert repo.loads == 1
+            assert all(result[0] is document for result in results)
+            assert cached.coalesced == 7
+
+            await cached.loadbyname("chicken")
+            assert repo.loads == 1
+            assert cached.stats()["hits"] == 1
+
+            # Invalidated by upgrade.
+            await cached.upgrade(document)
+            await cached.loadbyname("chicken")
+            assert repo.loads == 2
+
+            # Invalidated while loading => stale result is not cached,
+            # and a load after it is not shared with the stale one.
+            cached.invalidate()
+            stale = asyncio.ensure_future(cached.loadbyname("chicken"))
+            await asyncio.sleep(0)
+            cached.invalidate()
+            await asyncio.gather(stale, cached.loadbyname("chicken"))
+            assert repo.loads == 4
+            await cached.loadbyname("chicken")
+            assert repo.loads == 4
+
+        asyncio.new_event_loop().run_until_complete(run())
+
+
+class TestBuildIndex:
+    def test_diff_and_apply(self) -> None:
+        helper = TestDocumentDAO()
+        files = {name: helper._document(name) for name in ["a", "b", "c"]}
+        loaded: List[str] = []
+
+        def scan() -> List[DocumentMeta]:
+            return [document.meta for document in files.values()]
+
+        def load(meta: DocumentMeta) -> Document:
+            loaded.append(meta.name)
+            return files[meta.name]
+
+        async def run() -> None:
+            repo = DefaultRepo()
+            await repo.create()
+            usecase = BuildIndex(repo, scan_service=scan, load_service=load)
+
+            summary = await usecase()
+            assert len(summary.added) == 3 and loaded == ["a", "b", "c"]
+
+            # Nothing changed => nothing read.
+            loaded.clear()
+            summary = await usecase()
+            assert not summary and summary.unchanged == 3 and loaded == []
+
+            files["b"].meta.change_time = datetime.utcnow() + timedelta(seconds=1)
+            files["d"] = helper._document("d")
+            del files["c"]
+
+            summary = await usecase()
+            assert summary.updated == [("main", "b", "en")]
+            assert summary.added == [("main", "d", "en")]
+            assert summary.removed == [("main", "c", "en")]
+            assert sorted(loaded) == ["b", "d"]
+            assert sorted(meta.name for meta in await repo.display() if meta) == [
+                "a",
+                "b",
+                "d",
+            ]
+
+            await repo.engine.dispose()
+
+        asyncio.new_event_loop().run_until_complete(run())
+
+    def test_cached_repo(self) -> None:
+        from chestnut.infra.deps.document.cache import createdocumentrepo
+
+        document = TestDocumentDAO()._document("cached")
+
+        async def run() -> None:
+            engine = DefaultRepo().engine
+            async with engine.begin() as conn:
+                await conn.run_sync(chestnut_sqlite_metadata.create_all)
+            repo = createdocumentrepo(engine)
+            usecase = BuildIndex(
+                repo,
+                scan_service=lambda: [document.meta],
+                load_service=lambda _: document,
+            )
+
+            await usecase()
+            assert (await repo.loadbyname("cached"))[0].content == document.content
+            assert repo.stats()["count"] == 1
+
+            # Changed => invalidated by `BuildIndex`.
+            document.meta.change_time = datetime.utcnow() + timedelta(seconds=1)
+            document.content = "Changed."
+            assert (await usecase()).updated == [("main", "cached", "en")]
+            assert repo.stats()["count"] == 0
+            assert (await repo.loadbyname("cached"))[0].content == "Changed."
+
+            page, _ = await repo.displaypage(10)
+            assert "cached" in [meta.name for meta in page if meta]
+
+            await engine.dispose()
+
+        asyncio.new_event_loop().run_until_complete(run())
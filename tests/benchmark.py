@@ -0,0 +1,73 @@
+""" `tests.benchmark`
+
+    Timing of hot paths, out of the test suite(the autouse profiler and a
+    busy machine make wall-clock assertions flaky):
+
+    ```shell
+    python -m tests.benchmark
+    ```
+"""
+import timeit
+from typing import Callable, Dict
+
+
+def eventitem(number: int = 10000) -> str:
+    from chestnut.infra.web.sse.event import EventItem
+
+    cost = timeit.timeit(
+        lambda: EventItem.event(1, "message", None, ["Hello", {"a": 1}]),
+        number=number,
+    )
+
+    return f"EventItem.event: {cost / number * 1e6:.2f}us per event."
+
+
+def presenter(number: int = 10000) -> str:
+    from datetime import datetime
+    from pathlib import Path
+    from chestnut.application.document.domain.meta import DocumentMeta
+    from chestnut.application.document.dto.present import DocumentPresenter
+
+    current = datetime.utcnow()
+    metas = [
+        DocumentMeta(
+            name=str(idx),
+            title=f"Chicken {idx}",
+            language="en",
+            source=Path(f"docs/{idx}.md"),
+            location=["chicken", str(idx)],
+            categories=[],
+            create_time=current,
+            change_time=current,
+        )
+        for idx in range(number)
+    ]
+
+    validated = timeit.timeit(
+        lambda: DocumentPresenter.encode(
+            [DocumentPresenter.fromentity(meta) for meta in metas],
+            with_content=False,
+        ),
+        number=1,
+    )
+    trusted = timeit.timeit(
+        lambda: DocumentPresenter.encode(
+            DocumentPresenter.fromentities(metas), with_content=False
+        ),
+        number=1,
+    )
+
+    return (
+        f"Present {number} documents: validated {validated * 1e3:.1f}ms, "
+        f"trusted {trusted * 1e3:.1f}ms."
+    )
+
+
+BENCHMARKS: Dict[str, Callable[[], str]] = dict(
+    eventitem=eventitem, presenter=presenter
+)
+
+
+if __name__ == "__main__":
+    for benchmark in BENCHMARKS.values():
+        print(benchmark())
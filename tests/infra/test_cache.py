@@ -0,0 +1,49 @@
+import pytest
+
+from chestnut.infra.helpers.cache import SizedLRU
+from chestnut.infra.helpers.path import INSTANCE_PATH, INSTANCE_TEST_PATH
+from chestnut.infra.deps.highlight.cache import HighlightCache
+
+
+class TestSizedLRU:
+    def test_budget(self) -> None:
+        cache = SizedLRU(10)
+        cache.put("a", "12345")
+        cache.put("b", "12345")
+        assert cache.get("a") == "12345"  # `a` is newer than `b` now.
+
+        cache.put("c", "123")
+        assert "b" not in cache and "a" in cache and "c" in cache
+        assert cache.size == 8
+
+        # Too large.
+        cache.put("d", "12345678901")
+        assert "d" not in cache
+
+        assert cache.get("b") is None
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+class TestHighlightCache:
+    def test_disk(self) -> None:
+        if not INSTANCE_PATH.exists():
+            INSTANCE_PATH.mkdir()
+        cache_path = INSTANCE_TEST_PATH / "highlight"
+
+        key = HighlightCache.key("print(1)", "python", None)
+        assert key != HighlightCache.key("print(1)", "python", 1)
+
+        HighlightCache(1024, cache_path).put(key, "<pre>print(1)</pre>")
+
+        # After restart.
+        cache = HighlightCache(1024, cache_path)
+        assert cache.get(key) == "<pre>print(1)</pre>"
+        assert key in cache.memory
+
+    def test_bytes(self) -> None:
+        cache = HighlightCache(12)
+        cache.put("a", "栗子栗子")
+        # 4 characters, but 12 bytes.
+        assert cache.memory.size == 12
+        cache.put("b", "栗")
+        assert "a" not in cache.memory and cache.memory.size == 3
@@ -0,0 +1,75 @@
+import gzip
+
+from chestnut.infra.deps.compress import compress, negotiate
+
+
+class TestCompress:
+    def test_negotiate(self) -> None:
+        assert negotiate(None, ["br", "gzip"]) is None
+        assert negotiate("gzip, deflate", ["br", "gzip"]) == "gzip"
+        assert negotiate("gzip;q=0.5, br", ["br", "gzip"]) == "br"
+        assert negotiate("br;q=0, *", ["br", "gzip"]) == "gzip"
+        assert negotiate("identity", ["gzip"]) is None
+
+    def test_compress(self) -> None:
+        raw = b"Chestnut " * 64
+
+        assert gzip.decompress(compress(raw, "gzip")) == raw
+        # Reproducible.
+        assert compress(raw, "gzip") == compress(raw, "gzip")
+
+    def test_hashed(self) -> None:
+        from chestnut.infra.web.static import HASHED_PATTERN
+
+        assert HASHED_PATTERN.search("index-4ed993c7.js")
+        assert HASHED_PATTERN.search("index-4ed993c7.css")
+        # Hand-written, no hash => never immutable.
+        assert not HASHED_PATTERN.search("minimal-theme-switcher.js")
+        assert not HASHED_PATTERN.search("docs-switcher.js")
+        assert not HASHED_PATTERN.search("sse-client.js")
+
+
+class TestCompressMiddleware:
+    def test_response(self) -> None:
+        from sanic import Sanic, Request
+        from sanic.response import html
+        from chestnut.infra.web.middleware import register_compression
+
+        app = Sanic("chestnut_test_compress")
+        app.config.OAS = False
+        register_compression(app)
+        page = "<p>Chestnut</p>" * 256
+
+        @app.get("/page")
+        async def big(request: Request):
+            return html(page, headers={"ETag": '"chestnut"'})
+
+        @app.get("/small")
+        async def small(request: Request):
+            return html("<p>Chestnut</p>")
+
+        @app.get("/encoded")
+        async def encoded(request: Request):
+            return html(page, headers={"Content-Encoding": "identity"})
+
+        def get(uri: str, accept_encoding: str = "gzip"):
+            headers = {"Accept-Encoding": accept_encoding}
+            _, response = app.test_client.get(uri, headers=headers)
+            return response
+
+        response = get("/page", "gzip, deflate")
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        # Weak, the body is not the identity one.
+        assert response.headers["etag"] == 'W/"chestnut"'
+        assert response.text == page
+
+        # Not accepted: same body, still varies.
+        response = get("/page", "identity")
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["etag"] == '"chestnut"'
+
+        # Too small or already encoded.
+        assert "content-encoding" not in get("/small").headers
+        assert get("/encoded").headers["content-encoding"] == "identity"
@@ -0,0 +1,70 @@
+import pytest
+
+import asyncio
+from datetime import datetime
+from sqlalchemy.sql import insert, update
+from typing import Any, Callable, Coroutine
+
+from chestnut.infra.deps.database.dao.base import chestnut_sqlite_metadata
+from chestnut.infra.deps.database.dao.document import document_table
+from chestnut.infra.deps.database.search import searchdocuments, toftsquery
+from chestnut.infra.deps.database.service import enginefromconfig
+from chestnut.infra.deps.database.settings import database_test
+
+
+def run_sync(func: Callable[..., Coroutine], **inputs) -> Any:
+    return asyncio.new_event_loop().run_until_complete(func(**inputs))
+
+
+def _row(name: str, title: str, content: str, lang: str = "en") -> dict:
+    return dict(
+        name=name,
+        repo_name="main",
+        lang=lang,
+        path=None,
+        title=title,
+        content=content,
+        create_time=datetime.utcnow(),
+        change_time=datetime.utcnow(),
+    )
+
+
+class TestFullTextSearch:
+    def test_query(self) -> None:
+        assert toftsquery('chicken "you') == '"chicken" """you"'
+        assert toftsquery("  ") == ""
+
+    def test_search(self) -> None:
+        async def search() -> tuple:
+            engine = enginefromconfig(database_test)
+            async with engine.begin() as conn:
+                await conn.run_sync(chestnut_sqlite_metadata.create_all)
+                await conn.execute(
+                    insert(document_table),
+                    [
+                        _row("chicken", "Beautiful chicken", "Chicken is beautiful."),
+                        _row("basketball", "Basketball", "Sing, dance, rap."),
+                        _row("guide", "面向萌新的安装指南", "安装指南的内容。", "cmn-Hans"),
+                    ],
+                )
+                # Synced by triggers.
+                await conn.execute(
+                    update(document_table)
+                    .where(document_table.c.name == "basketball")
+                    .values(content="Sing, dance, rap and <b>chicken</b>.")
+                )
+                total, hits = await searchdocuments(conn, "chicken")
+                _, cjk_hits = await searchdocuments(conn, "安装指南")
+                _, paged = await searchdocuments(conn, "chicken", limit=1, offset=1)
+            await engine.dispose()
+            return total, hits, cjk_hits, paged
+
+        total, hits, cjk_hits, paged = run_sync(search)
+
+        assert total == 2
+        # Title weights more.
+        assert hits[0]["name"] == "chicken"
+        assert "<mark>" in hits[0]["title"]
+        assert "&lt;b&gt;<mark>chicken</mark>&lt;/b&gt;" in hits[1]["snippet"]
+        assert cjk_hits[0]["name"] == "guide"
+        assert len(paged) == 1 and paged[0]["name"] == "basketball"
@@ -0,0 +1,471 @@
+import pytest
+
+import os
+from pathlib import Path
+
+from chestnut.infra.deps.markdown.store import RenderedStore
+from chestnut.infra.helpers.path import INSTANCE_PATH, INSTANCE_TEST_PATH
+
+
+def _store_file(file_name: str, content: str) -> Path:
+    if not INSTANCE_PATH.exists():
+        INSTANCE_PATH.mkdir()
+    if not INSTANCE_TEST_PATH.exists():
+        INSTANCE_TEST_PATH.mkdir()
+
+    file_path = INSTANCE_TEST_PATH / file_name
+    file_path.write_text(data=content, encoding="utf-8")
+
+    return file_path
+
+
+class TestRenderedStore:
+    def test_render_once(self) -> None:
+        file_path = _store_file("store.md", "# Chicken\n\nJust beautiful.\n")
+
+        rendered = []
+        store = RenderedStore(lambda content: rendered.append(content) or content)
+
+        store.get(file_path)
+        store.get(file_path)
+        assert len(rendered) == 1
+
+        # Changed => render again.
+        file_path.write_text("# Chicken\n\nToo beautiful.\n", encoding="utf-8")
+        stat = os.stat(file_path)
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert "Too" in store.get(file_path)
+        assert len(rendered) == 2
+
+    def test_prerender(self) -> None:
+        file_path = _store_file("prerender.md", "# Chicken\n")
+
+        store = RenderedStore()
+        store.prerender([file_path])
+
+        assert file_path in store
+        assert "<h1>" in store.get(file_path)
+
+        store.invalidate(file_path)
+        assert file_path not in store
+
+    def test_fingerprint(self) -> None:
+        file_path = _store_file("fingerprint.md", "# Chicken\n")
+
+        rendered = []
+        store = RenderedStore(lambda content: rendered.append(content) or content)
+
+        document = store.fingerprint(file_path)
+        assert document.html is None
+        assert rendered == []
+
+        store.get(file_path)
+        assert store.fingerprint(file_path).digest == document.digest
+        assert len(rendered) == 1
+
+    def test_max_size(self) -> None:
+        file_path = _store_file("max_size.md", "# Chicken\n\nJust beautiful.\n")
+
+        rendered = []
+        store = RenderedStore(
+            lambda content: rendered.append(content) or content, max_size=8
+        )
+
+        # Too large, not rendered at startup.
+        store.prerender([file_path])
+        assert rendered == []
+
+        # Rendered on each call, HTML is never kept.
+        assert "Chicken" in store.get(file_path)
+        assert store.fingerprint(file_path).html is None
+        store.get(file_path)
+        assert len(rendered) == 2
+
+
+class TestDocumentIndex:
+    def test_scan_diff(self) -> None:
+        from chestnut.infra.deps.document.dir import DocumentIndex, build_index
+
+        root = INSTANCE_TEST_PATH / "index_docs"
+        (root / "guide").mkdir(parents=True, exist_ok=True)
+        for file in root.rglob("*.md"):
+            file.unlink()
+        manifest = INSTANCE_TEST_PATH / "index_docs.json"
+        if manifest.exists():
+            manifest.unlink()
+
+        first = root / "guide" / "newbie.cmn-Hans.md"
+        first.write_text("# Newbie\n", encoding="utf-8")
+        second = root / "about.md"
+        second.write_text("# About\n", encoding="utf-8")
+
+        index = DocumentIndex(root, manifest)
+        diff = index.scan()
+        assert sorted(diff.added) == sorted([str(first), str(second)])
+        assert not index.scan()
+
+        # Persisted.
+        reloaded = DocumentIndex(root, manifest)
+        assert reloaded[str(first)].title == "Newbie"
+        assert not reloaded.scan()
+
+        # Change one, remove one.
+        first.write_text("# Newbie guide\n", encoding="utf-8")
+        stat = os.stat(first)
+        os.utime(first, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        second.unlink()
+        diff = reloaded.scan()
+        assert diff.changed == [str(first)] and diff.removed == [str(second)]
+
+        docs_list = build_index(root, False, reloaded)
+        assert docs_list[0]["relative"] == ["guide", "newbie"]
+        assert docs_list[0]["lang"] == "cmn-Hans"
+        assert docs_list[0]["title"] == "Newbie guide"
+
+
+class TestIngest:
+    def _docs(self) -> Path:
+        root = INSTANCE_TEST_PATH / "ingest_docs"
+        (root / "helpers").mkdir(parents=True, exist_ok=True)
+        for file in root.rglob("*.md"):
+            file.unlink()
+        (root / "about.md").write_text("# About\n", encoding="utf-8")
+        for name in ("fbp_components.md", "fbp_components.cmn-Hans.md"):
+            (root / "helpers" / name).write_text("# Components\n", encoding="utf-8")
+
+        return root
+
+    def test_chunked(self) -> None:
+        from chestnut.infra.deps.document.ingest import chunked
+
+        assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+        assert list(chunked([], 2)) == []
+
+    @pytest.mark.parametrize("max_workers", [1, 2])
+    def test_pipeline(self, max_workers: int) -> None:
+        from chestnut.infra.deps.document.dir import DocumentIndex
+        from chestnut.infra.deps.document.ingest import (
+            scandocuments,
+            readdocuments,
+            parsedocuments,
+            torow,
+        )
+        from chestnut.adapter.document.parse.metadata import FilePathAdapter
+
+        root = self._docs()
+        paths = scandocuments(DocumentIndex(root, readonly=True))
+        assert len(paths) == 3
+
+        items = list(readdocuments(paths))
+        assert [path for path, _ in items] == paths
+        assert all(content.startswith("# ") for _, content in items)
+
+        rows = [
+            torow(meta, content)
+            for meta, content in parsedocuments(
+                iter(items), root, FilePathAdapter.parse, max_workers, chunksize=2
+            )
+        ]
+        # In order of paths.
+        assert [row["path"] for row in rows] == [str(Path(path)) for path in paths]
+        assert sorted((row["name"], row["lang"]) for row in rows) == [
+            ("about", "en"),
+            ("helpers_fbp_components", "cmn-Hans"),
+            ("helpers_fbp_components", "en"),
+        ]
+        # Translations share the title.
+        assert {row["title"] for row in rows} == {"About", "Components"}
+        assert all(row["repo_name"] == "main" for row in rows)
+
+
+class TestDocumentWatcher:
+    def test_polling(self) -> None:
+        import asyncio
+        from chestnut.infra.deps.document.dir import DocumentIndex
+        from chestnut.infra.deps.document.watch import DocumentWatcher
+
+        root = INSTANCE_TEST_PATH / "watch_docs"
+        root.mkdir(parents=True, exist_ok=True)
+        for file in root.rglob("*.md"):
+            file.unlink()
+        file_path = root / "watch.md"
+        file_path.write_text("# Watch\n", encoding="utf-8")
+
+        async def run() -> list:
+            index = DocumentIndex(root)
+            index.scan()
+            diffs: list = []
+
+            async def callback(diff) -> None:
+                diffs.append(diff)
+
+            watcher = DocumentWatcher(index, callback, interval=0.05, use_inotify=False)
+            task = asyncio.create_task(watcher.run())
+            await asyncio.sleep(0.01)
+            file_path.write_text("# Watch again\n", encoding="utf-8")
+            stat = os.stat(file_path)
+            os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            await asyncio.sleep(0.2)
+            task.cancel()
+
+            return diffs
+
+        diffs = asyncio.new_event_loop().run_until_complete(run())
+        assert [diff.changed for diff in diffs] == [[str(file_path)]]
+
+    def test_leader(self) -> None:
+        from chestnut.infra.deps.document.dir import DocumentIndex
+        from chestnut.infra.deps.document.watch import acquireleader, watchlockpath
+
+        root = INSTANCE_TEST_PATH / "leader_docs"
+        root.mkdir(parents=True, exist_ok=True)
+        (root / "leader.md").write_text("# Leader\n", encoding="utf-8")
+        manifest = INSTANCE_TEST_PATH / "leader_docs.json"
+        if manifest.exists():
+            manifest.unlink()
+
+        # Only one holder.
+        lock = acquireleader(watchlockpath(root))
+        assert lock is not None
+        assert acquireleader(watchlockpath(root)) is None
+        lock.close()
+        second = acquireleader(watchlockpath(root))
+        assert second is not None
+        second.close()
+
+        # Follower never writes the manifest, leader replaces it at once.
+        DocumentIndex(root, manifest, readonly=True).scan()
+        assert not manifest.exists()
+        DocumentIndex(root, manifest).scan()
+        assert manifest.exists()
+        assert not list(INSTANCE_TEST_PATH.glob("leader_docs.json.*.tmp"))
+
+
+class TestSplitSections:
+    def test_split(self) -> None:
+        from chestnut.infra.deps.markdown.stream import splitsections
+
+        source = "# A\ntext\n```\n# Not a heading\n```\n## B\nmore\n# C\n"
+        sections = list(splitsections(source, 1))
+
+        assert sections == [
+            "# A\ntext\n```\n# Not a heading\n```\n",
+            "## B\nmore\n",
+            "# C\n",
+        ]
+        assert "".join(splitsections(source)) == source
+
+    def test_section(self) -> None:
+        file_path = _store_file(
+            "section.md", "# Chicken\n\n## Sing\n\nla\n\n## Dance\n\n```\n# Not\n```\n"
+        )
+
+        store = RenderedStore(lambda content: content)
+        document = store.fingerprint(file_path)
+        assert [section.anchor for section in document.sections[0].walk()] == [
+            "chicken",
+            "sing",
+            "dance",
+        ]
+        assert store.rendersection(file_path, "sing") == "## Sing\n\nla\n\n"
+        assert store.rendersection(file_path, "dance").endswith("# Not\n```\n")
+        assert store.rendersection(file_path, "basketball") is None
+
+
+class TestRenderStream:
+    def test_iterrender(self) -> None:
+        from chestnut.infra.deps.markdown.stream import iterrender
+
+        source = "# A\n\ntext\n\n```\n# Not\n```\n\n## B\n\nmore\n\n# C\n"
+        render_service = RenderedStore().render_service
+
+        parts = list(iterrender(source, render_service, 1))
+        assert len(parts) == 3
+        assert "".join(parts) == render_service(source)
+
+    def test_reference(self) -> None:
+        from chestnut.infra.deps.markdown.stream import iterrender, splitsections
+
+        paragraph = "Chicken is beautiful.\n\n" * 4096
+        source = (
+            "# A\n\nSee [rooster][].\n\n"
+            + paragraph
+            + "# B\n\n[rooster]: https://example.com/rooster\n\n"
+            + paragraph
+            + "# C\n\nSee [rooster][] again.\n"
+        )
+        assert len(source) > 2 * 64 * 1024
+        assert len(list(splitsections(source))) == 3
+
+        render_service = RenderedStore().render_service
+        parts = list(iterrender(source, render_service))
+        assert all('href="https://example.com/rooster"' in part for part in parts[::2])
+
+    def test_page(self) -> None:
+        from chestnut.infra.deps.document.settings import document as docconf
+        from chestnut.infra.web.app import create_app
+        from chestnut.infra.web.blueprints.plain.docs.bp import create_blueprint
+
+        root = INSTANCE_TEST_PATH / "stream_docs"
+        (root / "guide").mkdir(parents=True, exist_ok=True)
+        (root / "guide" / "newbie.md").write_text(
+            "# Newbie\n\n" + "Chicken is beautiful.\n\n" * 64, encoding="utf-8"
+        )
+
+        app = create_app(mode="launch")
+        app.config.OAS = False
+        app.blueprint(create_blueprint(root, prerender=False))
+
+        def get() -> str:
+            _, response = app.test_client.get("/docs/en/guide/newbie")
+            assert response.status == 200
+            return response.text
+
+        threshold = docconf.stream_threshold
+        try:
+            docconf.stream_threshold = 1 << 30
+            rendered = get()
+            docconf.stream_threshold = 0
+            streamed = get()
+        finally:
+            docconf.stream_threshold = threshold
+
+        assert "Chicken is beautiful." in rendered
+        assert streamed == rendered
+
+
+class TestDocumentRoutes:
+    def test_live_index(self) -> None:
+        from chestnut.infra.deps.document.dir import build_index
+        from chestnut.infra.deps.document.settings import document as docconf
+        from chestnut.infra.web.app import create_app
+        from chestnut.infra.web.blueprints.plain.docs.bp import create_blueprint
+        from chestnut.infra.web.blueprints.plain.docs.page import RouteTable
+
+        root = INSTANCE_TEST_PATH / "route_docs"
+        (root / "guide").mkdir(parents=True, exist_ok=True)
+        for file in root.rglob("*.md"):
+            file.unlink()
+        newbie = root / "guide" / "newbie.md"
+        newbie.write_text("# Newbie\n", encoding="utf-8")
+        (root / "guide" / "newbie.cmn-Hans.md").write_text("# 萌新\n", encoding="utf-8")
+
+        watch = docconf.watch
+        docconf.watch = False
+        try:
+            app = create_app(mode="launch")
+            app.config.OAS = False
+            docs_bp = create_blueprint(root, prerender=False)
+            app.blueprint(docs_bp)
+
+            def get(uri: str, language: str = "en"):
+                _, response = app.test_client.get(
+                    uri, headers={"Accept-Language": language}, allow_redirects=False
+                )
+                return response
+
+            assert get("/docs/en/guide/newbie").status == 200
+            assert "萌新" in get("/docs/cmn-Hans/guide/newbie").text
+            response = get("/docs/guide/newbie", "zh-CN")
+            assert response.headers["location"] == "/docs/cmn-Hans/guide/newbie"
+            assert get("/docs/fr/guide/newbie").status == 404
+
+            # Removed, before reindexed.
+            newbie.unlink()
+            assert get("/docs/en/guide/newbie").status == 404
+
+            # Added, served after reindexed(as the watcher does).
+            (root / "guide" / "launch.md").write_text("# Launch\n", encoding="utf-8")
+            assert get("/docs/en/guide/launch").status == 404
+            docs_bp.ctx.routes = RouteTable(build_index(root, False), "/docs")
+            assert "Launch" in get("/docs/en/guide/launch").text
+            assert get("/docs/guide/launch").headers["location"] == (
+                "/docs/en/guide/launch"
+            )
+        finally:
+            docconf.watch = watch
+
+    def test_conditional(self) -> None:
+        from chestnut.infra.deps.document.settings import document as docconf
+        from chestnut.infra.web.app import create_app
+        from chestnut.infra.web.blueprints.plain.docs.bp import create_blueprint
+
+        root = INSTANCE_TEST_PATH / "conditional_docs"
+        (root / "guide").mkdir(parents=True, exist_ok=True)
+        newbie = root / "guide" / "newbie.md"
+        newbie.write_text("# Newbie\n", encoding="utf-8")
+
+        watch = docconf.watch
+        docconf.watch = False
+        try:
+            app = create_app(mode="launch")
+            app.config.OAS = False
+            docs_bp = create_blueprint(root, prerender=False)
+            app.blueprint(docs_bp)
+
+            rendered = []
+            store = docs_bp.ctx.store
+            render_service = store.render_service
+            store.render_service = lambda content: (
+                rendered.append(content) or render_service(content)
+            )
+
+            def get(**headers: str):
+                # Not compressed, or the `ETag` is weakened.
+                _, response = app.test_client.get(
+                    "/docs/en/guide/newbie",
+                    headers={"Accept-Encoding": "identity", **headers},
+                )
+                return response
+
+            response = get()
+            assert response.status == 200
+            assert len(rendered) == 1
+            etag = response.headers["ETag"]
+            last_modified = response.headers["Last-Modified"]
+
+            # Not in store any more, still not rendered for a 304.
+            store.invalidate(newbie)
+            response = get(**{"If-None-Match": etag})
+            assert response.status == 304
+            assert response.headers["ETag"] == etag
+            assert get(**{"If-None-Match": f"W/{etag}"}).status == 304
+            assert get(**{"If-Modified-Since": last_modified}).status == 304
+            assert len(rendered) == 1
+
+            # Mismatched => full page.
+            response = get(**{"If-None-Match": '"chicken"'})
+            assert response.status == 200
+            assert "Newbie" in response.text
+            assert len(rendered) == 2
+        finally:
+            docconf.watch = watch
+
+
+class TestMetaIndex:
+    def test_index(self) -> None:
+        import json
+        from chestnut.infra.deps.document.metaindex import MetaIndex, MetaRecord
+
+        index = MetaIndex(
+            [
+                MetaRecord("guide_newbie", "萌新", "cmn-Hans", ["guide", "newbie"]),
+                MetaRecord("guide_newbie", "Newbie", "en", ["guide", "newbie"]),
+                MetaRecord("about", "About", "en", ["about"], ["info"]),
+            ]
+        )
+
+        assert [record.title for record in index.languages["en"]] == ["About", "Newbie"]
+        assert [record.name for record in index.categories["info"]] == ["about"]
+        assert len(index.tree["guide"]["newbie"][""]) == 2
+        assert index.languages["en"][1].uri == "/docs/en/guide/newbie"
+
+        payload = index.payload("en")
+        assert index.payload("en") is payload
+        assert json.loads(payload)["total"] == 2
+
+        # Unknown languages are not cached one by one.
+        empty = index.payload("fr")
+        assert json.loads(empty)["total"] == 0
+        assert index.payload("xx-unknown") is empty
+        assert len(index._payloads) == 2
@@ -0,0 +1,34 @@
+import pytest
+
+from chestnut.infra.deps.highlight import COLORFUL_CODE
+
+
+@pytest.mark.skipif(not COLORFUL_CODE, reason="Pygments is not installed.")
+class TestHighlight:
+    def test_lexer(self) -> None:
+        from chestnut.infra.deps.highlight import getlexer
+        from chestnut.infra.deps.highlight.settings import highlight as highlightconf
+
+        lexer = getlexer("python")
+        hits = getlexer.cache_info().hits
+        assert getlexer("python") is lexer
+        assert getlexer.cache_info().hits == hits + 1
+
+        # Aliases are cached apart, but resolve to the same lexer.
+        assert getlexer("py").name == lexer.name == "Python"
+        # Unknown => default one.
+        assert getlexer("chicken-script").name == (
+            getlexer(highlightconf.default_lexer).name
+        )
+
+    def test_formatter(self) -> None:
+        from chestnut.infra.deps.highlight import getformatter, rendercode
+
+        assert getformatter(None) is getformatter(None)
+        assert not getformatter(None).linenos
+        assert getformatter(3) is getformatter(3)
+        assert getformatter(3).linenostart == 3
+
+        html = rendercode("print(1)", "python", 3)
+        assert rendercode("print(1)", "python", 3) is html
+        assert "3" in html and rendercode("print(1)", "python") != html
@@ -0,0 +1,79 @@
+from chestnut.infra.deps.i18n.language import negotiatelanguage, parseacceptlanguage
+
+
+class TestLanguage:
+    def test_parse(self) -> None:
+        header = "en;q=0.8, zh-CN, zh;q=0.9, fr;q=0, de;q=abc"
+
+        assert parseacceptlanguage(header) == (
+            ("zh-CN", 1.0),
+            ("zh", 0.9),
+            ("en", 0.8),
+        )
+        # Cached.
+        assert parseacceptlanguage(header) is parseacceptlanguage(header)
+        assert parseacceptlanguage(None) == (("en", 0.8), ("*", 0.5))
+
+    def test_negotiate(self) -> None:
+        available = ("cmn-Hans", "en")
+
+        def negotiate(header: str, default: str = "en") -> str:
+            return negotiatelanguage(parseacceptlanguage(header), available, default)
+
+        assert negotiate("zh-CN,zh;q=0.9,en;q=0.8") == "cmn-Hans"
+        assert negotiate("EN-gb,zh;q=0.5") == "en"
+        assert negotiate("cmn") == "cmn-Hans"
+        assert negotiate("fr") == "en"
+        assert negotiate("fr,*;q=0.1", "de") == "cmn-Hans"
+        assert negotiatelanguage((("en-US", 1.0),), ("en-GB", "en-US"), "en") == "en-US"
+        assert negotiatelanguage((("en", 1.0),), ("cmn-Hans", "en-GB"), "x") == "en-GB"
+
+
+class TestLanguageMiddleware:
+    def test_request(self) -> None:
+        from sanic import Sanic, Blueprint, Request
+        from sanic.response import text
+        from chestnut.infra.deps.document.metaindex import MetaIndex, MetaRecord
+        from chestnut.infra.web.middleware import register_language
+        from chestnut.infra.web.blueprints.plain.docs.page import add_negotiator
+
+        app = Sanic("chestnut_test_language")
+        app.config.OAS = False
+
+        # Languages come from the docs blueprint.
+        docs_bp = Blueprint("plain_docs_bp", url_prefix="/docs")
+        docs_bp.ctx.meta_index = MetaIndex(
+            [
+                MetaRecord("guide", "Guide", "en", ["guide"]),
+                MetaRecord("guide", "指南", "cmn-Hans", ["guide"]),
+                MetaRecord("about", "About", "fr", ["about"]),
+            ]
+        )
+        docs_bp.add_route(
+            add_negotiator(("cmn-Hans", "en"), ("guide",), "/docs"), "/guide"
+        )
+        app.blueprint(docs_bp)
+        register_language(app)
+
+        @app.get("/language")
+        async def language(request: Request):
+            return text(request.ctx.language)
+
+        def get(uri: str, header: str | None = None):
+            headers = {"Accept-Language": header} if header else {}
+            _, response = app.test_client.get(
+                uri, headers=headers, allow_redirects=False
+            )
+            return response
+
+        assert get("/language", "zh-CN,zh;q=0.9").text == "cmn-Hans"
+        assert get("/language", "fr-FR").text == "fr"
+        assert get("/language").text == "en"
+        assert app.ctx.languages == ("cmn-Hans", "en", "fr")
+
+        # Among languages of the document.
+        response = get("/docs/guide", "fr,zh;q=0.5")
+        assert response.status == 302
+        assert response.headers["location"] == "/docs/cmn-Hans/guide"
+        assert response.headers["vary"] == "Accept-Language"
+        assert get("/docs/guide", "de").headers["location"] == "/docs/en/guide"
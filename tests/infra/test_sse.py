@@ -0,0 +1,250 @@
+import pytest
+
+import asyncio
+from types import SimpleNamespace
+from typing import List
+
+from chestnut.infra.helpers.path import INSTANCE_TEST_PATH
+from chestnut.infra.web.sse.event import EventItem, KEEPALIVE
+from chestnut.infra.web.sse.bus import SocketBus, UNIX_SOCKET
+from chestnut.infra.web.sse.hub import EventHub, DISCONNECT
+from chestnut.infra.web.sse.stream import publisher
+from chestnut.infra.web.settings.location import CONFIG_LOCATION
+
+
+class TestEventHub:
+    def test_fan_out(self) -> None:
+        async def run() -> None:
+            hub = EventHub()
+            site = hub.subscribe(["site"])
+            every = hub.subscribe()
+
+            hub.publish("message", ["Hello"])
+            hub.publish("site", ["Pong"])
+
+            assert b"Pong" in (await site.get())  # type: ignore
+            assert site.queue.empty()
+            assert b"Hello" in (await every.get())  # type: ignore
+            assert b"Pong" in (await every.get())  # type: ignore
+
+            hub.close()
+            assert await every.get() is None
+            assert len(hub) == 0
+
+        asyncio.run(run())
+
+    def test_slow_client(self) -> None:
+        async def run() -> None:
+            hub = EventHub(queue_size=2)
+            slow = hub.subscribe()
+            for index in range(4):
+                hub.publish("message", [str(index)])
+
+            # Oldest are dropped.
+            assert slow.dropped == 2
+            assert b"data: 2" in (await slow.get())  # type: ignore
+
+            hub = EventHub(queue_size=2, slow_policy=DISCONNECT)
+            slow = hub.subscribe()
+            for index in range(3):
+                hub.publish("message", [str(index)])
+
+            assert slow.closed and slow not in hub.subscribers
+
+        asyncio.run(run())
+
+    def test_replay(self) -> None:
+        async def run() -> None:
+            hub = EventHub(history_size=2)
+            ids = [hub.publish("message", [str(index)]) for index in range(3)]
+            assert ids == sorted(ids)
+
+            subscriber = hub.subscribe(last_event_id=str(ids[0]))
+            # Only kept ones after the first.
+            assert f"id: {ids[1]}".encode() in (await subscriber.get())  # type: ignore
+            assert f"id: {ids[2]}".encode() in (await subscriber.get())  # type: ignore
+            assert subscriber.queue.empty()
+
+        asyncio.run(run())
+
+    @pytest.mark.skipif(not UNIX_SOCKET, reason="UNIX socket only.")
+    def test_bus(self) -> None:
+        async def run() -> None:
+            path = INSTANCE_TEST_PATH / "bus"
+            first = EventHub(bus=SocketBus(path, "first"))
+            second = EventHub(bus=SocketBus(path, "second"))
+            first.start()
+            second.start()
+            subscriber = second.subscribe()
+
+            id = first.publish("site", ["Pong"])
+
+            frame = await asyncio.wait_for(subscriber.get(), 1)
+            assert f"id: {id}".encode() in frame  # type: ignore
+            assert second.last_id == id
+
+            first.close()
+            second.close()
+
+        asyncio.run(run())
+
+    @pytest.mark.skipif(not UNIX_SOCKET, reason="UNIX socket only.")
+    def test_bus_error(self) -> None:
+        import errno
+
+        class FailingSocket:
+            def __init__(self, sock, peer: str) -> None:
+                self.sock = sock
+                self.peer = peer
+
+            def sendto(self, raw: bytes, peer: str) -> int:
+                if peer == self.peer:
+                    raise OSError(errno.ENOBUFS, "No buffer space available")
+                return self.sock.sendto(raw, peer)
+
+            def __getattr__(self, name: str):
+                return getattr(self.sock, name)
+
+        async def run() -> None:
+            path = INSTANCE_TEST_PATH / "bus_error"
+            buses = [SocketBus(path, name) for name in ("first", "second", "third")]
+            first, second, third = hubs = [EventHub(bus=bus) for bus in buses]
+            for hub in hubs:
+                hub.start()
+            buses[0].sock = FailingSocket(buses[0].sock, str(buses[1].address))
+            subscriber = third.subscribe()
+
+            # Sent to the others, though one of them failed.
+            id = first.publish("site", ["Pong"])
+
+            frame = await asyncio.wait_for(subscriber.get(), 1)
+            assert f"id: {id}".encode() in frame  # type: ignore
+            assert second.last_id != id
+
+            buses[0].sock = buses[0].sock.sock
+            for hub in hubs:
+                hub.close()
+
+        asyncio.run(run())
+
+
+class TestEventItem:
+    def test_encode(self) -> None:
+        assert EventItem.event(1, "site", 3000, ["Pong"]) == (
+            b"id: 1\nevent: site\nretry: 3000\ndata: Pong\n\n"
+        )
+        # Multi-line.
+        assert EventItem.event(data=["a\r\nb\nc"]) == (b"data: a\ndata: b\ndata: c\n\n")
+        # JSON.
+        assert EventItem.event(event_type="message", data=[{"name": "栗子"}]) == (
+            'event: message\ndata: {"name":"栗子"}\n\n'.encode()
+        )
+        assert EventItem.event(1, "message", None, ["Hello", {"a": 1}]) == (
+            b'id: 1\nevent: message\ndata: Hello\ndata: {"a":1}\n\n'
+        )
+        # Heartbeat.
+        assert EventItem.event() == KEEPALIVE
+        assert EventItem.keepalive("ping") == b": ping\n\n"
+
+
+class FakeResponse:
+    """`send` records frames, blocks forever or raises."""
+
+    def __init__(self, mode: str = "ok") -> None:
+        self.mode = mode
+        self.frames: List[bytes] = []
+
+    async def send(self, frame: bytes) -> None:
+        if self.mode == "raise" and self.frames:
+            raise ConnectionResetError
+        if self.mode == "block" and self.frames:
+            await asyncio.Event().wait()
+        self.frames.append(frame)
+
+
+class FakeConfig(dict):
+    KEEP_ALIVE_TIMEOUT = 5
+
+
+def _request(hub: EventHub, response: FakeResponse, **options) -> SimpleNamespace:
+    message = SimpleNamespace(
+        **{
+            **dict(heartbeat=0, send_timeout=0, max_connections=0, retry_after=5),
+            **options,
+        }
+    )
+    config = FakeConfig({CONFIG_LOCATION["sse_message"]: message})
+
+    async def respond(**kwargs) -> FakeResponse:
+        return response
+
+    return SimpleNamespace(
+        app=SimpleNamespace(ctx=SimpleNamespace(event_hub=hub), config=config),
+        args=SimpleNamespace(getlist=lambda key, default: default),
+        headers={},
+        respond=respond,
+        transport=SimpleNamespace(is_closing=lambda: False),
+    )
+
+
+class TestPublisher:
+    def test_stream(self) -> None:
+        async def run() -> None:
+            hub = EventHub()
+            response = FakeResponse()
+            task = asyncio.create_task(publisher(_request(hub, response)))  # type: ignore
+            await asyncio.sleep(0)
+
+            hub.publish("message", ["Hello"])
+            await asyncio.sleep(0.01)
+            hub.close()
+            assert await asyncio.wait_for(task, 1) is None
+            assert b"data: Pong" in response.frames[0]
+            assert b"data: Hello" in response.frames[1]
+
+        asyncio.run(run())
+
+    def test_heartbeat(self) -> None:
+        async def run() -> None:
+            hub = EventHub()
+            response = FakeResponse()
+            request = _request(hub, response, heartbeat=0.01)
+            task = asyncio.create_task(publisher(request))  # type: ignore
+            await asyncio.sleep(0.05)
+            assert KEEPALIVE in response.frames
+
+            # Closed peer => stop.
+            request.transport = SimpleNamespace(is_closing=lambda: True)
+            await asyncio.wait_for(task, 1)
+            assert len(hub) == 0
+
+        asyncio.run(run())
+
+    @pytest.mark.parametrize("mode", ["raise", "block"])
+    def test_reap(self, mode: str) -> None:
+        async def run() -> None:
+            hub = EventHub()
+            request = _request(hub, FakeResponse(mode), send_timeout=0.01)
+            task = asyncio.create_task(publisher(request))  # type: ignore
+            await asyncio.sleep(0)
+            assert len(hub) == 1
+
+            # Dead or not reading => unsubscribed.
+            hub.publish("message", ["Hello"])
+            await asyncio.wait_for(task, 1)
+            assert len(hub) == 0
+
+        asyncio.run(run())
+
+    def test_max_connections(self) -> None:
+        async def run() -> None:
+            hub = EventHub()
+            hub.subscribe()
+            response = await publisher(
+                _request(hub, FakeResponse(), max_connections=1)  # type: ignore
+            )
+            assert response.status == 503
+            assert response.headers["Retry-After"] == "5"
+            assert len(hub) == 1
+
+        asyncio.run(run())
@@ -0,0 +1,82 @@
+import pytest
+
+import os
+
+from chestnut.infra.helpers.path import INSTANCE_TEST_PATH
+
+
+class TestTemplateFingerprint:
+    def test_fingerprint(self) -> None:
+        from chestnut.infra.deps.html.service import templatefingerprint
+
+        root = INSTANCE_TEST_PATH / "fingerprint_templates"
+        root.mkdir(parents=True, exist_ok=True)
+        layout = root / "layout.html"
+        layout.write_text("<html>{% block body %}{% endblock %}</html>")
+
+        digest, mtime_ns = templatefingerprint(root)
+        assert mtime_ns == os.stat(layout).st_mtime_ns
+        # Once per process.
+        assert templatefingerprint(root) == (digest, mtime_ns)
+
+        layout.write_text("<html><body>{% block body %}{% endblock %}</body></html>")
+        stat = os.stat(layout)
+        os.utime(layout, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        templatefingerprint.cache_clear()
+        assert templatefingerprint(root)[0] != digest
+        assert templatefingerprint(root, version="0.0.0")[0] != digest
+
+
+class TestSyncEnvironment:
+    def test_reuse(self) -> None:
+        from chestnut.infra.web.exception.errorhandler.plain import syncenvironment
+
+        environment = syncenvironment()
+        assert syncenvironment() is environment
+        assert not environment.is_async
+
+        # Compiled once.
+        template = environment.get_template("exception.html")
+        assert environment.get_template("exception.html") is template
+
+
+class TestBytecodeCache:
+    def test_reuse(self) -> None:
+        from jinja2 import FileSystemBytecodeCache
+        from chestnut.infra.deps.html.service import returnloaderandenv
+
+        root = INSTANCE_TEST_PATH / "bytecode_templates"
+        cache_path = INSTANCE_TEST_PATH / "bytecode_cache"
+        for path in (root, cache_path):
+            path.mkdir(parents=True, exist_ok=True)
+        for file in cache_path.iterdir():
+            file.unlink()
+        (root / "chicken.html").write_text("<p>{{ name }}</p>")
+
+        cache = FileSystemBytecodeCache(str(cache_path))
+        _, environment = returnloaderandenv(root, False, cache)
+        assert environment.get_template("chicken.html").render(name="Chicken")
+        assert len(list(cache_path.iterdir())) == 1
+
+        # Another process: loaded from cache, never compiled.
+        _, environment = returnloaderandenv(root, False, cache)
+
+        def compile(*args, **kwargs):
+            raise AssertionError("Compiled again.")
+
+        environment.compile = compile  # type: ignore
+        template = environment.get_template("chicken.html")
+        assert template.render(name="Chicken") == "<p>Chicken</p>"
+
+    def test_command(self) -> None:
+        from click.testing import CliRunner
+        from chestnut.infra.cmd import manage
+        from chestnut.infra.deps.html.service import TEMPLATE_CACHE_PATH
+
+        result = CliRunner().invoke(manage, ["template", "compile"])
+
+        assert result.exit_code == 0, result.output
+        assert "Compiled" in result.output
+        # Both sync and async.
+        assert any((TEMPLATE_CACHE_PATH / "sync").iterdir())
+        assert any((TEMPLATE_CACHE_PATH / "async").iterdir())